@@ -0,0 +1,88 @@
+"""
+Checks the NumPy board's region-label reveal against its explicit-stack
+reveal and against minesweeper_v2.reveal_cell, then times a click that opens
+most of a board, up to 4096x4096. Run it with:
+
+    python benchmark_flood_fill.py [--size N]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+
+import minesweeper_v2 as game
+from board_engine import MinesweeperBoard, place_mines
+
+DENSITY = 0.01  # sparse enough for one click to open most of the board
+
+
+def load_into_game(board):
+    """Copies a board's layout into minesweeper_v2's lists."""
+    game.GRID_ROWS, game.GRID_COLS = board.rows, board.cols
+    game.NUM_MINES = board.num_mines
+    game.board_layout = board.counts.tolist()
+    game.revealed_cells = [[False] * board.cols for _ in range(board.rows)]
+    game.flagged_cells = [[False] * board.cols for _ in range(board.rows)]
+    game.revealed_safe_count = 0
+    game.flag_count = 0
+    game.safe_cell_count = board.safe_cell_count
+    game.game_over = game.game_won = False
+
+
+def check_equivalence(trials=300):
+    rng = np.random.default_rng(0)
+    for trial in range(trials):
+        rows, cols = rng.integers(5, 40, 2).tolist()
+        mines = place_mines(rows, cols, int(rows * cols * rng.uniform(0.02, 0.25)), (rows // 2, cols // 2), rng=trial)
+        labelled, searched = MinesweeperBoard(mines), MinesweeperBoard(mines)
+        load_into_game(labelled)
+        for _ in range(40):
+            row, col = rng.integers(0, rows), rng.integers(0, cols)
+            if rng.random() < 0.2:
+                labelled.toggle_flag(row, col)
+                searched.toggle_flag(row, col)
+                game.toggle_flag(row, col)
+            elif not mines[row, col]:
+                labelled.reveal(row, col)
+                searched.reveal_bfs(row, col)
+                game.reveal_cell(row, col)
+            if not (np.array_equal(labelled.revealed, searched.revealed)
+                    and np.array_equal(labelled.revealed, np.array(game.revealed_cells))
+                    and labelled.revealed_safe_count == searched.revealed_safe_count == game.revealed_safe_count):
+                print(f"MISMATCH on trial {trial}")
+                sys.exit(1)
+    print(f"{trials} random boards with flags and clicks: all three reveals match")
+
+
+def main():
+    size = 4096
+    if "--size" in sys.argv:
+        size = int(sys.argv[sys.argv.index("--size") + 1])
+    check_equivalence()
+
+    for n in sorted({256, 1024, size}):
+        start = time.perf_counter()
+        board = MinesweeperBoard.random(n, n, int(n * n * DENSITY), (n // 2, n // 2), rng=1)
+        setup = time.perf_counter() - start
+        start = time.perf_counter()
+        revealed = board.reveal(n // 2, n // 2)
+        labelled = time.perf_counter() - start
+        line = (f"{n}x{n}: setup with labels {setup * 1000:8.1f} ms | labelled click {labelled * 1000:8.2f} ms "
+                f"({revealed} cells)")
+        if n <= 1024:
+            bfs_board = MinesweeperBoard(board.mines)
+            start = time.perf_counter()
+            bfs_board.reveal_bfs(n // 2, n // 2)
+            line += f" | BFS click {(time.perf_counter() - start) * 1000:8.1f} ms"
+            load_into_game(board)
+            start = time.perf_counter()
+            game.reveal_cell(n // 2, n // 2)
+            line += f" | reveal_cell {(time.perf_counter() - start) * 1000:8.1f} ms"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+No-guess board generation speed, in boards per second, for beginner,
+intermediate and expert boards (expert is 16x30 with 99 mines).
+
+Every generated board is also replayed through find_moves(), the way a
+player sees it (revealed_cells and flagged_cells), to check that it really
+clears without a guess; the run fails if any board does not. Run it with:
+
+    python benchmark_no_guess.py [--seconds N]
+"""
+import sys
+import time
+import random
+
+from solver import generate_no_guess, find_moves
+
+LEVELS = [("beginner", 9, 9, 10), ("intermediate", 16, 16, 40), ("expert", 16, 30, 99)]
+
+
+def play(board_layout, num_mines, first_click):
+    """Clears board_layout from first_click using only find_moves(); True if it gets there."""
+    rows, cols = len(board_layout), len(board_layout[0])
+    revealed_cells = [[False] * cols for _ in range(rows)]
+    flagged_cells = [[False] * cols for _ in range(rows)]
+    memory = {}
+    to_reveal = [first_click]
+    while to_reveal:
+        # Reveal like minesweeper_v2's reveal_cell: 0 cells open their neighbours
+        while to_reveal:
+            r, c = to_reveal.pop()
+            if revealed_cells[r][c]:
+                continue
+            if board_layout[r][c] == -1:
+                return False
+            revealed_cells[r][c] = True
+            if board_layout[r][c] == 0:
+                to_reveal.extend((nr, nc) for nr in range(max(0, r - 1), min(rows, r + 2))
+                                 for nc in range(max(0, c - 1), min(cols, c + 2)))
+        safe, mines = find_moves(board_layout, revealed_cells, flagged_cells, num_mines, memory)
+        for r, c in mines:
+            flagged_cells[r][c] = True
+        to_reveal = safe
+    return all(revealed_cells[r][c] or board_layout[r][c] == -1 for r in range(rows) for c in range(cols))
+
+
+def main():
+    seconds = float(sys.argv[sys.argv.index("--seconds") + 1]) if "--seconds" in sys.argv else 10.0
+    rng = random.Random(0)
+    failed = 0
+    for name, rows, cols, num_mines in LEVELS:
+        first_click = (rows // 2, cols // 2)
+        boards = []
+        attempts = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            layout, tries = generate_no_guess(rows, cols, num_mines, first_click, rng)
+            boards.append(layout)
+            attempts += tries
+        elapsed = time.perf_counter() - start
+
+        cleared = sum(play(layout, num_mines, first_click) for layout in boards)
+        failed += len(boards) - cleared
+        print(f"{name:12s} {rows}x{cols}, {num_mines} mines: {len(boards) / elapsed:8.1f} boards/s, "
+              f"{attempts / len(boards):5.2f} boards tried per no-guess board, "
+              f"{elapsed / attempts * 1000:6.2f} ms per try | "
+              f"{cleared}/{len(boards)} replayed without a guess")
+    if failed:
+        print(f"{failed} boards needed a guess when replayed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
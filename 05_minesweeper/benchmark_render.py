@@ -0,0 +1,104 @@
+"""
+Frame time of draw_board: the old full redraw against the tile cache with
+dirty cells, for an idle frame and for frames after a click or a flag.
+Run it with:
+
+    python benchmark_render.py [--frames N]
+"""
+import os
+import sys
+import time
+import random
+import statistics
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+import minesweeper_v2 as game
+from minesweeper_v2 import (
+    screen, font, LIGHT_GRAY, DARK_GRAY, RED, GREEN, BLUE, DARK_BLUE, MAROON, TEAL, BLACK, ORANGE,
+)
+
+
+def old_draw_board():
+    """The old draw_board: clears and redraws every cell, rendering numbers each time."""
+    CELL_SIZE = game.CELL_SIZE
+    screen.fill(BLACK)
+    for r in range(game.GRID_ROWS):
+        for c in range(game.GRID_COLS):
+            cell_rect = pygame.Rect(c * CELL_SIZE, r * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+            pygame.draw.rect(screen, LIGHT_GRAY, cell_rect)
+            pygame.draw.rect(screen, DARK_GRAY, cell_rect, 1)
+            if game.revealed_cells[r][c]:
+                if game.board_layout[r][c] == -1:
+                    pygame.draw.circle(screen, RED, cell_rect.center, CELL_SIZE // 3)
+                elif game.board_layout[r][c] > 0:
+                    number = game.board_layout[r][c]
+                    number_colors = {
+                        1: BLUE, 2: GREEN, 3: RED, 4: DARK_BLUE,
+                        5: MAROON, 6: TEAL, 7: BLACK, 8: ORANGE
+                    }
+                    text_surface = font.render(str(number), True, number_colors.get(number, BLACK))
+                    screen.blit(text_surface, text_surface.get_rect(center=cell_rect.center))
+            elif game.flagged_cells[r][c]:
+                pygame.draw.polygon(screen, GREEN, [
+                    (cell_rect.centerx, cell_rect.top + CELL_SIZE // 4),
+                    (cell_rect.centerx - CELL_SIZE // 4, cell_rect.centery + CELL_SIZE // 4),
+                    (cell_rect.centerx + CELL_SIZE // 4, cell_rect.centery + CELL_SIZE // 4)
+                ])
+                pygame.draw.line(screen, DARK_GRAY, cell_rect.center,
+                                 (cell_rect.centerx, cell_rect.bottom - CELL_SIZE // 4), 2)
+    pygame.display.flip()
+
+
+def new_draw_board():
+    changed = game.draw_board()
+    if changed:
+        pygame.display.update(changed)
+
+
+def hidden_cells():
+    return [(r, c) for r in range(game.GRID_ROWS) for c in range(game.GRID_COLS)
+            if not game.revealed_cells[r][c] and game.board_layout[r][c] != -1]
+
+
+def play(draw, frames):
+    """A game with a click or flag every 10th frame; returns (idle ms, input ms) samples."""
+    random.seed(3)
+    game.initialize_board(8, 8)
+    game.reveal_cell(8, 8)
+    draw()
+    rng = random.Random(4)
+    idle, active = [], []
+    for frame in range(frames):
+        if frame % 10 == 0:
+            cells = hidden_cells()
+            if cells:
+                r, c = rng.choice(cells)
+                if rng.random() < 0.3:
+                    game.toggle_flag(r, c)
+                else:
+                    game.reveal_cell(r, c)
+        start = time.perf_counter()
+        draw()
+        (active if frame % 10 == 0 else idle).append((time.perf_counter() - start) * 1000)
+    return idle, active
+
+
+def main():
+    frames = 600
+    if "--frames" in sys.argv:
+        frames = int(sys.argv[sys.argv.index("--frames") + 1])
+
+    print(f"{game.GRID_ROWS}x{game.GRID_COLS} board, {frames} frames, a click or flag every 10th frame")
+    for label, draw in (("full redraw", old_draw_board), ("dirty cells", new_draw_board)):
+        idle, active = play(draw, frames)
+        print(f"  {label:12s} idle frame {statistics.mean(idle):6.3f} ms | "
+              f"frame after input {statistics.mean(active):6.3f} ms")
+    print("  (the game now also sleeps in pygame.event.wait() between inputs, so idle frames cost nothing)")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Board setup time of initialize_board, against the old rejection-sampling
+placement and nested-loop neighbour counts, for boards from 16x16 to
+2048x2048 at expert density (40 mines per 256 cells). Run it with:
+
+    python benchmark_setup.py [--old-max N]
+
+--old-max skips timing the old setup on boards bigger than N.
+"""
+import os
+import sys
+import time
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+
+import minesweeper_v2 as game
+
+SIZES = [16, 32, 64, 128, 256, 512, 1024, 2048]
+DENSITY = 40 / 256
+
+
+def old_initialize_board(first_click_row, first_click_col):
+    """The old initialize_board's mine placement and counting."""
+    rows, cols = game.GRID_ROWS, game.GRID_COLS
+    board_layout = [[0 for _ in range(cols)] for _ in range(rows)]
+    mines_placed = 0
+    while mines_placed < game.NUM_MINES:
+        row = random.randint(0, rows - 1)
+        col = random.randint(0, cols - 1)
+        is_safe_zone = False
+        for dr in [-1, 0, 1]:
+            for dc in [-1, 0, 1]:
+                if (0 <= first_click_row + dr < rows and
+                    0 <= first_click_col + dc < cols and
+                    row == first_click_row + dr and
+                    col == first_click_col + dc):
+                    is_safe_zone = True
+                    break
+            if is_safe_zone:
+                break
+        if board_layout[row][col] != -1 and not is_safe_zone:
+            board_layout[row][col] = -1
+            mines_placed += 1
+
+    for r in range(rows):
+        for c in range(cols):
+            if board_layout[r][c] == -1:
+                continue
+            count = 0
+            for dr in [-1, 0, 1]:
+                for dc in [-1, 0, 1]:
+                    if dr == 0 and dc == 0:
+                        continue
+                    nr, nc = r + dr, c + dc
+                    if 0 <= nr < rows and 0 <= nc < cols:
+                        if board_layout[nr][nc] == -1:
+                            count += 1
+            board_layout[r][c] = count
+    return board_layout
+
+
+def check_board(size):
+    """The new board has the right mines, a clear safe zone and correct counts."""
+    layout = np.array(game.board_layout)
+    mines = layout == -1
+    centre = size // 2
+    assert mines.sum() == game.NUM_MINES
+    assert not mines[max(0, centre - 1):centre + 2, max(0, centre - 1):centre + 2].any()
+    padded = np.pad(mines, 1).astype(int)
+    neighbours = sum(np.roll(np.roll(padded, dr, 0), dc, 1) for dr in (-1, 0, 1) for dc in (-1, 0, 1)
+                     if (dr, dc) != (0, 0))[1:-1, 1:-1]
+    assert (layout[~mines] == neighbours[~mines]).all()
+
+
+def timed(setup, size):
+    start = time.perf_counter()
+    setup(size // 2, size // 2)
+    return time.perf_counter() - start
+
+
+def main():
+    old_max = SIZES[-1]
+    if "--old-max" in sys.argv:
+        old_max = int(sys.argv[sys.argv.index("--old-max") + 1])
+
+    # Warm up NumPy's generator and allocator before timing anything
+    game.GRID_ROWS = game.GRID_COLS = 16
+    game.NUM_MINES = 40
+    game.initialize_board(8, 8)
+
+    print(f"{'board':>11s} {'mines':>8s} {'old':>10s} {'new':>10s}")
+    for size in SIZES:
+        game.GRID_ROWS = game.GRID_COLS = size
+        game.NUM_MINES = int(size * size * DENSITY)
+        random.seed(size)
+        new = timed(game.initialize_board, size)
+        check_board(size)
+        old = timed(old_initialize_board, size) if size <= old_max else None
+        old_text = f"{old * 1000:8.1f}ms" if old is not None else f"{'-':>10s}"
+        speedup = f"  {old / new:6.1f}x" if old is not None else ""
+        print(f"{size:>5d}x{size:<5d} {game.NUM_MINES:8d} {old_text} {new * 1000:8.1f}ms{speedup}")
+
+
+if __name__ == "__main__":
+    main()
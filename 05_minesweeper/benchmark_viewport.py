@@ -0,0 +1,90 @@
+"""
+Frame times of the viewport on a 1000x1000 board (a million cells).
+
+A scripted camera pans, zooms in and out and clicks, one step per frame,
+and every frame is drawn off screen. Reports draw times, how many frames
+went over the 60 FPS budget, and how many chunks had to be drawn. For
+comparison it also times drawing every cell once per frame, the way
+draw_board would have to on a board this size.
+
+    python benchmark_viewport.py
+"""
+import os
+import time
+import statistics
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from viewport import Viewport, SCREEN_WIDTH, SCREEN_HEIGHT, HUD_HEIGHT, FPS, ZOOM_LEVELS
+from minesweeper_v2 import make_tiles
+
+ROWS = COLS = 1000
+NUM_MINES = ROWS * COLS * 15 // 100
+FRAME_BUDGET_MS = 1000 / FPS
+
+
+def camera_script(viewport, rng):
+    """One action per frame: long pans, zoom sweeps and clicks along the way."""
+    center = (SCREEN_WIDTH // 2, HUD_HEIGHT + (SCREEN_HEIGHT - HUD_HEIGHT) // 2)
+    for _ in range(240):  # pan right and down at 12 px a frame
+        yield lambda: viewport.pan(12, 6)
+    for _ in range(len(ZOOM_LEVELS)):  # all the way out
+        yield lambda: viewport.zoom(-1, center)
+        for _ in range(10):
+            yield lambda: viewport.pan(-20, 0)
+    for _ in range(240):  # sweep the whole board zoomed out
+        yield lambda: viewport.pan(40, 25)
+    for _ in range(len(ZOOM_LEVELS)):  # all the way in
+        yield lambda: viewport.zoom(1, center)
+        for _ in range(10):
+            yield lambda: viewport.pan(15, -10)
+    for _ in range(300):  # pan around zoomed in, clicking now and then
+        yield lambda: viewport.pan(8, 4)
+        if rng.random() < 0.1:
+            row, col = viewport.cell_at(center) or (0, 0)
+            yield lambda: viewport.reveal(row, col)
+            yield lambda: viewport.toggle_flag(row + 1, col + 1)
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    viewport = Viewport(ROWS, COLS, NUM_MINES, (0, HUD_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT - HUD_HEIGHT))
+    rng = np.random.default_rng(0)
+
+    times = []
+    chunks = 0
+    start = time.perf_counter()
+    viewport.reveal(ROWS // 2, COLS // 2)
+    print(f"board setup and first reveal: {(time.perf_counter() - start) * 1000:.0f} ms (once per game)")
+    for action in camera_script(viewport, rng):
+        action()
+        start = time.perf_counter()
+        viewport.draw(screen)
+        times.append((time.perf_counter() - start) * 1000)
+        chunks += viewport.chunks_drawn
+
+    times.sort()
+    over = sum(t > FRAME_BUDGET_MS for t in times)
+    print(f"{len(times)} frames on a {ROWS}x{COLS} board")
+    print(f"  draw mean {statistics.mean(times):.2f} ms, p99 {times[int(len(times) * 0.99)]:.2f} ms, "
+          f"max {times[-1]:.2f} ms")
+    print(f"  {over} frames over {FRAME_BUDGET_MS:.1f} ms")
+    print(f"  {chunks} chunks drawn, cache hits {viewport.cache.hits}, "
+          f"{len(viewport.cache.entries)} chunks cached ({viewport.cache.pixels / 1e6:.1f} Mpx)")
+
+    # Every cell once, like draw_board: one tile blit per cell
+    tiles = make_tiles(2, pygame.font.Font(None, 3))
+    board = pygame.Surface((COLS * 2, ROWS * 2)).convert()
+    hidden = tiles["hidden"]
+    start = time.perf_counter()
+    board.blits([(hidden, (c * 2, r * 2)) for r in range(ROWS) for c in range(COLS)], doreturn=False)
+    print(f"drawing all {ROWS * COLS} cells: {(time.perf_counter() - start) * 1000:.0f} ms per frame")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
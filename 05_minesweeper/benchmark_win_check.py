@@ -0,0 +1,92 @@
+"""
+Time of one large flood-fill click on a 1000x1000 board, against the old
+reveal that scanned the whole grid for a win after every revealed cell.
+
+The old way is far too slow to finish a million-cell flood fill, so it is
+timed in full on a small board and, on the big board, its cost per scan is
+measured and multiplied by the number of cells the click reveals. Run it with:
+
+    python benchmark_win_check.py [--size N]
+"""
+import os
+import sys
+import time
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import minesweeper_v2 as game
+
+sys.setrecursionlimit(10_000)
+
+
+def scan_win_condition():
+    """The old check_win_condition: scans the whole grid every call."""
+    unrevealed_non_mines = 0
+    for r in range(game.GRID_ROWS):
+        for c in range(game.GRID_COLS):
+            if not game.revealed_cells[r][c] and game.board_layout[r][c] != -1:
+                unrevealed_non_mines += 1
+    if unrevealed_non_mines == 0:
+        game.game_won = True
+
+
+def old_reveal_cell(row, col):
+    """The old recursive reveal_cell, with a full scan after every cell."""
+    if not (0 <= row < game.GRID_ROWS and 0 <= col < game.GRID_COLS) or \
+       game.revealed_cells[row][col] or game.flagged_cells[row][col]:
+        return
+    game.revealed_cells[row][col] = True
+    if game.board_layout[row][col] == 0:
+        for dr in [-1, 0, 1]:
+            for dc in [-1, 0, 1]:
+                if dr == 0 and dc == 0:
+                    continue
+                old_reveal_cell(row + dr, col + dc)
+    scan_win_condition()
+
+
+def setup(size, mines, seed=1):
+    game.GRID_ROWS = game.GRID_COLS = size
+    game.NUM_MINES = mines
+    random.seed(seed)
+    game.initialize_board(size // 2, size // 2)
+
+
+def click(size, reveal):
+    """Times one left click in the middle of the board."""
+    start = time.perf_counter()
+    reveal(size // 2, size // 2)
+    return time.perf_counter() - start
+
+
+def main():
+    size = 1000
+    if "--size" in sys.argv:
+        size = int(sys.argv[sys.argv.index("--size") + 1])
+    density = 0.01  # sparse enough for one click to open most of the board
+
+    small = 40
+    for label, reveal in (("scan", old_reveal_cell), ("counter", game.reveal_cell)):
+        setup(small, int(small * small * density))
+        seconds = click(small, reveal)
+        revealed = sum(map(sum, game.revealed_cells))
+        print(f"{small}x{small} {label:8s} {seconds * 1000:10.1f} ms ({revealed} cells revealed)")
+
+    print(f"setting up a {size}x{size} board...")
+    setup(size, int(size * size * density))
+    seconds = click(size, game.reveal_cell)
+    revealed = game.revealed_safe_count
+    print(f"{size}x{size} counter  {seconds * 1000:10.1f} ms ({revealed} cells revealed)")
+
+    # One scan timed on the revealed board; the old reveal made one per cell
+    start = time.perf_counter()
+    scan_win_condition()
+    scan_seconds = time.perf_counter() - start
+    estimate = scan_seconds * revealed
+    print(f"{size}x{size} scan     {scan_seconds * 1000:10.1f} ms per scan -> about "
+          f"{estimate / 3600:.0f} hours for the click ({estimate / seconds:,.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+A NumPy Minesweeper board for very large grids (4096x4096 and up).
+
+The board lives in arrays: counts (-1 for a mine, else 0-8), revealed and
+flagged. When the board is created, the connected regions of 0 cells are
+labelled once, along with the bounding box of each region. Clicking a 0
+then reveals its whole region plus the numbers around it with one label
+lookup and one mask OR over the region's box. reveal_bfs does the same job
+with a breadth-first search, and is used when a flag splits a region.
+"""
+import numpy as np
+
+MINE = -1
+
+# The 8 neighbour offsets
+NEIGHBOURS = [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if (dr, dc) != (0, 0)]
+
+
+def shifted_sum(grid):
+    """For every cell, the sum of grid over its 8 neighbours (off-board counts as 0)."""
+    rows, cols = grid.shape
+    padded = np.zeros((rows + 2, cols + 2), dtype=np.int8)
+    padded[1:-1, 1:-1] = grid
+    total = np.zeros((rows, cols), dtype=np.int8)
+    for dr, dc in NEIGHBOURS:
+        total += padded[1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+    return total
+
+
+def place_mines(rows, cols, num_mines, first_click=None, rng=None):
+    """
+    A boolean mine grid with num_mines mines sampled without replacement,
+    none of them on first_click (row, col) or its neighbours that are on the
+    board.
+    """
+    rng = np.random.default_rng(rng)
+    allowed = np.ones((rows, cols), dtype=bool)
+    if first_click is not None:
+        row, col = first_click
+        if row + 2 > 0 and col + 2 > 0:
+            allowed[max(0, row - 1):row + 2, max(0, col - 1):col + 2] = False
+    cells = np.flatnonzero(allowed)
+    if num_mines > len(cells):
+        raise ValueError(f"{num_mines} mines do not fit in {len(cells)} free cells")
+    mines = np.zeros(rows * cols, dtype=bool)
+    mines[rng.choice(cells, size=num_mines, replace=False)] = True
+    return mines.reshape(rows, cols)
+
+
+def label_zero_regions(zero):
+    """
+    Labels the 8-connected regions of True cells in zero.
+
+    Returns (labels, boxes): labels is 0 outside the regions and 1..n inside,
+    and boxes[label] is the region's (top, bottom, left, right), inclusive.
+
+    Cells are first grouped into horizontal runs. Runs in neighbouring rows
+    that touch (diagonals included) are joined by a vectorized union-find:
+    each round hooks every root onto the smallest root it is joined to, then
+    pointer jumping flattens the trees, until no join changes anything.
+    """
+    rows, cols = zero.shape
+    # A False column after every row keeps runs from spanning two rows
+    padded = np.zeros((rows, cols + 1), dtype=bool)
+    padded[:, :cols] = zero
+    flat = padded.ravel()
+    edges = np.diff(flat.view(np.int8), prepend=np.int8(0))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    run_count = len(starts)
+    if run_count == 0:
+        return np.zeros((rows, cols), dtype=np.int32), np.zeros((1, 4), dtype=np.int32)
+
+    # Run id (1-based) of every cell, 0 outside runs
+    run_id = np.cumsum(edges == 1, dtype=np.int32)
+    run_id[~flat] = 0
+    run_id = run_id.reshape(rows, cols + 1)[:, :cols]
+
+    # Pairs of runs that touch between row r and row r + 1 (straight down or
+    # diagonally). Along a row the same pair repeats for every cell of the
+    # overlap, so only the first cell of each repeat is kept.
+    above, below = run_id[:-1], run_id[1:]
+    first, second = [], []
+    for a, b in ((above, below), (above[:, :-1], below[:, 1:]), (above[:, 1:], below[:, :-1])):
+        touching = (a > 0) & (b > 0)
+        touching[:, 1:] &= (a[:, 1:] != a[:, :-1]) | (b[:, 1:] != b[:, :-1])
+        first.append(a[touching])
+        second.append(b[touching])
+    first = np.concatenate(first)
+    second = np.concatenate(second)
+
+    parent = np.arange(run_count + 1, dtype=np.int32)
+    while True:
+        root_a = parent[first]
+        root_b = parent[second]
+        joined = root_a != root_b
+        if not joined.any():
+            break
+        low = np.minimum(root_a[joined], root_b[joined])
+        high = np.maximum(root_a[joined], root_b[joined])
+        np.minimum.at(parent, high, low)
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+    # Number the regions 1..n
+    roots, region = np.unique(parent[1:], return_inverse=True)
+    run_label = np.zeros(run_count + 1, dtype=np.int32)
+    run_label[1:] = region + 1
+    labels = run_label[run_id]
+
+    # Bounding boxes from the runs (start row and columns of each run)
+    run_row = starts // (cols + 1)
+    run_left = starts % (cols + 1)
+    run_right = ends % (cols + 1) - 1
+    boxes = np.zeros((len(roots) + 1, 4), dtype=np.int32)
+    boxes[1:, 0] = rows
+    boxes[1:, 2] = cols
+    np.minimum.at(boxes[:, 0], region + 1, run_row)
+    np.maximum.at(boxes[:, 1], region + 1, run_row)
+    np.minimum.at(boxes[:, 2], region + 1, run_left)
+    np.maximum.at(boxes[:, 3], region + 1, run_right)
+    return labels, boxes
+
+
+class MinesweeperBoard:
+    """
+    Board state in NumPy arrays, with the same rules as minesweeper_v2:
+    revealing a mine loses and shows every mine, revealing a 0 opens its
+    neighbours, flags block reveals, and revealing every safe cell wins.
+    """
+    def __init__(self, mines):
+        self.rows, self.cols = mines.shape
+        self.mines = mines
+        self.num_mines = int(mines.sum())
+        self.counts = shifted_sum(mines)
+        self.counts[mines] = MINE
+        self.revealed = np.zeros(mines.shape, dtype=bool)
+        self.flagged = np.zeros(mines.shape, dtype=bool)
+        self.labels, self.boxes = label_zero_regions(self.counts == 0)
+        self.safe_cell_count = self.rows * self.cols - self.num_mines
+        self.revealed_safe_count = 0
+        self.flag_count = 0
+        self.game_over = False
+        self.game_won = False
+        # (top, bottom, left, right) areas changed since the caller last
+        # cleared this list, bottom and right exclusive; used by renderers
+        self.changed = []
+
+    @classmethod
+    def random(cls, rows, cols, num_mines, first_click=None, rng=None):
+        return cls(place_mines(rows, cols, num_mines, first_click, rng))
+
+    def in_bounds(self, row, col):
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def toggle_flag(self, row, col):
+        if not self.in_bounds(row, col) or self.revealed[row, col]:
+            return
+        self.flagged[row, col] = not self.flagged[row, col]
+        self.flag_count += 1 if self.flagged[row, col] else -1
+        self.changed.append((row, row + 1, col, col + 1))
+
+    def reveal(self, row, col):
+        """Reveals a cell (and its whole region if it is a 0). Returns how many cells were revealed."""
+        if not self.in_bounds(row, col) or self.revealed[row, col] or self.flagged[row, col]:
+            return 0
+        if self.mines[row, col]:
+            self.lose()
+            return 0
+
+        label = self.labels[row, col]
+        if label == 0:
+            self.revealed[row, col] = True
+            self.changed.append((row, row + 1, col, col + 1))
+            return self.add_revealed(1)
+
+        top, bottom, left, right = self.boxes[label].tolist()
+        # The box grown by one cell takes in the numbers around the region
+        top, left = max(0, top - 1), max(0, left - 1)
+        bottom, right = min(self.rows, bottom + 2), min(self.cols, right + 2)
+        box = (slice(top, bottom), slice(left, right))
+        region = self.labels[box] == label
+        if (region & self.flagged[box]).any():
+            # A flag inside the region stops the fill there, so walk it cell by cell
+            return self.reveal_bfs(row, col)
+
+        grown = region.copy()
+        grown[:, 1:] |= region[:, :-1]
+        grown[:, :-1] |= region[:, 1:]
+        spread = grown.copy()
+        grown[1:] |= spread[:-1]
+        grown[:-1] |= spread[1:]
+        new = grown & ~self.revealed[box] & ~self.flagged[box]
+        self.revealed[box] |= new
+        self.changed.append((top, bottom, left, right))
+        return self.add_revealed(int(np.count_nonzero(new)))
+
+    def reveal_bfs(self, row, col):
+        """
+        reveal() without region labels: a breadth-first search that expands
+        the whole frontier of newly revealed 0 cells at once, as index arrays.
+        """
+        if not self.in_bounds(row, col) or self.revealed[row, col] or self.flagged[row, col]:
+            return 0
+        if self.mines[row, col]:
+            self.lose()
+            return 0
+        revealed = self.revealed.ravel()
+        blocked = self.flagged.ravel()
+        zero = (self.counts == 0).ravel()
+        cols = self.cols
+        start = row * cols + col
+        revealed[start] = True
+        count = 1
+        top, bottom, left, right = row, row + 1, col, col + 1
+        frontier = np.array([start]) if zero[start] else np.array([], dtype=np.int64)
+        while len(frontier):
+            r, c = np.divmod(frontier, cols)
+            candidates = []
+            for dr, dc in NEIGHBOURS:
+                nr, nc = r + dr, c + dc
+                inside = (nr >= 0) & (nr < self.rows) & (nc >= 0) & (nc < cols)
+                candidates.append(nr[inside] * cols + nc[inside])
+            cells = np.unique(np.concatenate(candidates))
+            cells = cells[~revealed[cells] & ~blocked[cells]]
+            revealed[cells] = True
+            count += len(cells)
+            if len(cells):
+                r, c = np.divmod(cells, cols)
+                top, bottom = min(top, int(r.min())), max(bottom, int(r.max()) + 1)
+                left, right = min(left, int(c.min())), max(right, int(c.max()) + 1)
+            frontier = cells[zero[cells]]
+        self.changed.append((top, bottom, left, right))
+        return self.add_revealed(count)
+
+    def add_revealed(self, count):
+        self.revealed_safe_count += count
+        if self.revealed_safe_count == self.safe_cell_count:
+            self.game_won = True
+            self.flagged |= self.mines
+            self.flag_count = self.num_mines
+            self.changed.append((0, self.rows, 0, self.cols))
+        return count
+
+    def lose(self):
+        self.game_over = True
+        self.revealed |= self.mines
+        self.changed.append((0, self.rows, 0, self.cols))
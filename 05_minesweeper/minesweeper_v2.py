@@ -1,5 +1,10 @@
 import pygame
+import sys
 import random
+import numpy as np
+
+from board_engine import place_mines, shifted_sum
+from solver import generate_no_guess
 
 # --- Constants ---
 # Screen dimensions
@@ -13,6 +18,7 @@ CELL_SIZE = 35 # Size of each cell in pixels
 
 # Game difficulty
 NUM_MINES = 40
+NO_GUESS = "--no-guess" in sys.argv # Only deal boards that can be cleared without guessing
 
 # Colors
 WHITE = (255, 255, 255)
@@ -46,6 +52,21 @@ game_over = False
 game_won = False
 first_click = True # To ensure first click never lands on a mine
 
+# Running counts, kept up to date by reveal_cell and toggle_flag so the win
+# check never has to scan the grid
+revealed_safe_count = 0
+flag_count = 0
+safe_cell_count = GRID_ROWS * GRID_COLS - NUM_MINES
+
+# --- Rendering Cache ---
+# tiles: pre-rendered cell surfaces, built once ("hidden", "flag", "mine", 0-8)
+# board_surface: the grid as last drawn; only cells in dirty_cells are redrawn
+tiles = {}
+board_surface = None
+dirty_cells = [] # (row, col) of cells whose look changed since the last draw
+full_redraw = True # Set when the whole board needs redrawing (new game, window exposed)
+shown_status = ""
+
 # --- Functions ---
 
 def initialize_board(first_click_row, first_click_col):
@@ -54,93 +75,109 @@ def initialize_board(first_click_row, first_click_col):
     Ensures the first clicked cell and its immediate neighbors are not mines.
     """
     global board_layout, revealed_cells, flagged_cells, game_over, game_won, first_click
+    global revealed_safe_count, flag_count, safe_cell_count, full_redraw
 
-    board_layout = [[0 for _ in range(GRID_COLS)] for _ in range(GRID_ROWS)]
-    revealed_cells = [[False for _ in range(GRID_COLS)] for _ in range(GRID_ROWS)]
-    flagged_cells = [[False for _ in range(GRID_COLS)] for _ in range(GRID_ROWS)]
+    revealed_cells = [[False] * GRID_COLS for _ in range(GRID_ROWS)]
+    flagged_cells = [[False] * GRID_COLS for _ in range(GRID_ROWS)]
     game_over = False
     game_won = False
     first_click = False # Reset for subsequent games
+    revealed_safe_count = 0
+    flag_count = 0
+    safe_cell_count = GRID_ROWS * GRID_COLS - NUM_MINES
+    full_redraw = True
+
+    # Place mines: sample NUM_MINES cells without replacement from the cells
+    # outside the first click's 3x3 safe zone, then count each cell's mine
+    # neighbours with a sum of shifted arrays. The NumPy generator is seeded
+    # from random, so random.seed() still gives repeatable boards.
+    if NO_GUESS and 0 <= first_click_row < GRID_ROWS and 0 <= first_click_col < GRID_COLS:
+        # Keep dealing until the solver can clear the board from this click
+        board_layout, _ = generate_no_guess(GRID_ROWS, GRID_COLS, NUM_MINES, (first_click_row, first_click_col))
+        return
+    rng = np.random.default_rng(random.getrandbits(64))
+    mines = place_mines(GRID_ROWS, GRID_COLS, NUM_MINES, (first_click_row, first_click_col), rng)
+    counts = shifted_sum(mines)
+    counts[mines] = -1 # -1 signifies a mine
+    board_layout = counts.tolist()
 
-    # Place mines
-    mines_placed = 0
-    while mines_placed < NUM_MINES:
-        row = random.randint(0, GRID_ROWS - 1)
-        col = random.randint(0, GRID_COLS - 1)
-
-        # Ensure no mine is placed at the first click location or its 8 neighbors
-        is_safe_zone = False
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if (0 <= first_click_row + dr < GRID_ROWS and
-                    0 <= first_click_col + dc < GRID_COLS and
-                    row == first_click_row + dr and
-                    col == first_click_col + dc):
-                    is_safe_zone = True
-                    break
-            if is_safe_zone:
-                break
-
-        if board_layout[row][col] != -1 and not is_safe_zone:
-            board_layout[row][col] = -1 # -1 signifies a mine
-            mines_placed += 1
-
-    # Calculate numbers for non-mine cells
-    for r in range(GRID_ROWS):
-        for c in range(GRID_COLS):
-            if board_layout[r][c] == -1: # It's a mine, skip
-                continue
-
-            count = 0
-            # Check all 8 neighbors
-            for dr in [-1, 0, 1]:
-                for dc in [-1, 0, 1]:
-                    if dr == 0 and dc == 0: # Skip the cell itself
-                        continue
-                    nr, nc = r + dr, c + dc # Neighbor row, neighbor column
-                    if 0 <= nr < GRID_ROWS and 0 <= nc < GRID_COLS:
-                        if board_layout[nr][nc] == -1: # Neighbor is a mine
-                            count += 1
-            board_layout[r][c] = count # Store the count
+def make_tiles(cell_size, tile_font):
+    """
+    Renders every kind of cell once at the given size: "hidden", "flag",
+    "mine" and revealed 0-8, with the same look draw_board always had.
+    """
+    number_colors = {
+        1: BLUE, 2: GREEN, 3: RED, 4: DARK_BLUE,
+        5: MAROON, 6: TEAL, 7: BLACK, 8: ORANGE
+    }
+    cell_rect = pygame.Rect(0, 0, cell_size, cell_size)
+
+    def blank():
+        tile = pygame.Surface((cell_size, cell_size)).convert()
+        pygame.draw.rect(tile, LIGHT_GRAY, cell_rect)
+        pygame.draw.rect(tile, DARK_GRAY, cell_rect, 1) # Border
+        return tile
+
+    made = {"hidden": blank(), 0: blank()}
+
+    # Draw a mine (red circle)
+    made["mine"] = blank()
+    pygame.draw.circle(made["mine"], RED, cell_rect.center, cell_size // 3)
+
+    # Draw a flag (green triangle)
+    made["flag"] = blank()
+    pygame.draw.polygon(made["flag"], GREEN, [
+        (cell_rect.centerx, cell_rect.top + cell_size // 4),
+        (cell_rect.centerx - cell_size // 4, cell_rect.centery + cell_size // 4),
+        (cell_rect.centerx + cell_size // 4, cell_rect.centery + cell_size // 4)
+    ])
+    pygame.draw.line(made["flag"], DARK_GRAY, cell_rect.center,
+                     (cell_rect.centerx, cell_rect.bottom - cell_size // 4), 2)
+
+    # Draw the number of adjacent mines
+    for number, text_color in number_colors.items():
+        made[number] = blank()
+        text_surface = tile_font.render(str(number), True, text_color)
+        made[number].blit(text_surface, text_surface.get_rect(center=cell_rect.center))
+    return made
+
+def cell_tile(r, c):
+    """The tile showing cell (r, c) as it is now."""
+    if revealed_cells[r][c]:
+        return tiles["mine"] if board_layout[r][c] == -1 else tiles[board_layout[r][c]]
+    if flagged_cells[r][c]:
+        return tiles["flag"]
+    return tiles["hidden"]
 
 def draw_board():
-    """Draws the current state of the game board."""
-    screen.fill(BLACK) # Clear the screen before drawing
-
-    for r in range(GRID_ROWS):
-        for c in range(GRID_COLS):
-            cell_rect = pygame.Rect(c * CELL_SIZE, r * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-
-            # Draw the cell background
-            pygame.draw.rect(screen, LIGHT_GRAY, cell_rect)
-            pygame.draw.rect(screen, DARK_GRAY, cell_rect, 1) # Border
-
-            if revealed_cells[r][c]:
-                # Draw revealed cell content
-                if board_layout[r][c] == -1:
-                    # Draw a mine (red circle)
-                    pygame.draw.circle(screen, RED, cell_rect.center, CELL_SIZE // 3)
-                elif board_layout[r][c] > 0:
-                    # Draw the number of adjacent mines
-                    number = board_layout[r][c]
-                    # Assign different colors for different numbers for better visibility
-                    number_colors = {
-                        1: BLUE, 2: GREEN, 3: RED, 4: DARK_BLUE,
-                        5: MAROON, 6: TEAL, 7: BLACK, 8: ORANGE
-                    }
-                    text_color = number_colors.get(number, BLACK)
-                    text_surface = font.render(str(number), True, text_color)
-                    text_rect = text_surface.get_rect(center=cell_rect.center)
-                    screen.blit(text_surface, text_rect)
-            elif flagged_cells[r][c]:
-                # Draw a flag (green triangle)
-                pygame.draw.polygon(screen, GREEN, [
-                    (cell_rect.centerx, cell_rect.top + CELL_SIZE // 4),
-                    (cell_rect.centerx - CELL_SIZE // 4, cell_rect.centery + CELL_SIZE // 4),
-                    (cell_rect.centerx + CELL_SIZE // 4, cell_rect.centery + CELL_SIZE // 4)
-                ])
-                pygame.draw.line(screen, DARK_GRAY, cell_rect.center,
-                                 (cell_rect.centerx, cell_rect.bottom - CELL_SIZE // 4), 2)
+    """
+    Brings the screen up to date with the game state, redrawing only the
+    cells that changed since the last call. Returns the screen rects that
+    changed, for pygame.display.update().
+    """
+    global board_surface, full_redraw, shown_status
+    if not tiles:
+        tiles.update(make_tiles(CELL_SIZE, font))
+
+    changed = []
+    board_rect = pygame.Rect(0, 0, GRID_COLS * CELL_SIZE, GRID_ROWS * CELL_SIZE)
+    if full_redraw or board_surface is None or board_surface.get_size() != board_rect.size:
+        board_surface = pygame.Surface(board_rect.size).convert()
+        board_surface.blits([(cell_tile(r, c), (c * CELL_SIZE, r * CELL_SIZE))
+                             for r in range(GRID_ROWS) for c in range(GRID_COLS)], doreturn=False)
+        screen.fill(BLACK) # Clear the screen before drawing
+        screen.blit(board_surface, (0, 0))
+        changed.append(screen.get_rect())
+        shown_status = ""
+        full_redraw = False
+    elif dirty_cells:
+        for r, c in dirty_cells:
+            cell_rect = board_surface.blit(cell_tile(r, c), (c * CELL_SIZE, r * CELL_SIZE))
+            screen.blit(board_surface, cell_rect, cell_rect)
+            changed.append(cell_rect)
+        if len(changed) > 64:
+            changed = [board_rect] # One big update beats thousands of small ones
+    dirty_cells.clear()
 
     # Display game status
     status_text = ""
@@ -149,24 +186,29 @@ def draw_board():
     elif game_won:
         status_text = "Congratulations! You won!"
 
-    if status_text:
-        status_surface = font.render(status_text, True, WHITE)
-        status_rect = status_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 50))
-        screen.blit(status_surface, status_rect)
+    if status_text != shown_status:
+        status_area = pygame.Rect(0, SCREEN_HEIGHT - 80, SCREEN_WIDTH, 60)
+        screen.fill(BLACK, status_area)
+        if status_text:
+            status_surface = font.render(status_text, True, WHITE)
+            status_rect = status_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 50))
+            screen.blit(status_surface, status_rect)
+        changed.append(status_area)
+        shown_status = status_text
+    return changed
 
 def reveal_cell(row, col):
     """
-    Reveals a cell. If it's a 0, recursively reveals neighbors.
+    Reveals a cell. If it's a 0, reveals its neighbors too, using an explicit
+    stack rather than recursion so large open areas can't hit the recursion limit.
     Checks for win/loss conditions.
     """
-    global game_over, game_won
+    global game_over, game_won, revealed_safe_count
 
     if not (0 <= row < GRID_ROWS and 0 <= col < GRID_COLS) or \
        revealed_cells[row][col] or flagged_cells[row][col]:
         return # Cell already revealed, flagged, or out of bounds
 
-    revealed_cells[row][col] = True
-
     if board_layout[row][col] == -1:
         game_over = True # Game lost, you hit a mine
         # Reveal all mines when game is over
@@ -174,74 +216,103 @@ def reveal_cell(row, col):
             for c in range(GRID_COLS):
                 if board_layout[r][c] == -1:
                     revealed_cells[r][c] = True
+                    dirty_cells.append((r, c))
         return
 
-    # If it's an empty cell (0), recursively reveal neighbors
-    if board_layout[row][col] == 0:
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if dr == 0 and dc == 0:
-                    continue
-                reveal_cell(row + dr, col + dc)
+    revealed_cells[row][col] = True
+    revealed_safe_count += 1
+    dirty_cells.append((row, col))
+    stack = [(row, col)]
+    while stack:
+        r, c = stack.pop()
+        # If it's an empty cell (0), reveal its neighbors
+        if board_layout[r][c] != 0:
+            continue
+        for nr in range(max(0, r - 1), min(GRID_ROWS, r + 2)):
+            revealed_row = revealed_cells[nr]
+            flagged_row = flagged_cells[nr]
+            for nc in range(max(0, c - 1), min(GRID_COLS, c + 2)):
+                if not revealed_row[nc] and not flagged_row[nc]:
+                    # Neighbors of a 0 are never mines
+                    revealed_row[nc] = True
+                    revealed_safe_count += 1
+                    stack.append((nr, nc))
+                    dirty_cells.append((nr, nc))
 
     check_win_condition()
 
+def toggle_flag(row, col):
+    """Flags or unflags a hidden cell, keeping flag_count up to date."""
+    global flag_count
+    if revealed_cells[row][col]:
+        return
+    flagged_cells[row][col] = not flagged_cells[row][col]
+    flag_count += 1 if flagged_cells[row][col] else -1
+    dirty_cells.append((row, col))
+
 def check_win_condition():
-    """Checks if the player has won the game."""
-    global game_won
-    unrevealed_non_mines = 0
+    """Checks if the player has won the game, in O(1) using the revealed count."""
+    global game_won, flag_count
+    if game_won or revealed_safe_count < safe_cell_count:
+        return
+    game_won = True
+    # If won, reveal all remaining flags (mines) as a visual cue
     for r in range(GRID_ROWS):
         for c in range(GRID_COLS):
-            if not revealed_cells[r][c] and board_layout[r][c] != -1:
-                unrevealed_non_mines += 1
-    if unrevealed_non_mines == 0:
-        game_won = True
-        # If won, reveal all remaining flags (mines) as a visual cue
-        for r in range(GRID_ROWS):
-            for c in range(GRID_COLS):
-                if board_layout[r][c] == -1:
-                    flagged_cells[r][c] = True
+            if board_layout[r][c] == -1:
+                flagged_cells[r][c] = True
+                dirty_cells.append((r, c))
+    flag_count = NUM_MINES
 
 
 # --- Main Game Loop ---
-running = True
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            if game_over or game_won:
-                # If game is over/won, a click restarts the game
-                initialize_board(-1, -1) # Reset with dummy safe zone, new game will be first click
-                first_click = True
-                continue
-
-            mouse_x, mouse_y = event.pos
-            # Calculate grid coordinates based on mouse position
-            col = mouse_x // CELL_SIZE
-            row = mouse_y // CELL_SIZE
-
-            # Ensure click is within the grid boundaries
-            if not (0 <= row < GRID_ROWS and 0 <= col < GRID_COLS):
-                continue
-
-            if event.button == 1:  # Left click
-                if first_click:
-                    # On the very first click, initialize the board ensuring
-                    # the clicked cell is safe
-                    initialize_board(row, col)
-                    reveal_cell(row, col) # Reveal the first clicked cell
-                else:
-                    reveal_cell(row, col)
-            elif event.button == 3: # Right click
-                # Toggle flag if the cell is not already revealed
-                if not revealed_cells[row][col]:
-                    flagged_cells[row][col] = not flagged_cells[row][col]
-
-    # Drawing
-    draw_board()
-
-    # Update the display
-    pygame.display.flip()
-
-pygame.quit()
\ No newline at end of file
+def main():
+    global first_click, full_redraw
+    running = True
+    while running:
+        # Sleep until something happens; the board only changes on input
+        for event in [pygame.event.wait()] + pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                full_redraw = True
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if game_over or game_won:
+                    # If game is over/won, a click restarts the game
+                    initialize_board(-1, -1) # Reset with dummy safe zone, new game will be first click
+                    first_click = True
+                    continue
+
+                mouse_x, mouse_y = event.pos
+                # Calculate grid coordinates based on mouse position
+                col = mouse_x // CELL_SIZE
+                row = mouse_y // CELL_SIZE
+
+                # Ensure click is within the grid boundaries
+                if not (0 <= row < GRID_ROWS and 0 <= col < GRID_COLS):
+                    continue
+
+                if event.button == 1:  # Left click
+                    if first_click:
+                        # On the very first click, initialize the board ensuring
+                        # the clicked cell is safe
+                        initialize_board(row, col)
+                        reveal_cell(row, col) # Reveal the first clicked cell
+                    else:
+                        reveal_cell(row, col)
+                elif event.button == 3: # Right click
+                    # Toggle flag if the cell is not already revealed
+                    toggle_flag(row, col)
+
+        # Drawing: only what changed
+        changed = draw_board()
+
+        # Update the display
+        if changed:
+            pygame.display.update(changed)
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
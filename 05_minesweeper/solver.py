@@ -0,0 +1,354 @@
+"""
+A Minesweeper solver that only makes moves it can prove, and a generator of
+"no-guess" boards built on it.
+
+Sets of cells are bitsets: Python ints with bit r * cols + c for cell (r, c).
+Every revealed number gives a constraint, (hidden neighbours, mines among
+them). The solver applies, in order:
+
+  * the single-cell rule: a constraint with no mines left makes all of its
+    cells safe, one with as many mines as cells makes them all mines;
+  * the pair (subset) rule: for overlapping constraints A and B, if B's cells
+    outside A must hold all of B's extra mines, those cells are mines and
+    A's cells outside B are safe; if A is inside B with the same count, the
+    rest of B is safe;
+  * exact enumeration: the frontier is split into independent components,
+    every mine arrangement of each component is listed, and together with
+    the total mine count the cells that are safe (or mines) in every
+    arrangement are taken.
+
+find_moves() works on minesweeper_v2's board_layout / revealed_cells /
+flagged_cells. generate_no_guess() keeps placing mines until the solver can
+clear the board from the first click without guessing.
+"""
+import random
+
+MAX_ENUMERATION_NODES = 2000 # Search steps allowed per component before giving up on it
+
+
+def bits(mask):
+    """The indices of the set bits of mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class Solver:
+    """Cell masks and the deduction rules for one board size."""
+    def __init__(self, rows, cols):
+        self.rows, self.cols = rows, cols
+        self.cell_count = rows * cols
+        self.full = (1 << self.cell_count) - 1
+        first_col = sum(1 << (r * cols) for r in range(rows))
+        self.not_first_col = self.full & ~first_col
+        self.not_last_col = self.full & ~(first_col << (cols - 1))
+        self.neighbours = []
+        for r in range(rows):
+            for c in range(cols):
+                mask = 0
+                for nr in range(max(0, r - 1), min(rows, r + 2)):
+                    for nc in range(max(0, c - 1), min(cols, c + 2)):
+                        if (nr, nc) != (r, c):
+                            mask |= 1 << (nr * cols + nc)
+                self.neighbours.append(mask)
+
+    def grow(self, mask):
+        """mask plus every cell next to it."""
+        wide = mask | ((mask << 1) & self.not_first_col) | ((mask >> 1) & self.not_last_col)
+        return (wide | (wide << self.cols) | (wide >> self.cols)) & self.full
+
+    def open(self, cells, revealed, zero):
+        """revealed plus cells, opening up every region of 0 cells reached."""
+        revealed |= cells
+        while True:
+            opened = revealed | self.grow(revealed & zero)
+            if opened == revealed:
+                return revealed
+            revealed = opened
+
+    # --- Rules ---
+
+    def constraints(self, numbers, revealed, mines, frontier):
+        """
+        {hidden cells: mines among them} from the revealed numbers in
+        frontier. Numbers with nothing hidden around them are dropped from
+        frontier.
+        """
+        hidden = self.full & ~revealed & ~mines
+        found = {}
+        for cell in list(frontier):
+            around = self.neighbours[cell]
+            unknown = around & hidden
+            if not unknown:
+                frontier.discard(cell)
+                continue
+            found[unknown] = numbers[cell] - (around & mines).bit_count()
+        return found
+
+    def single_rule(self, constraints):
+        safe = mines = 0
+        for cells, need in constraints.items():
+            if need == 0:
+                safe |= cells
+            elif need == cells.bit_count():
+                mines |= cells
+        return safe, mines
+
+    def pair_rule(self, constraints):
+        items = list(constraints.items())
+        by_cell = {}
+        for index, (cells, _) in enumerate(items):
+            for cell in bits(cells):
+                by_cell.setdefault(cell, []).append(index)
+        safe = mines = 0
+        for a_index, (a, a_need) in enumerate(items):
+            partners = {b for cell in bits(a) for b in by_cell[cell]}
+            for b_index in partners:
+                if b_index == a_index:
+                    continue
+                b, b_need = items[b_index]
+                only_b = b & ~a
+                if not only_b:
+                    continue
+                if b_need - a_need == only_b.bit_count():
+                    mines |= only_b
+                    safe |= a & ~b
+                elif not a & ~b and b_need == a_need:
+                    safe |= only_b
+        return safe, mines
+
+    def components(self, constraints):
+        """The constraints split into groups that share no cells."""
+        remaining = list(constraints.items())
+        groups = []
+        while remaining:
+            group = [remaining.pop()]
+            cells = group[0][0]
+            grew = True
+            while grew:
+                grew = False
+                for item in remaining[:]:
+                    if item[0] & cells:
+                        remaining.remove(item)
+                        group.append(item)
+                        cells |= item[0]
+                        grew = True
+            groups.append((cells, group))
+        return groups
+
+    def enumerate_component(self, cells, group):
+        """
+        Every mine arrangement of the component's cells that satisfies its
+        constraints, summarised by mine count: {k: [cells that are a mine in
+        some arrangement with k mines, cells that are safe in one]}. None if
+        the search ran past MAX_ENUMERATION_NODES.
+        """
+        order = list(bits(cells))
+        member = [[index for index, (mask, _) in enumerate(group) if mask >> cell & 1] for cell in order]
+        need = [count for _, count in group]
+        left = [mask.bit_count() for mask, _ in group]
+        found = {}
+        nodes = 0
+
+        def place(i, mask, k):
+            nonlocal nodes
+            nodes += 1
+            if nodes > MAX_ENUMERATION_NODES:
+                return False
+            if i == len(order):
+                summary = found.setdefault(k, [0, 0])
+                summary[0] |= mask
+                summary[1] |= cells & ~mask
+                return True
+            owners = member[i]
+            for index in owners:
+                left[index] -= 1
+            ok = True
+            # The cell as a mine
+            if all(need[index] > 0 for index in owners):
+                for index in owners:
+                    need[index] -= 1
+                if all(need[index] <= left[index] for index in owners):
+                    ok = place(i + 1, mask | 1 << order[i], k + 1)
+                for index in owners:
+                    need[index] += 1
+            # The cell as safe
+            if ok and all(need[index] <= left[index] for index in owners):
+                ok = place(i + 1, mask, k)
+            for index in owners:
+                left[index] += 1
+            return ok
+
+        return found if place(0, 0, 0) else None
+
+    def enumeration_rule(self, constraints, hidden, mines_left, enumerated):
+        """
+        Cells settled by exact enumeration of every component plus the total
+        mine count. enumerated keeps each component's result between calls,
+        since most components come back unchanged while the solver works
+        somewhere else.
+        """
+        summaries = []
+        frontier = 0
+        for cells, group in self.components(constraints):
+            key = frozenset(group)
+            if key not in enumerated:
+                enumerated[key] = self.enumerate_component(cells, group)
+            found = enumerated[key]
+            if found is None:
+                # Too big to list: leave it out, and know nothing about its count
+                found = {k: [cells, cells] for k in range(len(group) * 8 + 1)}
+            summaries.append((cells, found))
+            frontier |= cells
+        outside = hidden & ~frontier
+        outside_count = outside.bit_count()
+
+        low = sum(min(found) for _, found in summaries)
+        high = sum(max(found) for _, found in summaries)
+        safe = mines = 0
+        for cells, found in summaries:
+            # Mines the other components and the outside cells can take
+            others_low = low - min(found)
+            others_high = high - max(found) + outside_count
+            ever_mine = ever_safe = 0
+            for k, (mine_in, safe_in) in found.items():
+                if others_low <= mines_left - k <= others_high:
+                    ever_mine |= mine_in
+                    ever_safe |= safe_in
+            safe |= cells & ~ever_mine
+            mines |= cells & ~ever_safe
+        if outside:
+            # The outside cells hold what the frontier leaves over
+            if mines_left - high >= outside_count:
+                mines |= outside
+            elif mines_left - low <= 0:
+                safe |= outside
+        return safe, mines
+
+    def deduce(self, numbers, revealed, mines, frontier, mines_left, enumerated=None):
+        """(safe cells, mine cells) provable from the revealed numbers, cheapest rule first."""
+        hidden = self.full & ~revealed & ~mines
+        if mines_left == 0:
+            return hidden, 0
+        if mines_left == hidden.bit_count():
+            return 0, hidden
+        constraints = self.constraints(numbers, revealed, mines, frontier)
+        for rule in (self.single_rule, self.pair_rule):
+            safe, found = rule(constraints)
+            if safe or found:
+                return safe, found
+        return self.enumeration_rule(constraints, hidden, mines_left, {} if enumerated is None else enumerated)
+
+    def step(self, numbers, revealed, mines, frontier, num_mines, enumerated):
+        """
+        One move: deduce() until it finds safe cells to open, or nothing
+        new. Returns (safe cells, mine cells), the mines including those
+        given.
+        """
+        while True:
+            safe, found = self.deduce(numbers, revealed, mines, frontier, num_mines - mines.bit_count(), enumerated)
+            if safe or not found & ~mines:
+                return safe, mines | found
+            mines |= found
+
+    # --- Playing a board ---
+
+    def solves(self, numbers, mine_mask, num_mines, first_click):
+        """
+        True if the board is cleared from the first_click cell index by
+        provable moves only. numbers[i] is cell i's count of mine neighbours.
+
+        Each move is step() followed by opening the safe cells, which is
+        exactly what find_moves() does for a player who keeps its memory,
+        so the two always agree on a board.
+        """
+        zero = 0
+        for cell, number in enumerate(numbers):
+            if number == 0:
+                zero |= 1 << cell
+        zero &= ~mine_mask
+        goal = self.full & ~mine_mask
+        revealed = self.open(1 << first_click, 0, zero)
+        frontier = set(bits(revealed & ~zero))
+        mines = 0
+        enumerated = {}
+        while revealed != goal:
+            safe, mines = self.step(numbers, revealed, mines, frontier, num_mines, enumerated)
+            if not safe:
+                return False
+            opened = self.open(safe, revealed, zero)
+            frontier.update(bits(opened & ~revealed & ~zero))
+            revealed = opened
+        return True
+
+
+solvers = {} # (rows, cols) -> Solver, since building the masks costs more than a solve
+
+
+def solver_for(rows, cols):
+    if (rows, cols) not in solvers:
+        solvers[rows, cols] = Solver(rows, cols)
+    return solvers[rows, cols]
+
+
+def find_moves(board_layout, revealed_cells, flagged_cells, num_mines, memory=None):
+    """
+    The next moves provable from what the player can see: (safe cells,
+    mine cells) as lists of (row, col). Only revealed numbers are read from
+    board_layout. Flags are the player's guesses, so they are not trusted;
+    flagged cells can still come back as safe.
+
+    memory is a dict kept by the caller for one game (start each game with
+    a new one): it carries the mines and enumerations found so far from one
+    call to the next. Opening every safe cell returned and calling again
+    with the same memory plays the board exactly as generate_no_guess()
+    checked it, so its boards always clear this way. Without memory every
+    call starts from scratch, which can miss moves on hard positions.
+    """
+    rows, cols = len(board_layout), len(board_layout[0])
+    solver = solver_for(rows, cols)
+    if memory is None:
+        memory = {}
+    revealed = 0
+    numbers = [0] * (rows * cols)
+    for r in range(rows):
+        for c in range(cols):
+            if revealed_cells[r][c] and board_layout[r][c] >= 0:
+                revealed |= 1 << (r * cols + c)
+                numbers[r * cols + c] = board_layout[r][c]
+    if revealed == 0:
+        return [], []
+    frontier = set(bits(revealed))
+    safe, mines = solver.step(numbers, revealed, memory.get("mines", 0), frontier, num_mines,
+                              memory.setdefault("enumerated", {}))
+    memory["mines"] = mines
+    as_cells = lambda mask: [divmod(cell, cols) for cell in bits(mask)]
+    return as_cells(safe), as_cells(mines)
+
+
+def generate_no_guess(rows, cols, num_mines, first_click, rng=random, max_attempts=100000):
+    """
+    A board_layout (-1 for a mine, else the count of mine neighbours) that
+    can be cleared from first_click (row, col) without guessing, with the
+    first click and its neighbours free of mines. Returns (board_layout,
+    attempts), or raises RuntimeError after max_attempts boards.
+    """
+    solver = solver_for(rows, cols)
+    row, col = first_click
+    start = row * cols + col
+    safe_zone = solver.neighbours[start] | 1 << start
+    free = [cell for cell in range(rows * cols) if not safe_zone >> cell & 1]
+    neighbours = solver.neighbours
+    for attempt in range(1, max_attempts + 1):
+        mine_cells = rng.sample(free, num_mines)
+        mine_mask = 0
+        for cell in mine_cells:
+            mine_mask |= 1 << cell
+        numbers = [(around & mine_mask).bit_count() for around in neighbours]
+        if solver.solves(numbers, mine_mask, num_mines, start):
+            layout = [numbers[r * cols:(r + 1) * cols] for r in range(rows)]
+            for cell in mine_cells:
+                layout[cell // cols][cell % cols] = -1
+            return layout, attempt
+    raise RuntimeError(f"no no-guess board found in {max_attempts} attempts")
@@ -0,0 +1,303 @@
+"""
+Camera mode for boards far bigger than the window (a million cells and up).
+
+The board is a board_engine.MinesweeperBoard. The view is split into
+CHUNK x CHUNK cell chunks that are drawn to surfaces only when they come on
+screen, and kept in a least-recently-used cache. A reveal or flag bumps the
+version of the chunks it touched, so only those get drawn again. Drawing new
+chunks is limited to a few milliseconds per frame; chunks still waiting are
+shown as hidden cells for a frame or two.
+
+    python viewport.py [--rows N] [--cols N] [--mines N]
+
+Left click reveals, right click flags, the wheel zooms around the mouse,
+and dragging with the middle button or the arrow keys/WASD pans.
+"""
+import sys
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+from minesweeper_v2 import (
+    make_tiles, LIGHT_GRAY, DARK_GRAY, WHITE, BLACK, RED, GREEN, BLUE, DARK_BLUE, MAROON, TEAL, ORANGE,
+)
+from board_engine import MinesweeperBoard
+
+SCREEN_WIDTH = 1000
+SCREEN_HEIGHT = 760
+HUD_HEIGHT = 40
+FPS = 60
+
+CHUNK = 32 # Cells per chunk side
+ZOOM_LEVELS = [2, 3, 4, 6, 8, 12, 16, 24, 32] # Cell sizes in pixels
+TILE_ZOOM = 8 # From this cell size up, chunks are drawn with the full tiles
+CACHE_PIXELS = 24_000_000 # Pixels of chunk surfaces to keep (about 96 MB)
+RENDER_BUDGET = 0.004 # Seconds per frame for drawing new chunks
+PAN_SPEED = 900 # Pixels per second with the keyboard
+
+# Cell codes used when drawing a chunk
+HIDDEN, FLAG, MINE = 9, 10, 11
+# Zoomed out, every cell is one flat colour (revealed cells are white so the
+# opened area stands out)
+CODE_COLORS = np.array([
+    WHITE, BLUE, GREEN, RED, DARK_BLUE, MAROON, TEAL, BLACK, ORANGE, # revealed 0-8
+    LIGHT_GRAY, GREEN, RED, # hidden, flag, mine
+], dtype=np.uint8)
+
+
+class ChunkCache:
+    """Chunk surfaces by (chunk row, chunk col, cell size), evicting the least recently used."""
+    def __init__(self, max_pixels=CACHE_PIXELS):
+        self.entries = OrderedDict() # key -> (version, surface)
+        self.max_pixels = max_pixels
+        self.pixels = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version):
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != version:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, version, surface):
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.pixels -= old[1].get_width() * old[1].get_height()
+        self.entries[key] = (version, surface)
+        self.pixels += surface.get_width() * surface.get_height()
+        while self.pixels > self.max_pixels and len(self.entries) > 1:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.pixels -= evicted.get_width() * evicted.get_height()
+
+
+class Viewport:
+    """A pannable, zoomable camera over a rows x cols board."""
+    def __init__(self, rows, cols, num_mines, view_rect, cell_size=16):
+        self.rows, self.cols = rows, cols
+        self.num_mines = num_mines
+        self.board = None # Created on the first click, so it can't be a mine
+        self.view = pygame.Rect(view_rect)
+        self.zoom_index = ZOOM_LEVELS.index(cell_size)
+        self.cell_size = cell_size
+        self.x = self.y = 0.0 # Camera top-left, in pixels at the current zoom
+        self.center_on(rows // 2, cols // 2)
+        self.chunk_rows = -(-rows // CHUNK)
+        self.chunk_cols = -(-cols // CHUNK)
+        self.versions = np.zeros((self.chunk_rows, self.chunk_cols), dtype=np.int64)
+        self.cache = ChunkCache()
+        self.tiles = {} # cell size -> tile surfaces
+        self.chunks_drawn = 0
+        self.pending = 0
+        self.pixel_cost = 5e-9 # Seconds to draw one chunk pixel, kept as a running average
+
+    # --- Camera ---
+
+    def center_on(self, row, col):
+        self.x = col * self.cell_size - self.view.width / 2
+        self.y = row * self.cell_size - self.view.height / 2
+        self.clamp()
+
+    def clamp(self):
+        # Keep some of the board on screen
+        self.x = min(max(self.x, -self.view.width / 2), self.cols * self.cell_size - self.view.width / 2)
+        self.y = min(max(self.y, -self.view.height / 2), self.rows * self.cell_size - self.view.height / 2)
+
+    def pan(self, dx, dy):
+        self.x += dx
+        self.y += dy
+        self.clamp()
+
+    def zoom(self, steps, anchor):
+        """Zooms in (steps > 0) or out, keeping the board point under anchor still."""
+        index = min(max(self.zoom_index + steps, 0), len(ZOOM_LEVELS) - 1)
+        if index == self.zoom_index:
+            return
+        ax, ay = anchor[0] - self.view.x, anchor[1] - self.view.y
+        scale = ZOOM_LEVELS[index] / self.cell_size
+        self.x = (self.x + ax) * scale - ax
+        self.y = (self.y + ay) * scale - ay
+        self.zoom_index = index
+        self.cell_size = ZOOM_LEVELS[index]
+        self.clamp()
+
+    def cell_at(self, pos):
+        """The (row, col) under a screen position, or None."""
+        if not self.view.collidepoint(pos):
+            return None
+        col = int((pos[0] - self.view.x + self.x) // self.cell_size)
+        row = int((pos[1] - self.view.y + self.y) // self.cell_size)
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row, col
+        return None
+
+    # --- Game ---
+
+    def reveal(self, row, col):
+        if self.board is None:
+            self.board = MinesweeperBoard.random(self.rows, self.cols, self.num_mines, (row, col))
+        self.board.reveal(row, col)
+        self.take_changes()
+
+    def toggle_flag(self, row, col):
+        if self.board is not None:
+            self.board.toggle_flag(row, col)
+            self.take_changes()
+
+    def take_changes(self):
+        """Bumps the version of every chunk the board changed since last time."""
+        for top, bottom, left, right in self.board.changed:
+            self.versions[top // CHUNK:(bottom - 1) // CHUNK + 1, left // CHUNK:(right - 1) // CHUNK + 1] += 1
+        self.board.changed.clear()
+
+    # --- Drawing ---
+
+    def chunk_codes(self, chunk_row, chunk_col):
+        """The cell codes (0-8, HIDDEN, FLAG, MINE) of one chunk."""
+        rows = slice(chunk_row * CHUNK, min(self.rows, (chunk_row + 1) * CHUNK))
+        cols = slice(chunk_col * CHUNK, min(self.cols, (chunk_col + 1) * CHUNK))
+        board = self.board
+        if board is None:
+            return np.full((rows.stop - rows.start, cols.stop - cols.start), HIDDEN, dtype=np.int8)
+        counts = board.counts[rows, cols]
+        shown = np.where(counts < 0, MINE, counts)
+        hidden = np.where(board.flagged[rows, cols], FLAG, HIDDEN)
+        return np.where(board.revealed[rows, cols], shown, hidden).astype(np.int8)
+
+    def render_chunk(self, chunk_row, chunk_col):
+        codes = self.chunk_codes(chunk_row, chunk_col)
+        size = self.cell_size
+        if size < TILE_ZOOM:
+            # One flat colour per cell, scaled up with NumPy
+            pixels = CODE_COLORS[codes.T].repeat(size, axis=0).repeat(size, axis=1)
+            return pygame.surfarray.make_surface(pixels).convert()
+
+        tiles = self.tiles.get(size)
+        if tiles is None:
+            tiles = self.tiles[size] = make_tiles(size, pygame.font.Font(None, size + 1))
+        by_code = [tiles[n] for n in range(9)] + [tiles["hidden"], tiles["flag"], tiles["mine"]]
+        surface = pygame.Surface((codes.shape[1] * size, codes.shape[0] * size)).convert()
+        surface.blits([(by_code[code], (c * size, r * size))
+                       for r, row in enumerate(codes.tolist()) for c, code in enumerate(row)], doreturn=False)
+        return surface
+
+    def draw(self, surface):
+        """Draws the visible chunks, rendering missing ones within RENDER_BUDGET."""
+        deadline = time.perf_counter() + RENDER_BUDGET
+        size = self.cell_size
+        span = CHUNK * size
+        surface.fill(BLACK, self.view)
+        clip = surface.get_clip()
+        surface.set_clip(self.view)
+
+        first_row = max(0, int(self.y // span))
+        last_row = min(self.chunk_rows - 1, int((self.y + self.view.height) // span))
+        first_col = max(0, int(self.x // span))
+        last_col = min(self.chunk_cols - 1, int((self.x + self.view.width) // span))
+        self.chunks_drawn = 0
+        self.pending = 0
+        for chunk_row in range(first_row, last_row + 1):
+            for chunk_col in range(first_col, last_col + 1):
+                key = (chunk_row, chunk_col, size)
+                version = self.versions[chunk_row, chunk_col]
+                chunk = self.cache.get(key, version)
+                if chunk is None:
+                    # Draw it if it should fit in what is left of the budget
+                    # (always draw one, so a big zoom still makes progress)
+                    now = time.perf_counter()
+                    if not self.chunks_drawn or now + span * span * self.pixel_cost < deadline:
+                        chunk = self.render_chunk(chunk_row, chunk_col)
+                        self.cache.put(key, version, chunk)
+                        self.chunks_drawn += 1
+                        cost = (time.perf_counter() - now) / (chunk.get_width() * chunk.get_height())
+                        self.pixel_cost = 0.8 * self.pixel_cost + 0.2 * cost
+                    else:
+                        self.pending += 1
+                position = (self.view.x + chunk_col * span - round(self.x),
+                            self.view.y + chunk_row * span - round(self.y))
+                if chunk is not None:
+                    surface.blit(chunk, position)
+                else:
+                    # Not drawn yet: show it as hidden cells until a later frame gets to it
+                    rows = min(CHUNK, self.rows - chunk_row * CHUNK)
+                    cols = min(CHUNK, self.cols - chunk_col * CHUNK)
+                    surface.fill(LIGHT_GRAY, (position, (cols * size, rows * size)))
+        surface.set_clip(clip)
+
+
+def draw_hud(surface, font, viewport, clock):
+    surface.fill(DARK_GRAY, (0, 0, SCREEN_WIDTH, HUD_HEIGHT))
+    board = viewport.board
+    flags = board.flag_count if board else 0
+    status = f"{viewport.rows}x{viewport.cols}  Mines left: {viewport.num_mines - flags}"
+    if board and board.game_over:
+        status += "  Game Over! You hit a mine!"
+    elif board and board.game_won:
+        status += "  Congratulations! You won!"
+    status += f"  |  zoom {viewport.cell_size}px  {clock.get_fps():4.0f} FPS  cached {len(viewport.cache.entries)}"
+    text = font.render(status, True, WHITE)
+    surface.blit(text, (10, (HUD_HEIGHT - text.get_height()) // 2))
+
+
+def main():
+    def option(name, default):
+        return int(sys.argv[sys.argv.index(name) + 1]) if name in sys.argv else default
+
+    rows = option("--rows", 1000)
+    cols = option("--cols", 1000)
+    num_mines = option("--mines", rows * cols * 15 // 100)
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Minesweeper - viewport")
+    hud_font = pygame.font.Font(None, 28)
+    clock = pygame.time.Clock()
+    viewport = Viewport(rows, cols, num_mines, (0, HUD_HEIGHT, SCREEN_WIDTH, SCREEN_HEIGHT - HUD_HEIGHT))
+
+    dragging = False
+    running = True
+    while running:
+        dt = clock.tick(FPS) / 1000
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.MOUSEWHEEL:
+                viewport.zoom(event.y, pygame.mouse.get_pos())
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                cell = viewport.cell_at(event.pos)
+                board = viewport.board
+                if event.button == 2:
+                    dragging = True
+                elif board and (board.game_over or board.game_won):
+                    # A click after the game ends starts a new one. Wheel
+                    # notches also arrive as buttons 4 and 5; they only zoom.
+                    if event.button in (1, 3):
+                        viewport = Viewport(rows, cols, num_mines, viewport.view, viewport.cell_size)
+                elif cell and event.button == 1:
+                    viewport.reveal(*cell)
+                elif cell and event.button == 3:
+                    viewport.toggle_flag(*cell)
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 2:
+                dragging = False
+            elif event.type == pygame.MOUSEMOTION and dragging:
+                viewport.pan(-event.rel[0], -event.rel[1])
+
+        keys = pygame.key.get_pressed()
+        step = PAN_SPEED * dt
+        viewport.pan(((keys[pygame.K_RIGHT] or keys[pygame.K_d]) - (keys[pygame.K_LEFT] or keys[pygame.K_a])) * step,
+                     ((keys[pygame.K_DOWN] or keys[pygame.K_s]) - (keys[pygame.K_UP] or keys[pygame.K_w])) * step)
+
+        viewport.draw(screen)
+        draw_hud(screen, hud_font, viewport, clock)
+        pygame.display.flip()
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Autopilot: model-predictive control over batched rollouts of the lander.
+
+The autopilot flies a small parametric controller (how fast to drift toward
+the pad, how fast to descend, how hard to tilt). Each frame it searches
+those parameters by rolling many candidates forward at once with
+LanderBatch (the exact physics of update_lander) against the real terrain,
+and scores where they end up against the landing criteria. The best
+candidate picks this frame's controls.
+
+Rollouts are resumable: each act() call advances the current batch of
+rollouts only until its time budget runs out and carries on from there next
+frame, keeping the search distribution and the best parameters between
+frames. Running averages of what a batch step, setting up a rollout and
+finishing one cost decide whether the next of them still fits, and nothing
+new starts once the deadline has passed. These are estimates, not a hard
+limit: a step that runs long (a garbage collection, the OS scheduling
+something else) still overruns, so benchmark_autopilot.py reports how often
+frames go over the budget and by how much.
+"""
+import time
+
+import numpy as np
+
+from lander import WIDTH, HEIGHT, START_FUEL, MAX_LANDING_SPEED, MAX_LANDING_ANGLE, ROT_THRUST
+from batch_physics import LanderBatch, LANDED, CRASHED
+from lander_env import MAIN, LEFT, RIGHT, ACTION_KEYS
+
+# Controller parameters: name, starting value, search spread, lower and upper bounds
+PARAMETERS = [
+    ("drift_gain", 0.012, 0.004, 0.002, 0.04),      # wanted vx per px from the pad centre
+    ("max_drift", 2.0, 0.5, 0.5, 4.0),              # largest wanted |vx|
+    ("descent_gain", 0.015, 0.005, 0.003, 0.05),    # wanted vy per px above the pad
+    ("max_descent", 2.0, 0.5, 0.5, 4.0),            # largest wanted vy
+    ("touchdown_speed", 0.8, 0.2, 0.2, MAX_LANDING_SPEED * 0.9),
+    ("clearance", 60.0, 20.0, 20.0, 160.0),         # height to keep above the ground off the pad
+    ("tilt_gain", 20.0, 6.0, 4.0, 60.0),            # degrees of tilt per px/frame of vx error
+    ("max_tilt", 20.0, 6.0, 5.0, 45.0),
+]
+DEFAULT_PARAMS = np.array([p[1] for p in PARAMETERS])
+PARAM_SPREAD = np.array([p[2] for p in PARAMETERS])
+PARAM_LOW = np.array([p[3] for p in PARAMETERS])
+PARAM_HIGH = np.array([p[4] for p in PARAMETERS])
+
+CRASH_COST = 20000.0
+LANDED_COST = -10000.0
+RESERVE = 0.00015  # seconds of the budget kept for the final controller call
+
+
+def controller(params, x, y, vx, vy, angle, ground_y, pad):
+    """
+    The parametric controller, for N landers at once.
+
+    params is (N, len(PARAMETERS)) or one row for all; the rest are arrays
+    of N. Returns (main, left, right) boolean arrays.
+    """
+    drift_gain, max_drift, descent_gain, max_descent, touchdown_speed, clearance, tilt_gain, max_tilt = params.T
+    # Horizontal distance to the pad centre, the short way round the wrap
+    dx = (pad.x + pad.w / 2 - x + WIDTH / 2) % WIDTH - WIDTH / 2
+    bottom = y + 14
+    over_pad = np.abs(dx) < pad.w / 2 - 8
+
+    vx_wanted = np.clip(dx * drift_gain, -max_drift, max_drift)
+    vx_wanted = np.where(over_pad & (pad.y - bottom < 40), 0.0, vx_wanted)
+    # Over the pad: slow down on the way in. Elsewhere: also keep clear of the ground
+    vy_pad = np.clip((pad.y - bottom) * descent_gain + touchdown_speed, touchdown_speed, max_descent)
+    vy_clear = np.clip((ground_y - bottom - clearance) * descent_gain, -1.0, max_descent)
+    vy_wanted = np.where(over_pad, vy_pad, np.minimum(vy_pad, vy_clear))
+
+    # Tilt against the horizontal error (negative angle pushes right), level for touchdown
+    angle_wanted = np.clip((vx - vx_wanted) * tilt_gain, -max_tilt, max_tilt)
+    angle_wanted = np.where(over_pad & (pad.y - bottom < 25), 0.0, angle_wanted)
+    angle = (angle + 180) % 360 - 180
+    left = angle > angle_wanted + ROT_THRUST / 2
+    right = angle < angle_wanted - ROT_THRUST / 2
+    # Burn to slow the descent, or to push sideways once tilted the right way
+    main = (vy > vy_wanted) | ((np.abs(vx - vx_wanted) > 0.5) & (np.abs(angle - angle_wanted) < 5) & (vy > vy_wanted - 0.3))
+    return main, left, right
+
+
+class Rollout:
+    """One batch of candidate parameters being flown forward from a start state."""
+    def __init__(self, lander, params, horizon, step_cost):
+        self.params = params
+        self.step_cost = step_cost  # seconds per batch step, kept as a running average
+        self.batch = LanderBatch.from_landers([lander] * len(params))
+        self.horizon = horizon
+        self.step = 0
+        self.finished_at = np.full(len(params), horizon)
+        self.outcome = np.zeros(len(params), dtype=np.int8)
+        self.impact = np.zeros(len(params))
+
+    def advance(self, terrain, pad, deadline):
+        """
+        Steps the batch until the horizon, until every lander is down, or
+        until another step would run past deadline. Returns True when done.
+        """
+        batch = self.batch
+        while self.step < self.horizon:
+            flying = batch.flying()
+            if not flying.any():
+                return True
+            now = time.perf_counter()
+            if now + 2 * self.step_cost >= deadline:
+                return False
+            main, left, right = controller(self.params, batch.x, batch.y, batch.vx, batch.vy, batch.angle,
+                                           terrain.ground_y_batch(batch.x), pad)
+            batch.update(main, left, right)
+            speed = np.maximum(np.abs(batch.vx), np.abs(batch.vy))
+            outcome, _ = batch.check_collision(terrain)
+            fell = batch.flying() & (batch.y > HEIGHT + 60)
+            batch.alive[fell] = False
+            outcome[fell] = CRASHED
+            down = outcome != 0
+            self.outcome[down] = outcome[down]
+            self.impact[down] = speed[down]
+            self.finished_at[down] = self.step
+            self.step += 1
+            self.step_cost = 0.9 * self.step_cost + 0.1 * (time.perf_counter() - now)
+        return True
+
+    def costs(self, pad):
+        """Lower is better: landings by fuel and time, crashes by impact, the rest by how far from a landing they are."""
+        batch = self.batch
+        dx = np.abs((pad.x + pad.w / 2 - batch.x + WIDTH / 2) % WIDTH - WIDTH / 2)
+        height = np.abs(pad.y - (batch.y + 14))
+        angle = np.abs((batch.angle + 180) % 360 - 180)
+        flying = (dx * 3 + height + 40 * np.maximum(0, batch.vy - MAX_LANDING_SPEED)
+                  + 10 * np.abs(batch.vx) + 2 * np.maximum(0, angle - MAX_LANDING_ANGLE)
+                  + (START_FUEL - batch.fuel) * 2)
+        landed = LANDED_COST - batch.fuel * 10 + self.finished_at * 0.5
+        crashed = CRASH_COST + self.impact * 100 - self.finished_at * 10
+        return np.where(self.outcome == LANDED, landed, np.where(self.outcome == CRASHED, crashed, flying))
+
+
+class Autopilot:
+    """
+    Plans controls for one lander on one terrain, budget_ms per frame.
+
+    Call act(lander) once per frame; it returns an action for lander_env's
+    bit flags (MAIN, LEFT, RIGHT), and keys(lander) returns the same as a
+    keys mapping for update_lander.
+    """
+    def __init__(self, terrain, budget_ms=2.0, candidates=48, horizon=150, seed=0):
+        self.terrain = terrain
+        self.budget = budget_ms / 1000
+        self.candidates = candidates
+        self.horizon = horizon
+        self.rng = np.random.default_rng(seed)
+        self.mean = DEFAULT_PARAMS.copy()
+        self.spread = PARAM_SPREAD.copy()
+        self.best = DEFAULT_PARAMS.copy()
+        self.pad = None
+        self.rollout = None
+        self.rollouts_done = 0
+        self.step_cost = 0.0003
+        self.setup_cost = 0.0002  # seconds to sample and build a Rollout, as a running average
+        self.finish_cost = 0.0001  # seconds for finish(), as a running average
+        self.last_ms = 0.0
+
+    def nearest_pad(self, lander):
+        return min(self.terrain.pads, key=lambda pad: abs((pad.x + pad.w / 2 - lander.x + WIDTH / 2) % WIDTH - WIDTH / 2))
+
+    def sample(self):
+        """The current best plus candidates drawn around the search mean."""
+        params = self.mean + self.rng.standard_normal((self.candidates, len(PARAMETERS))) * self.spread
+        params[0] = self.best
+        params[1] = self.mean
+        return np.clip(params, PARAM_LOW, PARAM_HIGH)
+
+    def finish(self):
+        """Takes the best candidate and moves the search toward the best quarter."""
+        costs = self.rollout.costs(self.pad)
+        order = np.argsort(costs, kind="stable")
+        params = self.rollout.params
+        self.best = params[order[0]]
+        elite = params[order[:max(2, len(order) // 4)]]
+        self.mean = 0.7 * self.mean + 0.3 * elite.mean(axis=0)
+        self.spread = np.maximum(0.7 * self.spread + 0.3 * elite.std(axis=0), PARAM_SPREAD * 0.2)
+        self.rollout = None
+        self.rollouts_done += 1
+
+    def act(self, lander):
+        start = time.perf_counter()
+        deadline = start + self.budget
+        if not self.terrain.pads:
+            return 0
+        if self.pad is None:
+            self.pad = self.nearest_pad(lander)
+        # Leave room for choosing this frame's controls at the end
+        deadline -= RESERVE
+        while True:
+            now = time.perf_counter()
+            if self.rollout is None:
+                if now + self.setup_cost + 2 * self.step_cost >= deadline:
+                    break
+                self.rollout = Rollout(lander, self.sample(), self.horizon, self.step_cost)
+                self.setup_cost = 0.9 * self.setup_cost + 0.1 * (time.perf_counter() - now)
+            # A step that completes the rollout must leave time to finish it
+            done = self.rollout.advance(self.terrain, self.pad, deadline - self.finish_cost)
+            self.step_cost = self.rollout.step_cost
+            if not done:
+                break
+            now = time.perf_counter()
+            self.finish()
+            self.finish_cost = 0.9 * self.finish_cost + 0.1 * (time.perf_counter() - now)
+
+        main, left, right = controller(
+            self.best, np.array([lander.x]), np.array([lander.y]), np.array([lander.vx]),
+            np.array([lander.vy]), np.array([lander.angle]), self.terrain.ground_y_batch([lander.x]), self.pad)
+        self.last_ms = (time.perf_counter() - start) * 1000
+        return MAIN * bool(main[0]) | LEFT * bool(left[0]) | RIGHT * bool(right[0])
+
+    def keys(self, lander):
+        return ACTION_KEYS[self.act(lander)]
@@ -0,0 +1,144 @@
+"""
+Batched lander physics: N landers advanced together with NumPy.
+
+LanderBatch keeps x, y, vx, vy, angle and fuel for every lander in arrays and
+applies the exact rules of update_lander and check_collision as array
+operations, so thousands of landers (for example, one per autopilot rollout)
+can be stepped at once. Every operation is done in the same order and with the
+same float64 math as the scalar code, so the results are bit-for-bit equal.
+"""
+import numpy as np
+
+from lander import (
+    Lander, WIDTH, HEIGHT, GRAVITY, THRUST, ROT_THRUST, FUEL_BURN_MAIN, FUEL_BURN_RCS,
+    MAX_LANDING_SPEED, MAX_LANDING_ANGLE, START_FUEL,
+)
+
+# Outcome codes returned by LanderBatch.check_collision
+FLYING = 0
+LANDED = 1
+CRASHED = 2
+
+
+class LanderBatch:
+    """State of N landers, one array element per lander."""
+    def __init__(self, count, x=WIDTH * 0.2, y=HEIGHT * 0.15, fuel=START_FUEL):
+        self.x = np.full(count, x, dtype=np.float64)
+        self.y = np.full(count, y, dtype=np.float64)
+        self.vx = np.zeros(count)
+        self.vy = np.zeros(count)
+        self.angle = np.zeros(count)
+        self.fuel = np.full(count, fuel, dtype=np.float64)
+        self.alive = np.ones(count, dtype=bool)
+        self.landed = np.zeros(count, dtype=bool)
+
+    def __len__(self):
+        return len(self.x)
+
+    @classmethod
+    def from_landers(cls, landers):
+        """Builds a batch from a list of Lander dataclasses."""
+        batch = cls(len(landers))
+        for name in ("x", "y", "vx", "vy", "angle", "fuel", "alive", "landed"):
+            getattr(batch, name)[:] = [getattr(lander, name) for lander in landers]
+        return batch
+
+    def lander(self, i):
+        """Returns lander i as a Lander dataclass (for drawing or comparing)."""
+        return Lander(float(self.x[i]), float(self.y[i]), float(self.vx[i]), float(self.vy[i]),
+                      float(self.angle[i]), float(self.fuel[i]), bool(self.alive[i]), bool(self.landed[i]))
+
+    def flying(self):
+        """Mask of landers that are still in the air (alive and not landed)."""
+        return self.alive & ~self.landed
+
+    def update(self, main, left, right):
+        """
+        Batch version of update_lander.
+
+        main, left and right are boolean arrays saying which controls each
+        lander is pressing. Landers that crashed or landed are left alone.
+        Returns the same thrust flags as update_lander, as arrays.
+        """
+        flying = self.flying()
+
+        # rotation
+        rcs_left = flying & left & (self.fuel > 0)
+        self.angle[rcs_left] -= ROT_THRUST
+        self.fuel[rcs_left] = np.maximum(0.0, self.fuel[rcs_left] - FUEL_BURN_RCS)
+        rcs_right = flying & right & (self.fuel > 0)
+        self.angle[rcs_right] += ROT_THRUST
+        self.fuel[rcs_right] = np.maximum(0.0, self.fuel[rcs_right] - FUEL_BURN_RCS)
+
+        # main engine
+        thrusting = flying & main & (self.fuel > 0)
+        rad = np.radians(self.angle[thrusting])
+        self.vx[thrusting] += -np.sin(rad) * THRUST
+        self.vy[thrusting] += -np.cos(rad) * THRUST
+        self.fuel[thrusting] = np.maximum(0.0, self.fuel[thrusting] - FUEL_BURN_MAIN)
+
+        # gravity
+        self.vy[flying] += GRAVITY
+
+        # integrate (with horizontal wrap, like wrap())
+        x = self.x[flying] + self.vx[flying]
+        x = np.where(x < 0, x + WIDTH, np.where(x >= WIDTH, x - WIDTH, x))
+        self.x[flying] = x
+        self.y[flying] += self.vy[flying]
+
+        return {"main": thrusting, "rcs_left": rcs_left, "rcs_right": rcs_right}
+
+    def check_collision(self, terrain):
+        """
+        Batch version of check_collision for the landers still flying.
+
+        Ground height and pad lookups use the Terrain's per-column tables.
+
+        Returns (outcome, pad_index): outcome is FLYING, LANDED or CRASHED for
+        every lander, and pad_index is the index into pads of the pad each
+        lander landed on, or -1.
+        """
+        count = len(self)
+        outcome = np.full(count, FLYING, dtype=np.int8)
+        pad_index = np.full(count, -1, dtype=np.int64)
+        flying = np.flatnonzero(self.flying())
+        if len(flying) == 0:
+            return outcome, pad_index
+
+        x = self.x[flying]
+        bottom = self.y[flying] + 14
+        ground_y = terrain.ground_y_batch(x)
+
+        contact = bottom >= ground_y
+        if not contact.any():
+            return outcome, pad_index
+        hit = flying[contact]
+        x = x[contact]
+        bottom = bottom[contact]
+
+        # pad under the lander, if its feet are level with it
+        pads = terrain.pads
+        # The extra entry lets index -1 (no pad) be looked up harmlessly
+        pad_y = np.array([pad.y for pad in pads] + [0], dtype=np.float64)
+        on_pad = terrain.pad_index_batch(x)
+        on_pad[np.abs(bottom - pad_y[on_pad]) >= 4] = -1
+
+        angle_ok = np.abs(((self.angle[hit] + 180) % 360) - 180) <= MAX_LANDING_ANGLE
+        speed_ok = (np.abs(self.vx[hit]) <= MAX_LANDING_SPEED) & (self.vy[hit] <= MAX_LANDING_SPEED)
+        safe = (on_pad >= 0) & angle_ok & speed_ok
+
+        landed = hit[safe]
+        self.landed[landed] = True
+        self.alive[landed] = True
+        self.y[landed] = pad_y[on_pad[safe]] - 14
+        self.vx[landed] = 0
+        self.vy[landed] = 0
+        outcome[landed] = LANDED
+        pad_index[landed] = on_pad[safe]
+
+        crashed = hit[~safe]
+        self.alive[crashed] = False
+        self.landed[crashed] = False
+        outcome[crashed] = CRASHED
+        return outcome, pad_index
+
@@ -0,0 +1,125 @@
+"""
+Checks LanderBatch against the scalar update_lander/check_collision, then
+measures throughput in lander-steps per second. Run it with:
+
+    python benchmark_batch.py [--landers N] [--steps N]
+"""
+import sys
+import time
+import random
+
+import numpy as np
+import pygame
+
+from lander import Lander, Terrain, WIDTH, HEIGHT, START_FUEL, generate_terrain, update_lander, check_collision
+from batch_physics import LanderBatch, FLYING, LANDED, CRASHED
+
+OUTCOME_CODES = {None: FLYING, "landed": LANDED, "crash": CRASHED}
+
+
+def keys_for(main, left, right):
+    """A stand-in for pygame.key.get_pressed() with the given controls held."""
+    return {pygame.K_UP: main, pygame.K_w: False, pygame.K_SPACE: False,
+            pygame.K_LEFT: left, pygame.K_a: False, pygame.K_RIGHT: right, pygame.K_d: False}
+
+
+def random_controls(rng, count):
+    """Random control presses."""
+    main = rng.random(count) < 0.45
+    left = rng.random(count) < 0.15
+    right = rng.random(count) < 0.15
+    return main, left, right
+
+
+def hover_controls(rng, batch, max_descent):
+    """
+    A noisy descent controller, so some landers touch down gently.
+
+    Burns when falling faster than each lander's max_descent, levels the
+    angle, and adds random presses on top.
+    """
+    main, left, right = random_controls(rng, len(batch))
+    main = (batch.vy > max_descent) | (main & (rng.random(len(batch)) < 0.1))
+    left = (batch.angle > 3) | (left & (rng.random(len(batch)) < 0.2))
+    right = (batch.angle < -3) | (right & (rng.random(len(batch)) < 0.2))
+    return main, left, right
+
+
+def start_landers(rng, count):
+    """Landers spread across the screen with small random starting drift."""
+    return [Lander(rng.uniform(0, WIDTH), HEIGHT * rng.uniform(0.05, 0.3),
+                   rng.uniform(-1, 1), rng.uniform(-0.5, 0.5), rng.uniform(-10, 10), START_FUEL)
+            for _ in range(count)]
+
+
+def check_equivalence(count=500, steps=900, seed=3):
+    random.seed(seed)
+    terrain = Terrain(*generate_terrain(WIDTH, HEIGHT))
+    pads = terrain.pads
+    py_rng = random.Random(seed)
+    landers = start_landers(py_rng, count)
+    batch = LanderBatch.from_landers(landers)
+    rng = np.random.default_rng(seed)
+
+    max_descent = rng.uniform(0.6, 2.0, count)
+    finished = [False] * count
+    for step in range(steps):
+        main, left, right = hover_controls(rng, batch, max_descent)
+        batch.update(main, left, right)
+        outcome, pad_index = batch.check_collision(terrain)
+        for i, lander in enumerate(landers):
+            if finished[i]:
+                continue
+            update_lander(lander, keys_for(main[i], left[i], right[i]))
+            result, pad = check_collision(lander, terrain)
+            finished[i] = result is not None
+            expected_pad = pads.index(pad) if pad else -1
+            if (OUTCOME_CODES[result] != outcome[i] or expected_pad != pad_index[i]
+                    or lander != batch.lander(i)):
+                print(f"MISMATCH at step {step}, lander {i}: {lander} vs {batch.lander(i)}")
+                sys.exit(1)
+    landed = int(batch.landed.sum())
+    crashed = int((~batch.alive).sum())
+    print(f"{count} landers x {steps} steps match the scalar code exactly "
+          f"({landed} landed, {crashed} crashed)")
+
+
+def main():
+    def option(name, default):
+        return int(sys.argv[sys.argv.index(name) + 1]) if name in sys.argv else default
+
+    count = option("--landers", 10000)
+    steps = option("--steps", 300)
+
+    check_equivalence()
+
+    random.seed(1)
+    terrain = Terrain(*generate_terrain(WIDTH, HEIGHT))
+    rng = np.random.default_rng(1)
+    controls = [random_controls(rng, count) for _ in range(steps)]
+
+    # Scalar baseline on a slice of the landers, to keep it quick
+    scalar_count = min(count, 500)
+    landers = start_landers(random.Random(1), scalar_count)
+    start = time.perf_counter()
+    for main, left, right in controls:
+        for i, lander in enumerate(landers):
+            if lander.alive and not lander.landed:
+                update_lander(lander, keys_for(main[i], left[i], right[i]))
+                check_collision(lander, terrain)
+    scalar_rate = scalar_count * steps / (time.perf_counter() - start)
+
+    batch = LanderBatch.from_landers(start_landers(random.Random(1), count))
+    start = time.perf_counter()
+    for main, left, right in controls:
+        batch.update(main, left, right)
+        batch.check_collision(terrain)
+    batch_rate = count * steps / (time.perf_counter() - start)
+
+    print(f"scalar: {scalar_rate:14,.0f} lander-steps/s ({scalar_count} landers)")
+    print(f"batch:  {batch_rate:14,.0f} lander-steps/s ({count} landers)  "
+          f"-> {batch_rate / scalar_rate:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
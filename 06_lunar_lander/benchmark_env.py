@@ -0,0 +1,63 @@
+"""
+Checks that VectorLanderEnv gives the same results in-process and across
+worker processes, then reports env-steps per second for each. Run it with:
+
+    python benchmark_env.py [--envs N] [--workers N] [--steps N] [--library FILE]
+"""
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+
+from lander_env import VectorLanderEnv, ACTION_COUNT
+
+
+def run(env, actions, seed):
+    """Steps env through the actions; returns everything it observed and its rewards."""
+    observations, _ = env.reset(seed=seed)
+    history = [observations]
+    total_reward = 0.0
+    episodes = landed = 0
+    for step_actions in actions:
+        observations, rewards, terminated, truncated, infos = env.step(step_actions)
+        history.append(observations)
+        total_reward += rewards.sum()
+        episodes += int((terminated | truncated).sum())
+        landed += sum(info["outcome"] == "landed" for info in infos)
+    return np.array(history), total_reward, episodes, landed
+
+
+def main():
+    def option(name, default):
+        return int(sys.argv[sys.argv.index(name) + 1]) if name in sys.argv else default
+
+    num_envs = option("--envs", 64)
+    workers = option("--workers", os.cpu_count())
+    steps = option("--steps", 500)
+    library_path = sys.argv[sys.argv.index("--library") + 1] if "--library" in sys.argv else None
+
+    rng = np.random.default_rng(0)
+    actions = rng.integers(0, ACTION_COUNT, size=(steps, num_envs))
+
+    results = {}
+    for count in (0, workers):
+        env = VectorLanderEnv(num_envs, workers=count, library_path=library_path)
+        history, total_reward, episodes, landed = run(env, actions, seed=100)
+        env.close()
+        results[count] = history
+        label = "in-process" if count == 0 else f"{count} workers"
+        print(f"{label:12s} {env.steps_per_second:12,.0f} env-steps/s "
+              f"({num_envs} envs x {steps} steps, {episodes} episodes, {landed} landed, "
+              f"total reward {total_reward:.0f})")
+
+    if np.array_equal(results[0], results[workers]):
+        print("in-process and worker runs match exactly")
+    else:
+        print("MISMATCH between in-process and worker runs")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Frame time of the lander's drawing, redrawing the whole scene every frame
+(the old way) versus blitting the cached background only over dirty rects.
+
+The full redraw reproduces the old per-frame work: fill the sky, scatter the
+stars, fill the terrain polygon, draw the pads and flip the whole display.
+Run it with:
+
+    python benchmark_render.py [--frames N]
+"""
+import os
+import sys
+import time
+import random
+import statistics
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from lander import (
+    Lander, GameState, WIDTH, HEIGHT, START_FUEL, reset_game, update_lander, check_collision,
+    draw_terrain, draw_stars, draw_pads, draw_frame, render_background, restore_background,
+)
+
+
+def autopilot_keys(lander):
+    """Falls slowly and keeps upright, so the lander stays on screen."""
+    return {pygame.K_UP: lander.vy > 0.8, pygame.K_w: False, pygame.K_SPACE: False,
+            pygame.K_LEFT: lander.angle > 3, pygame.K_a: False,
+            pygame.K_RIGHT: lander.angle < -3, pygame.K_d: False}
+
+
+def fly(frames):
+    """The lander states and thrust flags of a scripted flight, one per frame."""
+    lander = Lander(WIDTH * 0.2, HEIGHT * 0.15, 1.2, 0.0, 0.0, START_FUEL)
+    _, terrain, _, _, _ = reset_game()
+    states = []
+    for _ in range(frames):
+        thrust = update_lander(lander, autopilot_keys(lander))
+        outcome, _ = check_collision(lander, terrain)
+        states.append((Lander(**vars(lander)), thrust))
+        if outcome or lander.fuel <= 0:
+            lander = Lander(random.uniform(0, WIDTH), HEIGHT * 0.15, 1.2, 0.0, 0.0, START_FUEL)
+    return terrain, states
+
+
+def full_redraw(screen, font, small, terrain, states):
+    samples = []
+    for lander, thrust in states:
+        start = time.perf_counter()
+        draw_terrain(screen, terrain.points)
+        draw_stars(screen, random)
+        draw_pads(screen, terrain.pads)
+        draw_frame(screen, font, small, GameState.PLAYING, lander, thrust, 0, 0)
+        pygame.display.flip()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def dirty_redraw(screen, font, small, terrain, states):
+    background = render_background(terrain)
+    screen.blit(background, (0, 0))
+    pygame.display.flip()
+    dirty = []
+    samples = []
+    for lander, thrust in states:
+        start = time.perf_counter()
+        restore_background(screen, background, dirty)
+        drawn = draw_frame(screen, font, small, GameState.PLAYING, lander, thrust, 0, 0)
+        pygame.display.update(dirty + drawn)
+        dirty = drawn
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    frames = 1000
+    if "--frames" in sys.argv:
+        frames = int(sys.argv[sys.argv.index("--frames") + 1])
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    font = pygame.font.SysFont("consolas", 36)
+    small = pygame.font.SysFont("consolas", 18)
+    random.seed(4)
+    terrain, states = fly(frames)
+
+    print(f"{frames} frames per run (drawing and display update only)")
+    results = {}
+    for label, run in (("full", full_redraw), ("dirty", dirty_redraw)):
+        samples = run(screen, font, small, terrain, states)
+        results[label] = statistics.mean(samples)
+        print(f"  {label:5s} redraw mean {results[label]:6.3f} ms | "
+              f"p95 {sorted(samples)[int(len(samples) * 0.95)]:6.3f} ms")
+    print(f"  dirty rects are {results['full'] / results['dirty']:.1f}x faster")
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
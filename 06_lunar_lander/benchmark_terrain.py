@@ -0,0 +1,91 @@
+"""
+Checks the Terrain lookup tables against the old linear segment scan, then
+times single and batch contact queries. Run it with:
+
+    python benchmark_terrain.py [--queries N]
+"""
+import sys
+import time
+import random
+
+import numpy as np
+
+from lander import WIDTH, HEIGHT, Terrain, generate_terrain
+
+
+def scan_ground_y(terrain_points, x):
+    """The old check_collision lookup: walk the segments until one contains x."""
+    for i in range(len(terrain_points) - 1):
+        (x1, y1), (x2, y2) = terrain_points[i], terrain_points[i + 1]
+        if x1 <= x <= x2:
+            t = (x - x1) / (x2 - x1) if x2 != x1 else 0
+            return y1 + t * (y2 - y1)
+    return HEIGHT
+
+
+def scan_pad(pads, x):
+    for pad in pads:
+        if pad.x <= x <= pad.x + pad.w:
+            return pad
+    return None
+
+
+def main():
+    queries = 20000
+    if "--queries" in sys.argv:
+        queries = int(sys.argv[sys.argv.index("--queries") + 1])
+
+    rng = random.Random(2)
+    checked = 0
+    for seed in range(20):
+        random.seed(seed)
+        points, pads = generate_terrain(WIDTH, HEIGHT)
+        terrain = Terrain(points, pads)
+        # Fractional positions, whole columns and the edges of every pad
+        xs = [rng.uniform(-5, WIDTH + 5) for _ in range(2000)]
+        xs += [float(c) for c in range(-1, WIDTH + 2)]
+        xs += [edge + d for pad in pads for edge in (pad.x, pad.x + pad.w) for d in (-0.5, 0, 0.5)]
+        batch_y = terrain.ground_y_batch(xs)
+        batch_pad = terrain.pad_index_batch(xs)
+        for i, x in enumerate(xs):
+            expected_y = scan_ground_y(points, x)
+            expected_pad = scan_pad(pads, x)
+            expected_index = pads.index(expected_pad) if expected_pad else -1
+            if (terrain.ground_y(x) != expected_y or batch_y[i] != expected_y
+                    or terrain.pad_at(x) is not expected_pad or batch_pad[i] != expected_index):
+                print(f"MISMATCH on terrain {seed} at x={x}")
+                sys.exit(1)
+        checked += len(xs)
+    print(f"{checked} lookups on 20 terrains match the linear scan exactly")
+
+    random.seed(0)
+    points, pads = generate_terrain(WIDTH, HEIGHT)
+    terrain = Terrain(points, pads)
+    xs = [rng.uniform(0, WIDTH) for _ in range(queries)]
+
+    start = time.perf_counter()
+    for x in xs:
+        scan_ground_y(points, x)
+        scan_pad(pads, x)
+    scan_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for x in xs:
+        terrain.ground_y(x)
+        terrain.pad_at(x)
+    table_time = time.perf_counter() - start
+
+    array = np.array(xs)
+    start = time.perf_counter()
+    terrain.ground_y_batch(array)
+    terrain.pad_index_batch(array)
+    batch_time = time.perf_counter() - start
+
+    print(f"linear scan:  {scan_time / queries * 1e6:8.3f} us per query")
+    print(f"lookup table: {table_time / queries * 1e6:8.3f} us per query "
+          f"({scan_time / table_time:.0f}x faster)")
+    print(f"batch query:  {batch_time / queries * 1e6:8.3f} us per query ({queries} at once)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Shows that the fixed-timestep physics does not depend on the frame rate, and
+that swept contact catches terrain a lander would skip over between steps.
+Run it with:
+
+    python check_timestep.py
+"""
+import random
+
+import pygame
+
+from lander import (
+    Lander, Terrain, Pad, WIDTH, HEIGHT, START_FUEL, FPS, PhysicsClock,
+    generate_terrain_seeded, update_lander, check_collision, step_physics,
+)
+
+NO_KEYS = {pygame.K_UP: False, pygame.K_w: False, pygame.K_SPACE: False,
+           pygame.K_LEFT: False, pygame.K_a: False, pygame.K_RIGHT: False, pygame.K_d: False}
+BURN_KEYS = {**NO_KEYS, pygame.K_UP: True}
+
+
+def keys_at(seconds):
+    """A fixed burn schedule by simulated time, so every frame rate flies the same plan."""
+    return BURN_KEYS if 0.8 <= seconds % 2.0 < 1.6 else NO_KEYS
+
+
+def fly_fixed_step(terrain, frame_ms, jitter, hz):
+    """Renders at frame_ms (+- jitter) with physics at hz; returns (seconds, outcome, x)."""
+    rng = random.Random(1)
+    lander = Lander(WIDTH * 0.2, HEIGHT * 0.15, 1.0, 0.0, 0.0, START_FUEL)
+    physics = PhysicsClock(hz)
+    sim_seconds = 0.0
+    while True:
+        steps = physics.advance(frame_ms + rng.uniform(-jitter, jitter))
+        for _ in range(steps):
+            outcome, _, _ = step_physics(lander, terrain, keys_at(sim_seconds), 1, physics.dt)
+            sim_seconds += 1 / hz
+            if outcome:
+                return sim_seconds, outcome, lander.x
+
+
+def fly_per_frame(terrain, frame_ms):
+    """The old loop: one physics frame per rendered frame, whatever its length."""
+    lander = Lander(WIDTH * 0.2, HEIGHT * 0.15, 1.0, 0.0, 0.0, START_FUEL)
+    wall_ms = 0.0
+    frames = 0
+    while True:
+        update_lander(lander, keys_at(frames / FPS))
+        outcome, _ = check_collision(lander, terrain)
+        frames += 1
+        wall_ms += frame_ms
+        if outcome:
+            return wall_ms / 1000, outcome, lander.x
+
+
+def main():
+    terrain = Terrain(*generate_terrain_seeded(7))
+    print("Touchdown in wall-clock seconds, by render rate:")
+    for fps in (60, 30, 20):
+        frame_ms = 1000 / fps
+        old = fly_per_frame(terrain, frame_ms)
+        new = fly_fixed_step(terrain, frame_ms, frame_ms * 0.3, 240)
+        print(f"  {fps:2d} FPS  per-frame physics: {old[0]:6.2f} s ({old[1]} at x={old[2]:6.1f})   "
+              f"240 Hz fixed step: {new[0]:6.2f} s ({new[1]} at x={new[2]:6.1f})")
+
+    # A one-pixel-wide spike the lander passes at 6 px per frame
+    points = [(0, 500), (399, 500), (400, 300), (401, 500), (WIDTH, 500)]
+    spike = Terrain(points, [Pad(600, 500, 80)])
+    print("Flying level past a thin spike at 6 px per frame:")
+    for label, hz in (("60 Hz, contact at step ends", None), ("60 Hz, swept contact", 60), ("240 Hz, swept contact", 240)):
+        lander = Lander(380.0, 350.0, 6.0, -0.12, 0.0, START_FUEL)  # vy cancels the first frame's gravity
+        outcome = None
+        for _ in range(6):
+            if hz is None:
+                update_lander(lander, NO_KEYS)
+                outcome, _ = check_collision(lander, spike)
+            else:
+                outcome, _, _ = step_physics(lander, spike, NO_KEYS, hz // 60, 60 / hz)
+            if outcome:
+                break
+        print(f"  {label:28s} -> {outcome or 'passed through'} at x={lander.x:.1f}")
+
+
+if __name__ == "__main__":
+    main()
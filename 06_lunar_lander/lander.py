@@ -2,6 +2,7 @@ import math
 import sys
 import random
 import pygame
+import numpy as np
 from dataclasses import dataclass
 from enum import Enum, auto
 
@@ -18,6 +19,7 @@ FUEL_BURN_RCS = 0.06   # units/frame when rotating
 MAX_LANDING_SPEED = 1.4  # max |vx| and vy for safe landing
 MAX_LANDING_ANGLE = 8.0  # degrees from upright allowed
 START_FUEL = 100.0
+PHYSICS_HZ = 240  # fixed physics rate; the constants above are per 60 Hz frame
 PAD_COUNT = 3
 TERRAIN_ROUGHNESS = 0.3
 
@@ -75,8 +77,9 @@ class Pad:
 # ---------------------------
 # Terrain generation
 # ---------------------------
-def generate_terrain(width, height, pad_count=3):
+def generate_terrain(width, height, pad_count=3, rng=random):
     # Simple midpoint displacement / 1D fractal terrain
+    # (rng can be a random.Random for a reproducible terrain)
     points = [(0, int(height * 0.75)), (width, int(height * 0.75))]
     disp = height * TERRAIN_ROUGHNESS
     iters = 9
@@ -86,7 +89,7 @@ def generate_terrain(width, height, pad_count=3):
             x1, y1 = points[i]
             x2, y2 = points[i + 1]
             mx = (x1 + x2) // 2
-            my = (y1 + y2) // 2 + random.randint(int(-disp), int(disp))
+            my = (y1 + y2) // 2 + rng.randint(int(-disp), int(disp))
             my = max(int(height * 0.45), min(int(height * 0.92), my))
             new_pts.append((mx, my))
             new_pts.append(points[i + 1])
@@ -97,16 +100,19 @@ def generate_terrain(width, height, pad_count=3):
     pads = []
     segments = []
     points.sort(key=lambda p: p[0])
-    for i in range(len(points) - 1):
-        segments.append((points[i], points[i + 1]))
+    # Candidate pad sites span several terrain points; single segments are
+    # only a pixel or two wide after the displacement passes
+    span = 80
+    for i in range(0, len(points) - span, span):
+        segments.append((points[i], points[i + span]))
 
     usable = [s for s in segments if s[1][0] - s[0][0] > 40]
-    random.shuffle(usable)
+    rng.shuffle(usable)
     chosen = usable[:pad_count]
 
     for (a, b) in chosen:
         pad_center = (a[0] + b[0]) // 2
-        width = random.randint(60, 120)
+        width = rng.randint(60, 120)
         x1 = max(0, pad_center - width // 2)
         x2 = min(WIDTH, pad_center + width // 2)
         y = (a[1] + b[1]) // 2
@@ -119,18 +125,153 @@ def generate_terrain(width, height, pad_count=3):
     points.sort(key=lambda p: p[0])
     return points, pads
 
+
+def generate_terrain_seeded(seed, width=WIDTH, height=HEIGHT, pad_count=PAD_COUNT):
+    """
+    The same midpoint displacement and pad flattening as generate_terrain,
+    done on NumPy arrays with a generator seeded by seed, so a seed always
+    gives the same terrain. The x coordinates never depend on the seed and
+    stay sorted, so no sorting is needed.
+    """
+    rng = np.random.default_rng(seed)
+    xs = np.array([0, width], dtype=np.int64)
+    ys = np.full(2, int(height * 0.75), dtype=np.int64)
+    disp = height * TERRAIN_ROUGHNESS
+    for _ in range(9):
+        mx = (xs[:-1] + xs[1:]) // 2
+        my = (ys[:-1] + ys[1:]) // 2 + rng.integers(int(-disp), int(disp), size=len(mx), endpoint=True)
+        my = np.clip(my, int(height * 0.45), int(height * 0.92))
+        new_xs = np.empty(len(xs) + len(mx), dtype=np.int64)
+        new_ys = np.empty_like(new_xs)
+        new_xs[0::2], new_xs[1::2] = xs, mx
+        new_ys[0::2], new_ys[1::2] = ys, my
+        xs, ys = new_xs, new_ys
+        disp *= 0.55
+
+    # Pad sites span 80 points, as in generate_terrain
+    span = 80
+    starts = np.arange(0, len(xs) - span, span)
+    usable = starts[xs[starts + span] - xs[starts] > 40]
+    chosen = usable[rng.permutation(len(usable))[:pad_count]]
+
+    pads = []
+    for a in chosen:
+        b = a + span
+        pad_center = (xs[a] + xs[b]) // 2
+        pad_width = int(rng.integers(60, 120, endpoint=True))
+        x1 = max(0, pad_center - pad_width // 2)
+        x2 = min(width, pad_center + pad_width // 2)
+        y = (ys[a] + ys[b]) // 2
+        ys[(xs >= x1) & (xs <= x2)] = y
+        pads.append(Pad(int(x1), int(y), int(x2 - x1)))
+
+    return list(zip(xs.tolist(), ys.tolist())), pads
+
+
+class Terrain:
+    """
+    Terrain points and pads, plus per-pixel-column lookup tables.
+
+    Terrain x coordinates are whole pixels, so everything between column c and
+    c + 1 lies on one segment. For each column the tables keep that segment and
+    the pad over it, which makes ground and pad queries O(1) instead of a scan.
+    The interpolation is the same arithmetic the old segment scan used.
+    """
+    def __init__(self, points, pads, width=WIDTH):
+        self.points = points
+        self.pads = pads
+        self.width = width
+        xs = np.array([p[0] for p in points], dtype=np.float64)
+        ys = np.array([p[1] for p in points], dtype=np.float64)
+        self.min_x, self.max_x = xs[0], xs[-1]
+
+        # Segment under each column: the first one whose right end reaches it
+        columns = np.arange(int(self.max_x) + 1)
+        seg = np.clip(np.searchsorted(xs, columns + 1, side="left") - 1, 0, len(xs) - 2)
+        self.seg_x1 = xs[seg]
+        self.seg_y1 = ys[seg]
+        self.seg_dx = xs[seg + 1] - xs[seg]
+        self.seg_dy = ys[seg + 1] - ys[seg]
+        # Ground height at every whole column
+        self.heights = self.ground_y_batch(columns.astype(np.float64))
+
+        # Pad index for x exactly on column c, and for x strictly between c and c + 1.
+        # Pads never overlap, but the first pad in the list wins if they did.
+        self.pad_on_column = np.full(len(columns), -1, dtype=np.int64)
+        self.pad_in_column = np.full(len(columns), -1, dtype=np.int64)
+        for i in reversed(range(len(pads))):
+            pad = pads[i]
+            self.pad_on_column[pad.x:pad.x + pad.w + 1] = i
+            self.pad_in_column[pad.x:pad.x + pad.w] = i
+
+        # Plain lists index faster than arrays for one-at-a-time queries
+        self.segments = list(zip(self.seg_x1.tolist(), self.seg_y1.tolist(),
+                                 self.seg_dx.tolist(), self.seg_dy.tolist()))
+        self.pad_on_list = self.pad_on_column.tolist()
+        self.pad_in_list = self.pad_in_column.tolist()
+
+    def ground_y(self, x):
+        """Ground height directly below x, or HEIGHT outside the terrain."""
+        if not (self.min_x <= x <= self.max_x):
+            return HEIGHT
+        # x on a segment's start point belongs to the segment ending there
+        column = math.ceil(x) - 1 if x > self.min_x else 0
+        x1, y1, dx, dy = self.segments[column]
+        t = (x - x1) / dx if dx != 0 else 0
+        return y1 + t * dy
+
+    def pad_at(self, x):
+        """The pad horizontally covering x, or None."""
+        if not (0 <= x <= self.max_x):
+            return None
+        column = int(x)
+        index = self.pad_on_list[column] if x == column else self.pad_in_list[column]
+        return self.pads[index] if index >= 0 else None
+
+    def ground_y_batch(self, x):
+        """ground_y for an array of x positions."""
+        x = np.asarray(x, dtype=np.float64)
+        column = np.where(x > self.min_x, np.ceil(x) - 1, 0)
+        column = np.clip(column, 0, len(self.seg_x1) - 1).astype(np.int64)
+        dx = self.seg_dx[column]
+        t = np.where(dx != 0, (x - self.seg_x1[column]) / np.where(dx != 0, dx, 1.0), 0.0)
+        ground = self.seg_y1[column] + t * self.seg_dy[column]
+        return np.where((x < self.min_x) | (x > self.max_x), HEIGHT, ground)
+
+    def pad_index_batch(self, x):
+        """Index into pads of the pad covering each x, or -1."""
+        x = np.asarray(x, dtype=np.float64)
+        inside = (x >= 0) & (x <= self.max_x)
+        column = np.clip(np.floor(x), 0, len(self.pad_on_column) - 1).astype(np.int64)
+        index = np.where(x == column, self.pad_on_column[column], self.pad_in_column[column])
+        return np.where(inside, index, -1)
+
 # ---------------------------
 # Physics & game logic
 # ---------------------------
-def reset_game():
+def reset_game(seed=None, library=None):
+    """
+    Starts a new round. With a seed the terrain is the seeded one, loaded from
+    the library (a TerrainLibrary) when it has that seed.
+    """
     lander = Lander(WIDTH * 0.2, HEIGHT * 0.15, 0.0, 0.0, 0.0, START_FUEL)
-    terrain, pads = generate_terrain(WIDTH, HEIGHT, PAD_COUNT)
+    if seed is None:
+        points, pads = generate_terrain(WIDTH, HEIGHT, PAD_COUNT)
+    elif library is not None and seed in library:
+        points, pads = library.load(seed)
+    else:
+        points, pads = generate_terrain_seeded(seed)
+    terrain = Terrain(points, pads)
     score = 0
     time_alive = 0
     return lander, terrain, pads, score, time_alive
 
 
-def update_lander(lander: Lander, keys):
+def update_lander(lander: Lander, keys, dt=1.0):
+    """
+    Advances the lander by dt frames (of 1/60 s). Every rate is scaled by dt;
+    with the default dt=1.0 this is exactly one frame of the original physics.
+    """
     if not (lander.alive and not lander.landed):
         return {"main": False, "rcs_left": False, "rcs_right": False}
 
@@ -140,13 +281,13 @@ def update_lander(lander: Lander, keys):
 
     # rotation (A/D or Left/Right)
     if (keys[pygame.K_LEFT] or keys[pygame.K_a]) and lander.fuel > 0:
-        lander.angle -= ROT_THRUST
+        lander.angle -= ROT_THRUST * dt
         rcs_left = True
-        lander.fuel = max(0.0, lander.fuel - FUEL_BURN_RCS)
+        lander.fuel = max(0.0, lander.fuel - FUEL_BURN_RCS * dt)
     if (keys[pygame.K_RIGHT] or keys[pygame.K_d]) and lander.fuel > 0:
-        lander.angle += ROT_THRUST
+        lander.angle += ROT_THRUST * dt
         rcs_right = True
-        lander.fuel = max(0.0, lander.fuel - FUEL_BURN_RCS)
+        lander.fuel = max(0.0, lander.fuel - FUEL_BURN_RCS * dt)
 
     # main engine (Up/W or Space)
     if (keys[pygame.K_UP] or keys[pygame.K_w] or keys[pygame.K_SPACE]) and lander.fuel > 0:
@@ -154,43 +295,32 @@ def update_lander(lander: Lander, keys):
         rad = math.radians(lander.angle)
         ax = -math.sin(rad) * THRUST
         ay = -math.cos(rad) * THRUST
-        lander.vx += ax
-        lander.vy += ay
+        lander.vx += ax * dt
+        lander.vy += ay * dt
         thrusting = True
-        lander.fuel = max(0.0, lander.fuel - FUEL_BURN_MAIN)
+        lander.fuel = max(0.0, lander.fuel - FUEL_BURN_MAIN * dt)
 
     # gravity
-    lander.vy += GRAVITY
+    lander.vy += GRAVITY * dt
 
     # integrate
-    lander.x = wrap(lander.x + lander.vx, WIDTH)
-    lander.y += lander.vy
+    lander.x = wrap(lander.x + lander.vx * dt, WIDTH)
+    lander.y += lander.vy * dt
 
     return {"main": thrusting, "rcs_left": rcs_left, "rcs_right": rcs_right}
 
 
-def check_collision(lander: Lander, terrain_points, pads):
-    # Find terrain y directly below lander.x by segment interpolation
-    # Get two surrounding points
+def check_collision(lander: Lander, terrain: Terrain):
+    # Terrain y directly below lander.x, from the per-column lookup table
     x = lander.x
-    # binary search would be faster but list is small
-    for i in range(len(terrain_points) - 1):
-        (x1, y1), (x2, y2) = terrain_points[i], terrain_points[i + 1]
-        if x1 <= x <= x2:
-            t = (x - x1) / (x2 - x1) if x2 != x1 else 0
-            ground_y = y1 + t * (y2 - y1)
-            break
-    else:
-        ground_y = HEIGHT
+    ground_y = terrain.ground_y(x)
 
     # contact?
     if lander.y + 14 >= ground_y:  # bottom of lander touches ground
         # determine if on a pad
-        on_pad = None
-        for pad in pads:
-            if pad.x <= x <= pad.x + pad.w and abs(lander.y + 14 - pad.y) < 4:
-                on_pad = pad
-                break
+        on_pad = terrain.pad_at(x)
+        if on_pad and abs(lander.y + 14 - on_pad.y) >= 4:
+            on_pad = None
 
         # landing criteria
         angle_ok = abs(((lander.angle + 180) % 360) - 180) <= MAX_LANDING_ANGLE
@@ -211,6 +341,84 @@ def check_collision(lander: Lander, terrain_points, pads):
     return None, None
 
 
+def sweep_contact(lander: Lander, terrain: Terrain, x0, y0, dx, dy):
+    """
+    Moves the lander back to the first point where its feet touched the
+    ground on the way from (x0, y0) to (x0 + dx, y0 + dy).
+
+    The path is sampled about once per pixel, so a fast lander can't skip
+    over a spike or the edge of a pad between two steps, and the contact
+    point is then refined by bisection. Returns True if there was contact.
+    """
+    def touching(t):
+        return y0 + t * dy + 14 >= terrain.ground_y(wrap(x0 + t * dx, WIDTH))
+
+    samples = max(1, math.ceil(max(abs(dx), abs(dy))))
+    before = 0.0
+    for k in range(1, samples + 1):
+        t = k / samples
+        if touching(t):
+            break
+        before = t
+    else:
+        return False
+
+    # touching(t) holds and touching(before) does not
+    for _ in range(8):
+        middle = (before + t) / 2
+        if touching(middle):
+            t = middle
+        else:
+            before = middle
+    lander.x = wrap(x0 + t * dx, WIDTH)
+    lander.y = y0 + t * dy
+    return True
+
+
+class PhysicsClock:
+    """
+    Fixed-timestep accumulator: turns the milliseconds between rendered
+    frames into a whole number of physics steps at hz, carrying the
+    remainder over to the next frame. A long stall is capped at max_steps so
+    the game can't fall ever further behind.
+    """
+    def __init__(self, hz=PHYSICS_HZ, max_steps=None):
+        self.hz = hz
+        self.step_ms = 1000 / hz
+        self.dt = FPS / hz  # step length in 60 Hz frames, for update_lander
+        self.max_steps = max_steps if max_steps is not None else hz // 4
+        self.accumulator = 0.0
+
+    def advance(self, ms):
+        """Adds ms of real time; returns how many physics steps to run."""
+        self.accumulator += ms
+        steps = int(self.accumulator // self.step_ms)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step_ms
+        return steps
+
+
+def step_physics(lander: Lander, terrain: Terrain, keys, steps, dt):
+    """
+    Runs steps physics steps of dt frames each, with swept contact.
+    Stops at the first landing or crash. Returns (outcome, pad, thrust).
+    """
+    thrust = {"main": False, "rcs_left": False, "rcs_right": False}
+    for _ in range(steps):
+        x0, y0 = lander.x, lander.y
+        step_thrust = update_lander(lander, keys, dt)
+        for name, on in step_thrust.items():
+            thrust[name] = thrust[name] or on
+        if sweep_contact(lander, terrain, x0, y0, lander.vx * dt, lander.vy * dt):
+            outcome, pad = check_collision(lander, terrain)
+            if outcome:
+                return outcome, pad, thrust
+    return None, None, thrust
+
+
 def compute_score(time_alive_frames, lander: Lander, pad: Pad | None):
     # Higher score for fuel left, gentle landing, smaller pad, and speed
     time_bonus = max(0, 2000 - time_alive_frames) // 2
@@ -226,25 +434,56 @@ def compute_score(time_alive_frames, lander: Lander, pad: Pad | None):
 def draw_terrain(screen, terrain_points):
     # Fill sky
     screen.fill(BLACK)
-    # Draw stars
-    for _ in range(40):
-        x = random.randint(0, WIDTH - 1)
-        y = random.randint(0, int(HEIGHT * 0.6))
-        screen.set_at((x, y), WHITE)
     # Draw terrain polygon
     poly = terrain_points[:] + [(WIDTH, HEIGHT), (0, HEIGHT)]
     pygame.draw.polygon(screen, DARK_GRAY, poly)
 
 
+def draw_stars(screen, rng):
+    for _ in range(40):
+        x = rng.randint(0, WIDTH - 1)
+        y = rng.randint(0, int(HEIGHT * 0.6))
+        screen.set_at((x, y), WHITE)
+
+
 def draw_pads(screen, pads):
     for p in pads:
         pygame.draw.rect(screen, BLUE, pygame.Rect(p.x, p.y - 3, p.w, 6), border_radius=3)
         # guidance lights
         for lx in range(p.x, p.x + p.w, 16):
             pygame.draw.circle(screen, YELLOW, (lx, p.y - 6), 2)
+        # target indicator
+        pygame.draw.rect(screen, GRAY, pygame.Rect(p.x, p.y - 2, p.w, 4), 1, border_radius=2)
+
+
+# Stars are cosmetic, so they get their own generator and leave the
+# gameplay random sequence alone
+star_random = random.Random()
+
+
+def render_background(terrain: Terrain):
+    """
+    Draws everything that stays still during a round (sky, stars, terrain and
+    pads) onto one surface. It is rendered once per terrain; each frame then
+    only copies parts of it back over what moved.
+    """
+    background = pygame.Surface((WIDTH, HEIGHT))
+    draw_terrain(background, terrain.points)
+    draw_stars(background, star_random)
+    draw_pads(background, terrain.pads)
+    if pygame.display.get_surface():
+        background = background.convert()
+    return background
+
+
+def restore_background(screen, background, rects):
+    """Copies the background back over the given screen rects."""
+    for rect in rects:
+        screen.blit(background, rect, rect)
 
 
 def draw_lander(screen, lander: Lander, thrust):
+    """Draws the lander and returns the screen rect it covers."""
     # body as triangle + legs
     cx, cy = int(lander.x), int(lander.y)
     rad = math.radians(lander.angle)
@@ -262,13 +501,14 @@ def draw_lander(screen, lander: Lander, thrust):
         ry = px * math.sin(rad) + py * math.cos(rad)
         rpts.append((cx + int(rx), cy + int(ry)))
 
-    pygame.draw.polygon(screen, WHITE, rpts, width=2)
+    drawn = pygame.draw.polygon(screen, WHITE, rpts, width=2)
 
     # Legs (fixed relative to body)
     for legx in (-8, 8):
         lx = legx * math.cos(rad) - 10 * math.sin(rad)
         ly = legx * math.sin(rad) + 10 * math.cos(rad)
-        pygame.draw.line(screen, WHITE, (cx + int(lx), cy + int(ly)), (cx + int(lx*1.6), cy + int(ly + 10)), 2)
+        leg = pygame.draw.line(screen, WHITE, (cx + int(lx), cy + int(ly)), (cx + int(lx*1.6), cy + int(ly + 10)), 2)
+        drawn.union_ip(leg)
 
     # Flame when thrusting
     if thrust["main"] and lander.fuel > 0:
@@ -277,30 +517,57 @@ def draw_lander(screen, lander: Lander, thrust):
         jitter = random.randint(10, 18)
         base = (cx + int(fx), cy + int(fy))
         tip = (cx + int(fx - math.sin(rad) * jitter), cy + int(fy + math.cos(rad) * jitter))
-        pygame.draw.line(screen, ORANGE, base, tip, 4)
+        drawn.union_ip(pygame.draw.line(screen, ORANGE, base, tip, 4))
+
+    # A little margin for thick line ends
+    return drawn.inflate(4, 4)
 
 
-def draw_hud(screen, font, small, lander: Lander, score, pads):
+def draw_hud(screen, small, lander: Lander, score):
+    """Draws the readouts and returns the screen rect they cover."""
     text = [
         f"Fuel: {lander.fuel:05.1f}",
         f"VX: {lander.vx:+.2f}  VY: {lander.vy:+.2f}",
         f"Angle: {(((lander.angle + 180) % 360) - 180):+.1f}°",
         f"Score: {score}",
     ]
+    drawn = pygame.Rect(10, 10, 0, 0)
     for i, t in enumerate(text):
         surf = small.render(t, True, WHITE)
-        screen.blit(surf, (10, 10 + i * 18))
-
-    # draw target indicators for pads
-    for pad in pads:
-        pygame.draw.rect(screen, GRAY, pygame.Rect(pad.x, pad.y - 2, pad.w, 4), 1, border_radius=2)
+        drawn.union_ip(screen.blit(surf, (10, 10 + i * 18)))
+    return drawn
 
 
 def message_center(screen, font, lines, color=WHITE, y=HEIGHT//2):
+    """Draws centred lines of text and returns the screen rect they cover."""
+    drawn = None
     for i, line in enumerate(lines):
         surf = font.render(line, True, color)
         rect = surf.get_rect(center=(WIDTH // 2, y + i * 40))
         screen.blit(surf, rect)
+        drawn = rect if drawn is None else drawn.union(rect)
+    return drawn
+
+
+def draw_frame(screen, font, small, state, lander: Lander, thrust, score, gained):
+    """
+    Draws the moving parts of a frame (lander, HUD and messages) over the
+    background and returns the list of rects that were drawn.
+    """
+    idle = {"main": False, "rcs_left": False, "rcs_right": False}
+    if state == GameState.MENU:
+        title = ["LUNAR LANDER", "Press ENTER/SPACE to start"]
+        return [message_center(screen, font, [title[0]], YELLOW, HEIGHT//2 - 40),
+                message_center(screen, small, [title[1], "Controls: ←/→ rotate, ↑ or SPACE for thrust",
+                                               f"Safe landing: |VX|≤{MAX_LANDING_SPEED}, VY≤{MAX_LANDING_SPEED}, |angle|≤{MAX_LANDING_ANGLE}°"], WHITE, HEIGHT//2 + 10)]
+    if state == GameState.PLAYING:
+        return [draw_lander(screen, lander, thrust), draw_hud(screen, small, lander, score)]
+    drawn = [draw_lander(screen, lander, idle), draw_hud(screen, small, lander, score)]
+    if state == GameState.CRASH:
+        drawn.append(message_center(screen, font, ["CRASH!", "Press R or ENTER to retry"], RED, HEIGHT//2 - 20))
+    elif state == GameState.LANDED:
+        drawn.append(message_center(screen, font, ["SUCCESS!", f"Score +{gained}", "Press R or ENTER for a new terrain"], GREEN, HEIGHT//2 - 20))
+    return drawn
 
 # ---------------------------
 # Main
@@ -313,35 +580,70 @@ def main():
     font = pygame.font.SysFont("consolas", 36)
     small = pygame.font.SysFont("consolas", 18)
 
-    lander, terrain, pads, score, time_alive = reset_game()
+    # --seed N plays the seeded terrains N, N+1, ...; --library FILE loads
+    # them from a terrain library (see terrain_library.py)
+    seed = int(sys.argv[sys.argv.index("--seed") + 1]) if "--seed" in sys.argv else None
+    library = None
+    if "--library" in sys.argv:
+        from terrain_library import TerrainLibrary
+        library = TerrainLibrary(sys.argv[sys.argv.index("--library") + 1])
+        if seed is None:
+            seed = int(random.choice(library.seeds))
+
+    lander, terrain, pads, score, time_alive = reset_game(seed, library)
+    background = render_background(terrain)
     state = GameState.MENU
     last_pad = None
+    gained = 0
+    thrust = {"main": False, "rcs_left": False, "rcs_right": False}
+    dirty = []  # rects drawn last frame, to be restored from the background
+    full_redraw = True
+
+    # --physics-hz N sets the physics rate (240 by default)
+    hz = int(sys.argv[sys.argv.index("--physics-hz") + 1]) if "--physics-hz" in sys.argv else PHYSICS_HZ
+    physics = PhysicsClock(hz)
+
+    # --autopilot starts with the autopilot flying; P toggles it
+    autopilot_on = "--autopilot" in sys.argv
+    autopilot = None
 
     running = True
     while running:
         dt = clock.tick(FPS)
+        steps = physics.advance(dt)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     running = False
+                if event.key == pygame.K_p:
+                    autopilot_on = not autopilot_on
                 if state in (GameState.CRASH, GameState.LANDED, GameState.MENU):
                     if event.key in (pygame.K_r, pygame.K_RETURN, pygame.K_SPACE):
-                        lander, terrain, pads, score, time_alive = reset_game()
+                        if seed is not None and state != GameState.MENU:
+                            seed += 1
+                        lander, terrain, pads, score, time_alive = reset_game(seed, library)
+                        background = render_background(terrain)
+                        autopilot = None
+                        full_redraw = True
                         state = GameState.PLAYING
 
         keys = pygame.key.get_pressed()
+        if autopilot_on and state == GameState.PLAYING:
+            if autopilot is None:
+                from autopilot import Autopilot
+                autopilot = Autopilot(terrain)
+            keys = autopilot.keys(lander)
 
         # Update
         if state == GameState.MENU:
             pass
         elif state == GameState.PLAYING:
-            thrust = update_lander(lander, keys)
-            outcome, pad = check_collision(lander, terrain, pads)
-            time_alive += 1
+            outcome, pad, thrust = step_physics(lander, terrain, keys, steps, physics.dt)
+            time_alive += steps * physics.dt  # in 60 Hz frames, as compute_score expects
             if outcome == 'landed':
-                gained = compute_score(time_alive, lander, pad)
+                gained = compute_score(int(time_alive), lander, pad)
                 score += gained
                 last_pad = pad
                 state = GameState.LANDED
@@ -353,29 +655,20 @@ def main():
         else:
             thrust = {"main": False, "rcs_left": False, "rcs_right": False}
 
-        # Draw
-        draw_terrain(screen, terrain)
-        draw_pads(screen, pads)
+        # Draw: copy the background over last frame's sprites, draw this
+        # frame's, and push only those areas to the display
+        if full_redraw:
+            screen.blit(background, (0, 0))
+        else:
+            restore_background(screen, background, dirty)
+        drawn = draw_frame(screen, font, small, state, lander, thrust, score, gained)
 
-        if state == GameState.MENU:
-            title = ["LUNAR LANDER", "Press ENTER/SPACE to start"]
-            message_center(screen, font, [title[0]], YELLOW, HEIGHT//2 - 40)
-            message_center(screen, small, [title[1], "Controls: ←/→ rotate, ↑ or SPACE for thrust",
-                                           f"Safe landing: |VX|≤{MAX_LANDING_SPEED}, VY≤{MAX_LANDING_SPEED}, |angle|≤{MAX_LANDING_ANGLE}°"], WHITE, HEIGHT//2 + 10)
-        elif state == GameState.PLAYING:
-            draw_lander(screen, lander, thrust)
-            draw_hud(screen, font, small, lander, score, pads)
-        elif state == GameState.CRASH:
-            draw_lander(screen, lander, {"main": False, "rcs_left": False, "rcs_right": False})
-            draw_hud(screen, font, small, lander, score, pads)
-            message_center(screen, font, ["CRASH!", "Press R or ENTER to retry"], RED, HEIGHT//2 - 20)
-        elif state == GameState.LANDED:
-            draw_lander(screen, lander, {"main": False, "rcs_left": False, "rcs_right": False})
-            draw_hud(screen, font, small, lander, score, pads)
-            gained = compute_score(time_alive, lander, last_pad)
-            message_center(screen, font, ["SUCCESS!", f"Score +{gained}", "Press R or ENTER for a new terrain"], GREEN, HEIGHT//2 - 20)
-
-        pygame.display.flip()
+        if full_redraw:
+            pygame.display.flip()
+            full_redraw = False
+        else:
+            pygame.display.update(dirty + drawn)
+        dirty = drawn
 
     pygame.quit()
     sys.exit()
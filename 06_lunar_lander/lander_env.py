@@ -0,0 +1,257 @@
+"""
+Reset/step environments around the lunar lander, for training landing policies.
+
+LanderEnv plays one lander with discrete actions instead of a keys array.
+VectorLanderEnv steps many of them at once, split across worker processes.
+Observations come straight from the simulation; nothing is drawn unless
+render_mode="rgb_array" is asked for. A step is one 60 Hz frame, run as
+physics_hz // 60 physics steps with swept contact, exactly as the game runs
+its physics, so a policy trained here meets the same dynamics in the game.
+"""
+import time
+import random
+import multiprocessing
+
+import numpy as np
+import pygame
+
+from lander import (
+    Lander, Terrain, GameState, WIDTH, HEIGHT, FPS, START_FUEL, PAD_COUNT, PHYSICS_HZ,
+    generate_terrain, step_physics, compute_score,
+    render_background, draw_frame,
+)
+
+# Actions are bit flags, so 0..7 covers every combination of controls
+MAIN = 1
+LEFT = 2
+RIGHT = 4
+ACTION_COUNT = 8
+
+# Observation layout
+OBSERVATION_FIELDS = ("x", "y", "vx", "vy", "angle", "fuel", "pad_dx", "altitude")
+
+MAX_STEPS = 2000  # the time bonus in compute_score is gone by then
+
+
+def action_keys(action):
+    """A stand-in for pygame.key.get_pressed() holding the action's controls."""
+    return {pygame.K_UP: bool(action & MAIN), pygame.K_w: False, pygame.K_SPACE: False,
+            pygame.K_LEFT: bool(action & LEFT), pygame.K_a: False,
+            pygame.K_RIGHT: bool(action & RIGHT), pygame.K_d: False}
+
+ACTION_KEYS = [action_keys(action) for action in range(ACTION_COUNT)]
+
+
+# --- Single Environment ---
+
+class LanderEnv:
+    """
+    One lander on one terrain, driven through reset() and step().
+
+    step() returns (observation, reward, terminated, truncated, info). The
+    reward is compute_score for a landing and 0 otherwise, so an episode's
+    return is the score the player would have got. info["outcome"] is
+    "landed", "crash" or None. With a TerrainLibrary, episodes draw their
+    terrains from it instead of generating them. physics_hz is the physics
+    rate (the game's by default) and must be a multiple of 60.
+    """
+    def __init__(self, seed=None, max_steps=MAX_STEPS, render_mode=None, library=None, physics_hz=PHYSICS_HZ):
+        if physics_hz % FPS:
+            raise ValueError(f"physics_hz must be a multiple of {FPS}, not {physics_hz}")
+        self.random = random.Random(seed)
+        self.substeps = physics_hz // FPS
+        self.dt = FPS / physics_hz  # substep length in 60 Hz frames, as PhysicsClock.dt
+        self.library = library
+        self.max_steps = max_steps
+        self.render_mode = render_mode
+        self.lander = None
+        self.terrain = None
+        self.time_alive = 0
+        self.thrust = {"main": False, "rcs_left": False, "rcs_right": False}
+        self.surface = None
+        self.background = None
+        self.fonts = None
+
+    def reset(self, seed=None):
+        """Starts a new episode on a new terrain; returns (observation, info)."""
+        if seed is not None:
+            self.random = random.Random(seed)
+        self.lander = Lander(WIDTH * 0.2, HEIGHT * 0.15, 0.0, 0.0, 0.0, START_FUEL)
+        if self.library is not None:
+            terrain_seed = int(self.library.seeds[self.random.randrange(len(self.library))])
+            self.terrain = self.library.terrain(terrain_seed)
+        else:
+            self.terrain = Terrain(*generate_terrain(WIDTH, HEIGHT, PAD_COUNT, self.random))
+        self.time_alive = 0
+        self.thrust = {"main": False, "rcs_left": False, "rcs_right": False}
+        self.background = None
+        return self.observe(), {}
+
+    def step(self, action):
+        lander = self.lander
+        outcome, pad, self.thrust = step_physics(lander, self.terrain, ACTION_KEYS[action], self.substeps, self.dt)
+        self.time_alive += 1
+
+        reward = 0.0
+        if outcome == "landed":
+            reward = float(compute_score(self.time_alive, lander, pad))
+        elif lander.y > HEIGHT + 60:
+            outcome = "crash"  # fell off the bottom of the screen
+        terminated = outcome is not None
+        truncated = not terminated and self.time_alive >= self.max_steps
+        return self.observe(), reward, terminated, truncated, {"outcome": outcome}
+
+    def observe(self):
+        """The observation for the current state, without drawing anything."""
+        lander = self.lander
+        pads = self.terrain.pads
+        pad_dx = 0.0
+        if pads:
+            pad_dx = min((pad.x + pad.w / 2 - lander.x for pad in pads), key=abs)
+        altitude = self.terrain.ground_y(lander.x) - (lander.y + 14)
+        return np.array([lander.x, lander.y, lander.vx, lander.vy, lander.angle, lander.fuel,
+                         pad_dx, altitude], dtype=np.float64)
+
+    def render(self):
+        """With render_mode="rgb_array", returns the frame as a (HEIGHT, WIDTH, 3) array."""
+        if self.render_mode != "rgb_array":
+            return None
+        if self.surface is None:
+            pygame.font.init()
+            self.surface = pygame.Surface((WIDTH, HEIGHT))
+            self.fonts = (pygame.font.SysFont("consolas", 36), pygame.font.SysFont("consolas", 18))
+        if self.background is None:
+            self.background = render_background(self.terrain)
+        self.surface.blit(self.background, (0, 0))
+        font, small = self.fonts
+        draw_frame(self.surface, font, small, GameState.PLAYING, self.lander, self.thrust, 0, 0)
+        return pygame.surfarray.array3d(self.surface).swapaxes(0, 1)
+
+
+# --- Vectorized Environments ---
+
+def step_envs(envs, actions):
+    """
+    Steps each env with its action, resetting the ones that finish.
+
+    Finished envs return the first observation of their next episode, like
+    Gym's autoreset; the last observation of the old one is in
+    info["final_observation"].
+    """
+    count = len(envs)
+    observations = np.empty((count, len(OBSERVATION_FIELDS)))
+    rewards = np.zeros(count)
+    terminated = np.zeros(count, dtype=bool)
+    truncated = np.zeros(count, dtype=bool)
+    infos = []
+    for i, env in enumerate(envs):
+        observation, rewards[i], terminated[i], truncated[i], info = env.step(int(actions[i]))
+        if terminated[i] or truncated[i]:
+            info["final_observation"] = observation
+            observation, _ = env.reset()
+        observations[i] = observation
+        infos.append(info)
+    return observations, rewards, terminated, truncated, infos
+
+
+def reset_envs(envs, seeds):
+    return np.array([env.reset(seed)[0] for env, seed in zip(envs, seeds)])
+
+
+def open_library(path):
+    if path is None:
+        return None
+    from terrain_library import TerrainLibrary
+    return TerrainLibrary(path)
+
+
+def worker(connection, count, max_steps, library_path):
+    """Runs in a worker process: owns count envs and serves commands for them."""
+    library = open_library(library_path)
+    envs = [LanderEnv(max_steps=max_steps, library=library) for _ in range(count)]
+    while True:
+        command, data = connection.recv()
+        if command == "step":
+            connection.send(step_envs(envs, data))
+        elif command == "reset":
+            connection.send(reset_envs(envs, data))
+        elif command == "close":
+            connection.close()
+            return
+
+
+class VectorLanderEnv:
+    """
+    num_envs LanderEnvs stepped together, with arrays in and out.
+
+    With workers > 0 the envs are split evenly over that many worker
+    processes, each stepping its share in parallel; with workers=0 they are
+    stepped in this process. Both give identical results for the same seed.
+    steps_per_second reports the env-steps rate seen so far, for sizing
+    training jobs. library_path names a terrain library for the envs to use;
+    each worker maps the file itself.
+    """
+    def __init__(self, num_envs, workers=None, max_steps=MAX_STEPS, library_path=None):
+        if workers is None:
+            workers = min(num_envs, multiprocessing.cpu_count())
+        self.num_envs = num_envs
+        self.workers = min(workers, num_envs)
+        self.env_steps = 0
+        self.step_time = 0.0
+
+        self.envs = []
+        self.connections = []
+        self.processes = []
+        self.slices = []
+        if self.workers == 0:
+            library = open_library(library_path)
+            self.envs = [LanderEnv(max_steps=max_steps, library=library) for _ in range(num_envs)]
+            return
+        bounds = np.linspace(0, num_envs, self.workers + 1).astype(int)
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=worker, args=(child, end - start, max_steps, library_path), daemon=True)
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+            self.slices.append(slice(start, end))
+
+    def reset(self, seed=None):
+        """Resets every env; env i gets seed + i. Returns (observations, infos)."""
+        seeds = [None if seed is None else seed + i for i in range(self.num_envs)]
+        if not self.connections:
+            return reset_envs(self.envs, seeds), [{} for _ in seeds]
+        for connection, part in zip(self.connections, self.slices):
+            connection.send(("reset", seeds[part]))
+        observations = np.concatenate([connection.recv() for connection in self.connections])
+        return observations, [{} for _ in seeds]
+
+    def step(self, actions):
+        """Steps every env; returns arrays of observations, rewards, terminated and truncated, plus infos."""
+        start = time.perf_counter()
+        actions = np.asarray(actions)
+        if not self.connections:
+            results = step_envs(self.envs, actions)
+        else:
+            for connection, part in zip(self.connections, self.slices):
+                connection.send(("step", actions[part]))
+            parts = [connection.recv() for connection in self.connections]
+            results = tuple(np.concatenate([part[i] for part in parts]) for i in range(4))
+            results += ([info for part in parts for info in part[4]],)
+        self.step_time += time.perf_counter() - start
+        self.env_steps += self.num_envs
+        return results
+
+    @property
+    def steps_per_second(self):
+        return self.env_steps / self.step_time if self.step_time else 0.0
+
+    def close(self):
+        for connection in self.connections:
+            connection.send(("close", None))
+            connection.close()
+        for process in self.processes:
+            process.join()
+        self.connections = []
+        self.processes = []
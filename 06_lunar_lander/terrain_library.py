@@ -0,0 +1,114 @@
+"""
+An on-disk library of pregenerated terrains, keyed by seed.
+
+Every record holds the seed, the terrain heights and the pads that
+generate_terrain_seeded makes for it. The x coordinates are the same for
+every seed, so they are not stored. The file is a .npy that is opened
+memory-mapped: opening it is instant, a terrain is read from disk only when
+it is loaded, and worker processes share the pages. Build one with:
+
+    python terrain_library.py [--count N] [--first-seed N] [--path FILE]
+"""
+import sys
+import time
+
+import numpy as np
+
+from lander import WIDTH, HEIGHT, PAD_COUNT, Pad, Terrain, generate_terrain, generate_terrain_seeded
+
+DEFAULT_PATH = "terrains.npy"
+POINT_COUNT = 2 ** 9 + 1  # points after the 9 midpoint displacement passes
+
+
+def record_dtype(pad_count=PAD_COUNT):
+    return np.dtype([
+        ("seed", np.int64),
+        ("ys", np.int16, POINT_COUNT),
+        ("pads", np.int16, (pad_count, 3)),  # x, y, w; unused slots have w = -1
+    ])
+
+
+def build_library(path, seeds, pad_count=PAD_COUNT):
+    """Generates the terrain for every seed and writes them to path."""
+    seeds = np.unique(np.asarray(seeds, dtype=np.int64))  # sorted, for lookups
+    records = np.lib.format.open_memmap(path, mode="w+", dtype=record_dtype(pad_count), shape=(len(seeds),))
+    for i, seed in enumerate(seeds.tolist()):
+        points, pads = generate_terrain_seeded(seed, WIDTH, HEIGHT, pad_count)
+        records["seed"][i] = seed
+        records["ys"][i] = [y for _, y in points]
+        records["pads"][i] = -1
+        for j, pad in enumerate(pads):
+            records["pads"][i, j] = (pad.x, pad.y, pad.w)
+    records.flush()
+    del records
+
+
+class TerrainLibrary:
+    """A memory-mapped terrain library, opened read-only."""
+    def __init__(self, path=DEFAULT_PATH):
+        self.records = np.load(path, mmap_mode="r")
+        self.seeds = self.records["seed"]
+        # Every terrain has the same x coordinates; take them from any seed
+        points, _ = generate_terrain_seeded(0, WIDTH, HEIGHT, 0)
+        self.xs = [x for x, _ in points]
+
+    def __len__(self):
+        return len(self.seeds)
+
+    def index(self, seed):
+        """The record index of seed, or -1 if the library does not have it."""
+        i = int(np.searchsorted(self.seeds, seed))
+        return i if i < len(self.seeds) and self.seeds[i] == seed else -1
+
+    def __contains__(self, seed):
+        return self.index(seed) >= 0
+
+    def load(self, seed):
+        """Returns (points, pads) for seed, the same as generate_terrain_seeded(seed)."""
+        i = self.index(seed)
+        if i < 0:
+            raise KeyError(seed)
+        record = self.records[i]
+        points = list(zip(self.xs, record["ys"].tolist()))
+        pads = [Pad(x, y, w) for x, y, w in record["pads"].tolist() if w >= 0]
+        return points, pads
+
+    def terrain(self, seed):
+        return Terrain(*self.load(seed))
+
+
+def main():
+    def option(name, default):
+        return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+    count = int(option("--count", 10000))
+    first_seed = int(option("--first-seed", 0))
+    path = option("--path", DEFAULT_PATH)
+
+    start = time.perf_counter()
+    build_library(path, range(first_seed, first_seed + count))
+    print(f"built {count} terrains into {path} in {time.perf_counter() - start:.2f} s")
+
+    library = TerrainLibrary(path)
+    seeds = range(first_seed, first_seed + min(count, 1000))
+    for seed in seeds:
+        if library.load(seed) != generate_terrain_seeded(seed):
+            print(f"MISMATCH for seed {seed}")
+            sys.exit(1)
+    print(f"{len(seeds)} loaded terrains match generate_terrain_seeded exactly")
+
+    timings = [
+        ("generate_terrain", lambda seed: generate_terrain(WIDTH, HEIGHT, PAD_COUNT)),
+        ("generate_terrain_seeded", generate_terrain_seeded),
+        ("TerrainLibrary.load", library.load),
+    ]
+    for label, make in timings:
+        start = time.perf_counter()
+        for seed in seeds:
+            make(seed)
+        elapsed = time.perf_counter() - start
+        print(f"{label:24s} {elapsed / len(seeds) * 1e6:8.1f} us per terrain")
+
+
+if __name__ == "__main__":
+    main()
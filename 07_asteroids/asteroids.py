@@ -1,6 +1,12 @@
 import pygame
 import random
 import math
+import sys
+
+from spatial_hash import SpatialHash
+from pool import ObjectPool
+from profiler import FrameProfiler
+from hud_text import TextCache
 
 # --- Constants ---
 SCREEN_WIDTH = 800
@@ -11,6 +17,15 @@ BLACK = (0, 0, 0)
 RED = (255, 0, 0)
 GREEN = (0, 255, 0)
 BLUE = (0, 0, 255)
+# Every phase the game times, in frame order (each becomes a --profile CSV column)
+PROFILED_PHASES = [
+    "tick", "input", "update", "ship.update", "bullet.update", "asteroid.update", "collisions",
+    "draw", "ship.draw", "bullet.draw", "asteroid.draw", "flip",
+]
+
+# Cosmetic randomness (asteroid outlines) uses its own generator, so drawing
+# never changes the gameplay random sequence
+outline_random = random.Random()
 
 # --- Utility Functions ---
 
@@ -18,6 +33,23 @@ def distance(pos1, pos2):
     """Calculates the distance between two pygame Vector2 positions."""
     return (pos1 - pos2).length()
 
+def get_game_surface():
+    """
+    Returns the surface game objects live on.
+
+    That is the display window when one is open; otherwise a shared off-screen
+    surface of the same size, so the game can be simulated headless.
+    """
+    global offscreen_surface
+    surface = pygame.display.get_surface()
+    if surface is not None:
+        return surface
+    if offscreen_surface is None:
+        offscreen_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    return offscreen_surface
+
+offscreen_surface = None
+
 def wrap_position(position, surface):
     """Wraps an object's position around the screen edges."""
     x, y = position
@@ -33,7 +65,7 @@ class GameObject:
         self.velocity = velocity
         self.radius = radius
         self.color = color
-        self.screen = pygame.display.get_surface()
+        self.screen = get_game_surface()
 
     def move(self, dt):
         """Updates the object's position based on its velocity and time delta (dt)."""
@@ -46,7 +78,9 @@ class GameObject:
 
     def collides_with(self, other_obj):
         """Checks for collision based on distance between centers and combined radii."""
-        return distance(self.position, other_obj.position) < self.radius + other_obj.radius
+        # Compare squared lengths so no square root is needed
+        limit = self.radius + other_obj.radius
+        return (self.position - other_obj.position).length_squared() < limit * limit
 
 # --- Ship Class ---
 
@@ -148,8 +182,8 @@ class Ship(GameObject):
             return True # Successfully destroyed
         return False # Invulnerable, not destroyed
 
-    def shoot(self):
-        """Creates a new bullet originating from the nose of the ship."""
+    def shoot(self, pool=None):
+        """Creates a new bullet (taken from pool if given) originating from the nose of the ship."""
         # Calculate bullet starting position and velocity
         angle_rad = math.radians(self.direction - 90)
         forward_vector = pygame.math.Vector2(math.cos(angle_rad), -math.sin(angle_rad))
@@ -161,6 +195,8 @@ class Ship(GameObject):
         bullet_speed = 500
         bullet_velocity = self.velocity + forward_vector * bullet_speed
 
+        if pool is not None:
+            return pool.acquire(start_pos, bullet_velocity)
         return Bullet(start_pos, bullet_velocity)
 
 # --- Bullet Class ---
@@ -180,6 +216,9 @@ class Bullet(GameObject):
         if not (0 <= x <= self.screen.get_width() and 0 <= y <= self.screen.get_height()):
             self.lifetime = 0 # Mark for removal if off-screen
 
+    def is_alive(self):
+        return self.lifetime > 0
+
 # --- Asteroid Class ---
 
 class Asteroid(GameObject):
@@ -195,6 +234,14 @@ class Asteroid(GameObject):
         2: (120, 120, 120),
         1: (90, 90, 90)
     }
+    OUTLINE_POINTS = 8
+    OUTLINE_VARIANTS = 4  # Rough shapes shared by large asteroids
+    ANGLE_STEP = 5  # Degrees between cached rotations
+
+    # (size_level, variant) -> outline points relative to the center
+    outlines = {}
+    # (size_level, variant, angle index) -> pre-rendered outline surface
+    sprites = {}
 
     def __init__(self, position, velocity, size_level):
         radius = self.SIZES.get(size_level, 15)
@@ -203,10 +250,47 @@ class Asteroid(GameObject):
         self.size_level = size_level
         self.rotation_speed = random.uniform(-60, 60) # degrees per second
         self.angle = random.uniform(0, 360)
+        # Only large asteroids get a rough outline; smaller ones are regular
+        self.variant = outline_random.randrange(self.OUTLINE_VARIANTS) if size_level == 3 else 0
+        self.outline = self.get_outline(size_level, self.variant)
+
+    @classmethod
+    def get_outline(cls, size_level, variant):
+        """Returns the outline points for a size and variant, generating them once."""
+        key = (size_level, variant)
+        if key not in cls.outlines:
+            radius = cls.SIZES.get(size_level, 15)
+            points = []
+            for i in range(cls.OUTLINE_POINTS):
+                angle = math.radians(i * (360 / cls.OUTLINE_POINTS))
+                # Vary the distance from the center slightly for a rough look
+                dist_factor = outline_random.uniform(0.8, 1.2) if size_level == 3 else 1.0
+                points.append(pygame.math.Vector2(math.cos(angle) * radius * dist_factor,
+                                                  math.sin(angle) * radius * dist_factor))
+            cls.outlines[key] = points
+        return cls.outlines[key]
+
+    @classmethod
+    def get_sprite(cls, size_level, variant, angle):
+        """Returns the outline rendered at the nearest cached angle."""
+        steps = 360 // cls.ANGLE_STEP
+        key = (size_level, variant, round(angle / cls.ANGLE_STEP) % steps)
+        sprite = cls.sprites.get(key)
+        if sprite is None:
+            outline = cls.get_outline(size_level, variant)
+            # Big enough for the roughest outline plus the line width
+            half = math.ceil(max(p.length() for p in outline)) + 2
+            sprite = pygame.Surface((half * 2, half * 2), pygame.SRCALPHA)
+            center = pygame.math.Vector2(half, half)
+            points = [point.rotate(key[2] * cls.ANGLE_STEP) + center for point in outline]
+            color = cls.COLORS.get(size_level, (90, 90, 90))
+            pygame.draw.polygon(sprite, color, [(int(p.x), int(p.y)) for p in points], 2)
+            cls.sprites[key] = sprite
+        return sprite
 
     @classmethod
-    def create_random(cls, screen_rect, size_level=3):
-        """Creates an asteroid spawning randomly off-screen and moving towards center."""
+    def create_random(cls, screen_rect, size_level=3, pool=None):
+        """Creates an asteroid (taken from pool if given) spawning randomly off-screen and moving towards center."""
         side = random.choice([0, 1, 2, 3]) # 0:top, 1:right, 2:bottom, 3:left
 
         if side == 0:  # Top
@@ -227,6 +311,8 @@ class Asteroid(GameObject):
         speed = base_speed + (4 - size_level) * 30
         velocity = direction.rotate(random.uniform(-45, 45)) * speed
 
+        if pool is not None:
+            return pool.acquire(start_pos, velocity, size_level)
         return cls(start_pos, velocity, size_level)
 
     def update(self, dt):
@@ -236,35 +322,32 @@ class Asteroid(GameObject):
         self.angle %= 360
 
     def draw(self):
-        """Draws the asteroid as a rough, angular shape."""
-        num_points = 8
-        base_points = []
-        for i in range(num_points):
-            angle = math.radians(i * (360 / num_points))
-            # Vary the distance from the center slightly for a rough look
-            dist_factor = random.uniform(0.8, 1.2) if self.size_level == 3 else 1.0
-            x = math.cos(angle) * self.radius * dist_factor
-            y = math.sin(angle) * self.radius * dist_factor
-            base_points.append(pygame.math.Vector2(x, y))
-
-        # Rotate and translate points for drawing
-        rotated_points = []
-        for point in base_points:
-            rotated_point = point.rotate(self.angle) + self.position
-            rotated_points.append((int(rotated_point.x), int(rotated_point.y)))
-
-        pygame.draw.polygon(self.screen, self.color, rotated_points, 2)
-
-    def break_apart(self):
-        """Returns a list of 2 smaller asteroids if size_level > 1, otherwise an empty list."""
-        new_asteroids = []
+        """Draws the asteroid by blitting its cached outline at the current angle."""
+        sprite = self.get_sprite(self.size_level, self.variant, self.angle)
+        self.screen.blit(sprite, sprite.get_rect(center=(int(self.position.x), int(self.position.y))))
+
+    def is_alive(self):
+        return self.size_level > 0
+
+    def break_apart(self, pool=None, new_asteroids=None):
+        """
+        Returns a list of 2 smaller asteroids if size_level > 1, otherwise an empty list.
+
+        Fragments are taken from pool if given, and appended to new_asteroids
+        if given instead of a new list.
+        """
+        if new_asteroids is None:
+            new_asteroids = []
         next_size = self.size_level - 1
 
         if next_size >= 1:
             for _ in range(2):
                 # New velocity is randomized from the parent's velocity
                 new_velocity = self.velocity.rotate(random.uniform(-45, 45)) * 1.5
-                new_asteroids.append(Asteroid(self.position.copy(), new_velocity, next_size))
+                if pool is not None:
+                    new_asteroids.append(pool.acquire(self.position.copy(), new_velocity, next_size))
+                else:
+                    new_asteroids.append(Asteroid(self.position.copy(), new_velocity, next_size))
 
         return new_asteroids
 
@@ -272,12 +355,32 @@ class Asteroid(GameObject):
 
 class AsteroidsGame:
     """Manages the main game loop, state, and objects."""
-    def __init__(self):
-        pygame.init()
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption(CAPTION)
+    def __init__(self, headless=False, profile_path=None):
+        self.headless = headless
+        if headless:
+            # No window: only what the simulation needs
+            pygame.font.init()
+            self.screen = get_game_surface()
+        else:
+            pygame.init()
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption(CAPTION)
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 36)
+        # Fonts and rendered HUD strings are cached; text only re-renders when it changes
+        self.text = TextCache()
+        self.font = self.text.font(36)
+        self.asteroid_grid = SpatialHash(SCREEN_WIDTH, SCREEN_HEIGHT)
+
+        # Bullets and asteroids are recycled so steady gameplay allocates nothing
+        self.bullet_pool = ObjectPool(Bullet, 64)
+        self.asteroid_pool = ObjectPool(Asteroid, 128)
+        self.bullets = []
+        self.asteroids = []
+        self.new_asteroids = []  # Scratch list for fragments made this frame
+
+        # Per-phase frame timings; switched on by run(), overlay toggled with F3
+        self.profiler = FrameProfiler(output_path=profile_path, phase_names=PROFILED_PHASES)
+        self.show_profiler = False
 
         self.game_over = False
         self.reset_game()
@@ -285,8 +388,12 @@ class AsteroidsGame:
     def reset_game(self):
         """Initializes or resets all game objects and state."""
         self.ship = Ship(pygame.math.Vector2(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2))
-        self.bullets = []
-        self.asteroids = []
+        for bullet in self.bullets:
+            self.bullet_pool.release(bullet)
+        self.bullets.clear()
+        for asteroid in self.asteroids:
+            self.asteroid_pool.release(asteroid)
+        self.asteroids.clear()
         self.score = 0
         self.level = 1
         self.game_over = False
@@ -297,7 +404,12 @@ class AsteroidsGame:
         """Spawns asteroids based on the current level."""
         num_asteroids = 4 + (self.level * 2)
         for _ in range(num_asteroids):
-            self.asteroids.append(Asteroid.create_random(self.screen.get_rect(), size_level=3))
+            self.asteroids.append(Asteroid.create_random(self.screen.get_rect(), size_level=3, pool=self.asteroid_pool))
+
+    def shoot(self):
+        """Fires a bullet from the ship if the game is still on."""
+        if self.ship.lives > 0 and not self.game_over:
+            self.bullets.append(self.ship.shoot(self.bullet_pool))
 
     def process_input(self):
         """Handles keyboard and game events."""
@@ -308,10 +420,11 @@ class AsteroidsGame:
             # Key Down Events
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
-                    if self.ship.lives > 0 and not self.game_over:
-                        self.bullets.append(self.ship.shoot())
+                    self.shoot()
                 elif event.key == pygame.K_r and self.game_over:
                     self.reset_game()
+                elif event.key == pygame.K_F3:
+                    self.show_profiler = not self.show_profiler
 
             # Set continuous movement flags
             self.ship.is_accelerating = pygame.key.get_pressed()[pygame.K_UP] or pygame.key.get_pressed()[pygame.K_w]
@@ -323,21 +436,27 @@ class AsteroidsGame:
         if self.game_over:
             return
 
+        profiler = self.profiler
+
         # 1. Update Ship
-        self.ship.update(dt)
+        with profiler.phase("ship.update"):
+            self.ship.update(dt)
 
         # 2. Update Bullets
-        for bullet in self.bullets:
-            bullet.update(dt)
-        # Remove expired bullets
-        self.bullets = [b for b in self.bullets if b.lifetime > 0]
+        with profiler.phase("bullet.update"):
+            for bullet in self.bullets:
+                bullet.update(dt)
+            # Remove expired bullets
+            self.bullet_pool.release_dead(self.bullets, Bullet.is_alive)
 
         # 3. Update Asteroids
-        for asteroid in self.asteroids:
-            asteroid.update(dt)
+        with profiler.phase("asteroid.update"):
+            for asteroid in self.asteroids:
+                asteroid.update(dt)
 
         # 4. Handle Collisions
-        self.handle_collisions()
+        with profiler.phase("collisions"):
+            self.handle_collisions()
 
         # 5. Check for Level Complete
         if not self.asteroids and self.ship.lives > 0:
@@ -349,32 +468,39 @@ class AsteroidsGame:
         """Handles Bullet-Asteroid and Ship-Asteroid collisions."""
 
         # Bullet-Asteroid Collisions
-        bullets_to_remove = set()
-        new_asteroids = []
+        new_asteroids = self.new_asteroids
+
+        # Broad-phase: bucket asteroids into a grid so each bullet only
+        # checks the asteroids in nearby cells
+        self.asteroid_grid.build(self.asteroids)
 
         for bullet in self.bullets:
-            for asteroid in self.asteroids:
-                if bullet.collides_with(asteroid):
-                    bullets_to_remove.add(bullet)
+            # Bullet can only hit one asteroid: the first one in list order
+            hit_index = self.asteroid_grid.first_collision(bullet)
+            if hit_index is None:
+                continue
+
+            asteroid = self.asteroids[hit_index]
+            bullet.lifetime = 0 # Mark for removal
 
-                    # Asteroid breaks apart
-                    new_asteroids.extend(asteroid.break_apart())
+            # Asteroid breaks apart
+            asteroid.break_apart(self.asteroid_pool, new_asteroids)
 
-                    # Update score
-                    if asteroid.size_level == 3: self.score += 20
-                    elif asteroid.size_level == 2: self.score += 50
-                    elif asteroid.size_level == 1: self.score += 100
+            # Update score
+            if asteroid.size_level == 3: self.score += 20
+            elif asteroid.size_level == 2: self.score += 50
+            elif asteroid.size_level == 1: self.score += 100
 
-                    # Mark asteroid for removal
-                    asteroid.size_level = 0 # Mark as destroyed
-                    break # Bullet can only hit one asteroid
+            # Mark asteroid for removal
+            asteroid.size_level = 0 # Mark as destroyed
 
         # Remove hit bullets
-        self.bullets = [b for b in self.bullets if b not in bullets_to_remove]
+        self.bullet_pool.release_dead(self.bullets, Bullet.is_alive)
 
         # Remove destroyed asteroids and add new smaller ones
-        self.asteroids = [a for a in self.asteroids if a.size_level > 0]
+        self.asteroid_pool.release_dead(self.asteroids, Asteroid.is_alive)
         self.asteroids.extend(new_asteroids)
+        new_asteroids.clear()
 
         # Ship-Asteroid Collisions
         if self.ship.respawn_timer <= 0:
@@ -387,25 +513,29 @@ class AsteroidsGame:
                     asteroid.size_level = 0
                     break
             # Re-clean up asteroids after ship collision
-            self.asteroids = [a for a in self.asteroids if a.size_level > 0]
+            self.asteroid_pool.release_dead(self.asteroids, Asteroid.is_alive)
 
 
     def draw(self):
         """Renders all game objects and HUD."""
+        profiler = self.profiler
         self.screen.fill(BLACK)
 
         # Draw objects
-        self.ship.draw()
-        for bullet in self.bullets:
-            bullet.draw()
-        for asteroid in self.asteroids:
-            asteroid.draw()
+        with profiler.phase("ship.draw"):
+            self.ship.draw()
+        with profiler.phase("bullet.draw"):
+            for bullet in self.bullets:
+                bullet.draw()
+        with profiler.phase("asteroid.draw"):
+            for asteroid in self.asteroids:
+                asteroid.draw()
 
         # Draw HUD (Score, Lives, Level)
-        score_text = self.font.render(f"SCORE: {self.score}", True, WHITE)
+        score_text = self.text.render(f"SCORE: {self.score}", 36, WHITE)
         self.screen.blit(score_text, (10, 10))
 
-        level_text = self.font.render(f"LEVEL: {self.level}", True, WHITE)
+        level_text = self.text.render(f"LEVEL: {self.level}", 36, WHITE)
         self.screen.blit(level_text, (SCREEN_WIDTH - level_text.get_width() - 10, 10))
 
         # Draw Lives (simple icons)
@@ -429,32 +559,50 @@ class AsteroidsGame:
         if self.score == 0 and self.level == 1 and not self.ship.is_accelerating and not self.bullets and not self.game_over:
             self.draw_message("ASTEROIDS", "W/Up: Thrust | A/D/Left/Right: Rotate | Space: Shoot", GREEN, y_offset=-50)
 
-        pygame.display.flip()
+        if self.show_profiler:
+            profiler.draw_overlay(self.screen)
+
+        with profiler.phase("flip"):
+            pygame.display.flip()
 
     def draw_message(self, title, subtitle, color, y_offset=0):
         """Helper to draw large centered messages."""
-        title_font = pygame.font.Font(None, 72)
-        title_surf = title_font.render(title, True, color)
+        title_surf = self.text.render(title, 72, color)
         title_rect = title_surf.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + y_offset))
         self.screen.blit(title_surf, title_rect)
 
-        subtitle_surf = self.font.render(subtitle, True, color)
+        subtitle_surf = self.text.render(subtitle, 36, color)
         subtitle_rect = subtitle_surf.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 50 + y_offset))
         self.screen.blit(subtitle_surf, subtitle_rect)
 
     def run(self):
         """The main game loop."""
         self.running = True
+        profiler = self.profiler
+        profiler.enabled = True
         while self.running:
+            profiler.begin_frame()
+
             # Calculate time delta (dt) for framerate independence
-            dt = self.clock.tick(60) / 1000.0  # dt is now in seconds
+            with profiler.phase("tick"):
+                dt = self.clock.tick(60) / 1000.0  # dt is now in seconds
+
+            with profiler.phase("input"):
+                self.process_input()
+            with profiler.phase("update"):
+                self.update(dt)
+            with profiler.phase("draw"):
+                self.draw()
 
-            self.process_input()
-            self.update(dt)
-            self.draw()
+            profiler.end_frame()
 
+        profiler.close()
         pygame.quit()
 
 if __name__ == '__main__':
-    game = AsteroidsGame()
+    # python asteroids.py --profile timings.csv (or .jsonl) streams per-frame timings
+    profile_path = None
+    if "--profile" in sys.argv:
+        profile_path = sys.argv[sys.argv.index("--profile") + 1]
+    game = AsteroidsGame(profile_path=profile_path)
     game.run()
\ No newline at end of file
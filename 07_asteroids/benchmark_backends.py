@@ -0,0 +1,147 @@
+"""
+Compares the object simulation (AsteroidsGame) with the NumPy array backend.
+
+First both backends play the same scripted game from the same seed, and the
+script checks that score, level, lives and every entity position agree. Then
+each backend is timed with 10,000 entities on screen. Run it with:
+
+    python benchmark_backends.py [--frames N]
+"""
+import os
+import sys
+import time
+import random
+import statistics
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from asteroids import AsteroidsGame, Asteroid, Bullet, SCREEN_WIDTH, SCREEN_HEIGHT
+from entity_store import ArraySimulation
+
+NUM_ASTEROIDS = 8000
+NUM_BULLETS = 2000
+DT = 1 / 60
+
+
+def scripted_inputs(frame):
+    """Rotate left in bursts, thrust now and then, and fire every 6 frames."""
+    return {
+        "rotate_left": (frame // 90) % 2 == 0,
+        "thrust": (frame // 200) % 3 == 0,
+        "shoot": frame % 6 == 0,
+    }
+
+
+def apply_inputs(ship, inputs):
+    ship.is_rotating_left = inputs["rotate_left"]
+    ship.is_accelerating = inputs["thrust"]
+
+
+def snapshot(score, level, lives, asteroid_positions, bullet_positions):
+    return score, level, lives, np.asarray(asteroid_positions), np.asarray(bullet_positions)
+
+
+def play_objects(seed, frames):
+    random.seed(seed)
+    game = AsteroidsGame()
+    for frame in range(frames):
+        inputs = scripted_inputs(frame)
+        apply_inputs(game.ship, inputs)
+        if inputs["shoot"] and game.ship.lives > 0 and not game.game_over:
+            game.bullets.append(game.ship.shoot())
+        game.update(DT)
+    return snapshot(game.score, game.level, game.ship.lives,
+                    [tuple(a.position) for a in game.asteroids],
+                    [tuple(b.position) for b in game.bullets])
+
+
+def play_arrays(seed, frames):
+    random.seed(seed)
+    sim = ArraySimulation()
+    for frame in range(frames):
+        inputs = scripted_inputs(frame)
+        apply_inputs(sim.ship, inputs)
+        if inputs["shoot"]:
+            sim.shoot()
+        sim.update(DT)
+    return snapshot(sim.score, sim.level, sim.ship.lives,
+                    sim.asteroids.position, sim.bullets.position)
+
+
+def check_equivalence(seeds=(1, 2, 3), frames=1800):
+    for seed in seeds:
+        expected = play_objects(seed, frames)
+        actual = play_arrays(seed, frames)
+        same = (expected[:3] == actual[:3]
+                and expected[3].shape == actual[3].shape and np.array_equal(expected[3], actual[3])
+                and expected[4].shape == actual[4].shape and np.array_equal(expected[4], actual[4]))
+        print(f"seed {seed}: score {expected[0]} vs {actual[0]}, "
+              f"asteroids {len(expected[3])} vs {len(actual[3])} -> {'match' if same else 'MISMATCH'}")
+        if not same:
+            sys.exit(1)
+
+
+def populate(seed):
+    """Builds NUM_ASTEROIDS asteroids and NUM_BULLETS bullets as objects."""
+    random.seed(seed)
+    asteroids = []
+    for _ in range(NUM_ASTEROIDS):
+        position = pygame.math.Vector2(random.uniform(0, SCREEN_WIDTH), random.uniform(0, SCREEN_HEIGHT))
+        velocity = pygame.math.Vector2(random.uniform(50, 140), 0).rotate(random.uniform(0, 360))
+        asteroids.append(Asteroid(position, velocity, random.choice([1, 2, 3])))
+    bullets = []
+    for _ in range(NUM_BULLETS):
+        position = pygame.math.Vector2(random.uniform(0, SCREEN_WIDTH), random.uniform(0, SCREEN_HEIGHT))
+        velocity = pygame.math.Vector2(500, 0).rotate(random.uniform(0, 360))
+        bullets.append(Bullet(position, velocity))
+    return asteroids, bullets
+
+
+def time_frames(backend, frames):
+    """Times backend.update for a number of frames, refilling entities each frame."""
+    asteroids, bullets = populate(99)
+    backend.ship.respawn_timer = float("inf")
+    if isinstance(backend, ArraySimulation):
+        asteroid_template = type(backend.asteroids)()
+        asteroid_template.add(*asteroids)
+        bullet_template = type(backend.bullets)()
+        bullet_template.add(*bullets)
+
+    samples = []
+    for _ in range(frames):
+        # Reload the same starting entities so every frame does the same work
+        if isinstance(backend, ArraySimulation):
+            backend.asteroids = type(backend.asteroids)()
+            backend.asteroids.extend(asteroid_template)
+            backend.bullets = type(backend.bullets)()
+            backend.bullets.extend(bullet_template)
+        else:
+            backend.asteroids = [Asteroid(a.position.copy(), a.velocity.copy(), a.size_level) for a in asteroids]
+            backend.bullets = [Bullet(b.position.copy(), b.velocity.copy()) for b in bullets]
+        start = time.perf_counter()
+        backend.update(DT)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    frames = 30
+    if "--frames" in sys.argv:
+        frames = int(sys.argv[sys.argv.index("--frames") + 1])
+
+    check_equivalence()
+
+    print(f"\n{NUM_ASTEROIDS + NUM_BULLETS} entities, {frames} frames each")
+    for name, backend in (("objects", AsteroidsGame()), ("arrays", ArraySimulation())):
+        samples = time_frames(backend, frames)
+        print(f"{name:8s} mean {statistics.mean(samples):7.2f} ms | "
+              f"median {statistics.median(samples):7.2f} ms | max {max(samples):7.2f} ms")
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
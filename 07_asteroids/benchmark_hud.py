@@ -0,0 +1,70 @@
+"""
+Frame time of AsteroidsGame.draw on the title and game-over screens, with and
+without the HUD text cache.
+
+The uncached run reproduces the old behaviour: HUD strings are rendered every
+frame, and the 72pt title font is loaded from disk on every draw_message call.
+Run it with:
+
+    python benchmark_hud.py [--frames N]
+"""
+import os
+import sys
+import time
+import random
+import statistics
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from asteroids import AsteroidsGame
+from hud_text import TextCache
+
+
+class UncachedText(TextCache):
+    """Renders on every call, and loads every font except the HUD font per call."""
+    def render(self, text, size, color, name=None):
+        if size == 36 and name is None:
+            font = self.font(size, name)
+        else:
+            font = pygame.font.Font(name, size)
+        return font.render(text, True, color)
+
+
+def time_draw(game, frames):
+    samples = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        game.draw()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    frames = 300
+    if "--frames" in sys.argv:
+        frames = int(sys.argv[sys.argv.index("--frames") + 1])
+
+    random.seed(5)
+    game = AsteroidsGame()
+    print(f"{frames} frames per run (draw() only)")
+    for screen_name in ("title", "game over"):
+        game.reset_game()
+        game.game_over = screen_name == "game over"
+        results = {}
+        for label, text in (("uncached", UncachedText()), ("cached", TextCache())):
+            game.text = text
+            samples = time_draw(game, frames)
+            results[label] = statistics.mean(samples)
+            print(f"  {screen_name:9s} {label:8s} mean {results[label]:6.3f} ms | "
+                  f"p95 {sorted(samples)[int(len(samples) * 0.95)]:6.3f} ms")
+        saved = results["uncached"] - results["cached"]
+        print(f"  {screen_name:9s} saved {saved:.3f} ms per frame "
+              f"({saved / results['uncached'] * 100:.0f}%)")
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Checks that steady-state Asteroids gameplay makes no net allocations.
+
+Runs a scripted firefight headless: the ship is invulnerable, spins and fires
+constantly, and the level is pinned so every wave is the same size. After a
+warm-up, tracemalloc measures what the game holds after a short window of
+frames and after a window twice as long, both from the same start, and the
+pools report whether they ever had to create a new object.
+
+The game still creates short-lived floats and vectors every frame, but they
+are freed the same frame. What can remain at a snapshot is bounded: lists
+such as spatial hash buckets and pool free lists reaching a new high-water
+mark, and which values happen to be alive at that moment. A leak grows with
+the number of frames, so the check fails if the long window holds more than
+SLACK_BYTES over the short one (a leak of even a byte every few frames
+shows up as thousands of bytes), or if a pool created an object. Run it with:
+
+    python check_allocations.py [--frames N]
+"""
+import os
+import sys
+import random
+import tracemalloc
+
+import pygame
+
+from asteroids import AsteroidsGame
+
+DT = 1 / 60
+WARM_UP_FRAMES = 1800
+# Files whose allocations count against the game
+GAME_FILES = ("asteroids.py", "pool.py", "spatial_hash.py")
+SLACK_BYTES = 2048 # Allowed difference between the two windows, from what is alive at each snapshot
+
+
+def firefight_frame(game, frame):
+    """One frame of the scripted firefight."""
+    game.ship.respawn_timer = float("inf")  # Never dies, never ends the game
+    game.ship.is_rotating_left = True
+    if frame % 4 == 0:
+        game.shoot()
+    game.update(DT)
+    game.level = 1  # Keep every new wave the same size
+
+
+def prime(pool, *args):
+    """
+    Initializes every blank object in a pool once.
+
+    Pools start with blank objects, and the first use of one fills in its
+    attributes. That is a one-off cost, not a per-frame one, so it is paid
+    before measuring. The random state is restored so the game is unchanged.
+    """
+    state = random.getstate()
+    objects = [pool.acquire(*args) for _ in range(len(pool.free))]
+    for obj in objects:
+        pool.release(obj)
+    random.setstate(state)
+
+
+def game_allocations(snapshot):
+    """Filters a snapshot down to allocations made by the game's own files."""
+    return snapshot.filter_traces([
+        tracemalloc.Filter(True, "*" + os.sep + name) for name in GAME_FILES
+    ])
+
+
+def main():
+    frames = 6000
+    if "--frames" in sys.argv:
+        frames = int(sys.argv[sys.argv.index("--frames") + 1])
+
+    # Trace from the start, so values replaced during the window are seen being freed
+    tracemalloc.start()
+    random.seed(7)
+    game = AsteroidsGame(headless=True)
+    for frame in range(WARM_UP_FRAMES):
+        firefight_frame(game, frame)
+
+    origin = pygame.math.Vector2(0, 0)
+    prime(game.bullet_pool, origin, origin)
+    prime(game.asteroid_pool, origin, origin, 1)
+
+    bullets_created = game.bullet_pool.created
+    asteroids_created = game.asteroid_pool.created
+
+    before = game_allocations(tracemalloc.take_snapshot())
+    for frame in range(WARM_UP_FRAMES, WARM_UP_FRAMES + frames):
+        firefight_frame(game, frame)
+    short = game_allocations(tracemalloc.take_snapshot())
+    for frame in range(WARM_UP_FRAMES + frames, WARM_UP_FRAMES + 2 * frames):
+        firefight_frame(game, frame)
+    long = game_allocations(tracemalloc.take_snapshot())
+    tracemalloc.stop()
+
+    short_bytes = sum(stat.size_diff for stat in short.compare_to(before, "lineno"))
+    long_stats = long.compare_to(before, "lineno")
+    long_bytes = sum(stat.size_diff for stat in long_stats)
+    growth = [stat for stat in long_stats if stat.size_diff > 0]
+    new_objects = (game.bullet_pool.created - bullets_created) + (game.asteroid_pool.created - asteroids_created)
+
+    print(f"{2 * frames} frames, score {game.score}, {len(game.asteroids)} asteroids, {len(game.bullets)} bullets")
+    print(f"pool objects created after warm-up: {new_objects}")
+    print(f"net allocated by game code: {short_bytes:+d} bytes after {frames} frames, "
+          f"{long_bytes:+d} bytes after {2 * frames} frames")
+    for stat in growth[:10]:
+        print(f"  {stat}")
+
+    extra = long_bytes - short_bytes
+    if new_objects or extra > SLACK_BYTES:
+        print(f"FAIL: steady-state gameplay is still allocating ({extra:+d} bytes over the second {frames} frames)")
+        sys.exit(1)
+    print(f"OK: no growth with frame count ({extra:+d} bytes over the second {frames} frames, "
+          f"within {SLACK_BYTES}; the rest is bounded high-water marks)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+"""
+Structure-of-arrays simulation backend for Asteroids.
+
+Instead of one Python object per asteroid and bullet, every attribute lives in
+its own contiguous NumPy array and move, wrap, rotation and lifetime expiry run
+as batch operations. The game rules (and the order of every random call) match
+AsteroidsGame, so the same seed and the same inputs give the same outcome.
+"""
+import math
+import random
+
+import numpy as np
+import pygame
+
+from asteroids import Ship, Asteroid, SCREEN_WIDTH, SCREEN_HEIGHT
+
+# Score awarded per asteroid size, same as AsteroidsGame.handle_collisions
+SCORES = {3: 20, 2: 50, 1: 100}
+
+# --- Array Storage ---
+
+class EntityArrays:
+    """One contiguous array per attribute; row i of every array is entity i."""
+    # Field name -> (trailing shape, dtype)
+    FIELDS = {}
+
+    def __init__(self):
+        for name, (shape, dtype) in self.FIELDS.items():
+            setattr(self, name, np.empty((0,) + shape, dtype=dtype))
+
+    def __len__(self):
+        return len(self.position)
+
+    def append(self, **columns):
+        """Appends a batch of rows; every field must be given."""
+        for name, (shape, dtype) in self.FIELDS.items():
+            rows = np.asarray(columns[name], dtype=dtype).reshape((-1,) + shape)
+            setattr(self, name, np.concatenate([getattr(self, name), rows]))
+
+    def add(self, *objects):
+        """Copies the matching attributes of Asteroid or Bullet objects into the arrays."""
+        columns = {}
+        for name in self.FIELDS:
+            values = [getattr(obj, name) for obj in objects]
+            columns[name] = [tuple(v) if isinstance(v, pygame.math.Vector2) else v for v in values]
+        self.append(**columns)
+
+    def extend(self, other):
+        """Appends every row of another store of the same type."""
+        self.append(**{name: getattr(other, name) for name in self.FIELDS})
+
+    def keep(self, mask):
+        """Drops every row where mask is False."""
+        for name in self.FIELDS:
+            setattr(self, name, getattr(self, name)[mask])
+
+
+class AsteroidArrays(EntityArrays):
+    FIELDS = {
+        "position": ((2,), np.float64),
+        "velocity": ((2,), np.float64),
+        "radius": ((), np.float64),
+        "size_level": ((), np.int64),
+        "angle": ((), np.float64),
+        "rotation_speed": ((), np.float64),
+    }
+
+
+class BulletArrays(EntityArrays):
+    FIELDS = {
+        "position": ((2,), np.float64),
+        "velocity": ((2,), np.float64),
+        "radius": ((), np.float64),
+        "lifetime": ((), np.float64),
+    }
+
+# --- Batch Operations ---
+
+def move_and_wrap(store, dt, size):
+    """Moves every entity by its velocity and wraps it around the screen."""
+    store.position += store.velocity * dt
+    np.mod(store.position, size, out=store.position)
+
+
+def first_hits(bullets, asteroids, size, cell_size=50):
+    """
+    Returns, for every bullet, the lowest index of an asteroid it overlaps (-1 for none).
+
+    This is the vectorized version of SpatialHash.first_collision: asteroids are
+    sorted by wrapped grid cell, and each bullet only tests the cells around it.
+    """
+    num_bullets = len(bullets)
+    hits = np.full(num_bullets, -1, dtype=np.int64)
+    if num_bullets == 0 or len(asteroids) == 0:
+        return hits
+
+    cols = max(1, math.ceil(size[0] / cell_size))
+    rows = max(1, math.ceil(size[1] / cell_size))
+
+    # Bucket asteroids by cell; a stable sort keeps indices ascending per cell
+    a_cell = np.floor(asteroids.position / cell_size).astype(np.int64)
+    a_key = (a_cell[:, 0] % cols) + (a_cell[:, 1] % rows) * cols
+    order = np.argsort(a_key, kind="stable")
+    sorted_keys = a_key[order]
+
+    # Cells each bullet has to look at
+    reach = math.ceil((bullets.radius.max() + asteroids.radius.max()) / cell_size)
+    offsets = np.arange(-reach, reach + 1)
+    dc, dr = np.meshgrid(offsets, offsets)
+    b_cell = np.floor(bullets.position / cell_size).astype(np.int64)
+    neighbours = ((b_cell[:, :1] + dc.ravel()) % cols) + ((b_cell[:, 1:] + dr.ravel()) % rows) * cols
+
+    # Expand every (bullet, cell) into the asteroids stored in that cell
+    starts = np.searchsorted(sorted_keys, neighbours, side="left").ravel()
+    counts = np.searchsorted(sorted_keys, neighbours, side="right").ravel() - starts
+    total = counts.sum()
+    if total == 0:
+        return hits
+    pair_bullet = np.repeat(np.repeat(np.arange(num_bullets), neighbours.shape[1]), counts)
+    run_offset = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    pair_sorted = np.repeat(starts, counts) + run_offset
+
+    # Squared-distance narrow phase on 1D columns (cheaper to gather than rows)
+    sorted_x = asteroids.position[order, 0]
+    sorted_y = asteroids.position[order, 1]
+    sorted_radius = asteroids.radius[order]
+    dx = sorted_x[pair_sorted] - bullets.position[:, 0][pair_bullet]
+    dy = sorted_y[pair_sorted] - bullets.position[:, 1][pair_bullet]
+    limit = bullets.radius[pair_bullet] + sorted_radius[pair_sorted]
+    touching = dx * dx + dy * dy < limit * limit
+
+    first = np.full(num_bullets, len(asteroids), dtype=np.int64)
+    np.minimum.at(first, pair_bullet[touching], order[pair_sorted[touching]])
+    hit_mask = first < len(asteroids)
+    hits[hit_mask] = first[hit_mask]
+    return hits
+
+# --- Simulation ---
+
+class ArraySimulation:
+    """Runs the AsteroidsGame rules on AsteroidArrays and BulletArrays."""
+    def __init__(self, screen_rect=None):
+        self.screen_rect = screen_rect or pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.size = np.array(self.screen_rect.size, dtype=np.float64)
+        self.game_over = False
+        self.reset_game()
+
+    def reset_game(self):
+        """Initializes or resets all game state."""
+        self.ship = Ship(pygame.math.Vector2(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2))
+        self.bullets = BulletArrays()
+        self.asteroids = AsteroidArrays()
+        self.score = 0
+        self.level = 1
+        self.game_over = False
+
+        self.spawn_initial_asteroids()
+
+    def spawn_initial_asteroids(self):
+        """Spawns asteroids based on the current level."""
+        num_asteroids = 4 + (self.level * 2)
+        for _ in range(num_asteroids):
+            self.asteroids.add(Asteroid.create_random(self.screen_rect, size_level=3))
+
+    def shoot(self):
+        """Fires a bullet from the ship, like pressing Space."""
+        if self.ship.lives > 0 and not self.game_over:
+            self.bullets.add(self.ship.shoot())
+
+    def update(self, dt):
+        """Advances the simulation by dt seconds."""
+        if self.game_over:
+            return
+
+        self.ship.update(dt)
+
+        # Bullets: move, age, and expire (including any that leave the screen)
+        bullets = self.bullets
+        move_and_wrap(bullets, dt, self.size)
+        bullets.lifetime -= dt
+        on_screen = ((bullets.position >= 0) & (bullets.position <= self.size)).all(axis=1)
+        bullets.lifetime[~on_screen] = 0
+        bullets.keep(bullets.lifetime > 0)
+
+        # Asteroids: move and spin
+        asteroids = self.asteroids
+        move_and_wrap(asteroids, dt, self.size)
+        asteroids.angle += asteroids.rotation_speed * dt
+        np.mod(asteroids.angle, 360, out=asteroids.angle)
+
+        self.handle_collisions()
+
+        if len(self.asteroids) == 0 and self.ship.lives > 0:
+            self.level += 1
+            self.spawn_initial_asteroids()
+            self.ship.reset()
+
+    def handle_collisions(self):
+        """Handles Bullet-Asteroid and Ship-Asteroid collisions."""
+        asteroids = self.asteroids
+        hits = first_hits(self.bullets, asteroids, self.size)
+
+        # Every bullet that touched an asteroid is used up, even if that
+        # asteroid was already destroyed earlier in the same pass
+        self.bullets.keep(hits < 0)
+
+        # Only the first bullet to hit an asteroid breaks it apart; process
+        # them in bullet order so random calls match the object path
+        destroyed = np.zeros(len(asteroids), dtype=bool)
+        fragments = {name: [] for name in AsteroidArrays.FIELDS}
+        for index in hits[hits >= 0].tolist():
+            if destroyed[index]:
+                continue
+            destroyed[index] = True
+            size_level = int(asteroids.size_level[index])
+            self.score += SCORES.get(size_level, 0)
+            next_size = size_level - 1
+            if next_size >= 1:
+                parent_velocity = pygame.math.Vector2(*asteroids.velocity[index])
+                for _ in range(2):
+                    new_velocity = parent_velocity.rotate(random.uniform(-45, 45)) * 1.5
+                    fragments["position"].append(asteroids.position[index])
+                    fragments["velocity"].append(tuple(new_velocity))
+                    fragments["radius"].append(Asteroid.SIZES[next_size])
+                    fragments["size_level"].append(next_size)
+                    # Same order as Asteroid.__init__: rotation speed, then angle
+                    fragments["rotation_speed"].append(random.uniform(-60, 60))
+                    fragments["angle"].append(random.uniform(0, 360))
+
+        asteroids.keep(~destroyed)
+        asteroids.append(**fragments)
+
+        # Ship-Asteroid collisions: first asteroid in order that touches the ship
+        if self.ship.respawn_timer <= 0 and len(asteroids):
+            delta = asteroids.position - np.array(tuple(self.ship.position))
+            limit = asteroids.radius + self.ship.radius
+            touching = delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1] < limit * limit
+            if touching.any():
+                self.ship.destroy()
+                if self.ship.lives <= 0:
+                    self.game_over = True
+                keep = np.ones(len(asteroids), dtype=bool)
+                keep[int(np.argmax(touching))] = False
+                asteroids.keep(keep)
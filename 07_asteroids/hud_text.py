@@ -0,0 +1,44 @@
+from collections import OrderedDict
+
+import pygame
+
+# --- HUD Text Cache ---
+
+class TextCache:
+    """
+    Keeps loaded fonts and rendered text surfaces for the HUD.
+
+    Fonts are loaded once per (name, size). Rendered strings are kept in a
+    least-recently-used cache, so text that does not change between frames
+    (a score, a title) is only rendered the first time it is drawn.
+    """
+    def __init__(self, max_surfaces=128):
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.max_surfaces = max_surfaces
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size, name=None):
+        """Returns the font for a size, loading it the first time."""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = pygame.font.Font(name, size)
+        return font
+
+    def render(self, text, size, color, name=None):
+        """Returns a surface with the text, rendering it only on a cache miss."""
+        key = (text, size, color, name)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.font(size, name).render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)  # Evict the least recently used
+        return surface
@@ -0,0 +1,41 @@
+# --- Object Pool ---
+
+class ObjectPool:
+    """
+    Preallocated, free-list-backed pool of game objects.
+
+    acquire() takes an object off the free list and re-initializes it in place
+    by calling __init__ again with the given arguments, so a pooled object starts
+    in exactly the same state (and makes the same random calls) as a new one.
+    release() puts it back. The pool only allocates when the free list runs dry.
+    """
+    def __init__(self, cls, capacity):
+        self.cls = cls
+        # Blank objects; they are initialized when first acquired
+        self.free = [cls.__new__(cls) for _ in range(capacity)]
+        self.created = capacity
+
+    def acquire(self, *args):
+        """Returns an initialized object, reusing a free one when possible."""
+        if self.free:
+            obj = self.free.pop()
+        else:
+            obj = self.cls.__new__(self.cls)
+            self.created += 1
+        obj.__init__(*args)
+        return obj
+
+    def release(self, obj):
+        """Returns an object to the free list."""
+        self.free.append(obj)
+
+    def release_dead(self, objects, is_alive):
+        """Removes dead objects from a list in place and releases them."""
+        keep = 0
+        for obj in objects:
+            if is_alive(obj):
+                objects[keep] = obj
+                keep += 1
+            else:
+                self.free.append(obj)
+        del objects[keep:]
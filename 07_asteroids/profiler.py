@@ -0,0 +1,152 @@
+import csv
+import json
+import time
+from collections import deque
+
+import pygame
+
+# --- Frame Profiler ---
+
+class Phase:
+    """Reusable context manager that times one named phase of a frame."""
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler.enter(self.name)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.exit()
+        return False
+
+
+class NullPhase:
+    """Does nothing; used while the profiler is switched off."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+NULL_PHASE = NullPhase()
+
+
+class FrameProfiler:
+    """
+    Times the phases of each frame and keeps rolling percentiles.
+
+    Phases nest (collisions run inside update, for example). Every phase
+    records its exclusive time, so the phases of a frame add up to the frame.
+    Finished frames go into a rolling window for the on-screen overlay, and
+    can also be streamed to a CSV or JSONL file for offline analysis.
+
+    A CSV has one column per name in phase_names, declared up front because
+    not every phase runs every frame (the title and game-over screens skip
+    the update phases). A phase missing from phase_names raises ValueError
+    when its frame is written, rather than being silently dropped.
+    """
+    def __init__(self, enabled=False, window=300, output_path=None, phase_names=()):
+        self.enabled = enabled
+        self.window = window
+        self.history = {}  # phase name -> deque of milliseconds
+        self.phases = {}  # phase name -> Phase
+        self.stack = []  # [name, start, child time] for open phases
+        self.current = {}  # phase name -> milliseconds this frame
+        self.frame_start = 0.0
+        self.overlay_lines = []
+        self.frames = 0
+        self.font = None
+        self.phase_names = list(phase_names)
+
+        self.output = None
+        self.writer = None
+        if output_path:
+            self.output = open(output_path, "w", newline="")
+
+    def phase(self, name):
+        """Returns a context manager timing the named phase."""
+        if not self.enabled:
+            return NULL_PHASE
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = Phase(self, name)
+        return phase
+
+    def enter(self, name):
+        self.stack.append([name, time.perf_counter(), 0.0])
+
+    def exit(self):
+        name, start, child_time = self.stack.pop()
+        elapsed = time.perf_counter() - start
+        self.current[name] = self.current.get(name, 0.0) + (elapsed - child_time) * 1000
+        if self.stack:
+            self.stack[-1][2] += elapsed
+
+    def begin_frame(self):
+        if self.enabled:
+            self.current.clear()
+            self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """Stores this frame's timings and writes them out if streaming."""
+        if not self.enabled:
+            return
+        self.current["total"] = (time.perf_counter() - self.frame_start) * 1000
+        for name, ms in self.current.items():
+            samples = self.history.get(name)
+            if samples is None:
+                samples = self.history[name] = deque(maxlen=self.window)
+            samples.append(ms)
+        self.frames += 1
+        if self.output:
+            self.write_frame()
+        # Percentiles are refreshed a few times a second, not every frame
+        if self.frames % 30 == 1:
+            self.overlay_lines = self.summary_lines()
+
+    def write_frame(self):
+        row = {"frame": self.frames}
+        row.update((name, round(ms, 4)) for name, ms in self.current.items())
+        if self.output.name.endswith(".jsonl"):
+            self.output.write(json.dumps(row) + "\n")
+            return
+        if self.writer is None:
+            # Phases that did not run this frame are left blank
+            fieldnames = ["frame", *self.phase_names, "total"]
+            self.writer = csv.DictWriter(self.output, fieldnames=fieldnames, restval="")
+            self.writer.writeheader()
+        self.writer.writerow(row)
+
+    def percentiles(self, name):
+        """Returns (p50, p95, p99) in milliseconds for a phase."""
+        ordered = sorted(self.history[name])
+        last = len(ordered) - 1
+        return tuple(ordered[min(last, int(len(ordered) * pct / 100))] for pct in (50, 95, 99))
+
+    def summary_lines(self):
+        lines = [f"{'phase':18s} {'p50':>6s} {'p95':>6s} {'p99':>6s} ms"]
+        for name in sorted(self.history, key=lambda n: (n == "total", n)):
+            p50, p95, p99 = self.percentiles(name)
+            lines.append(f"{name:18s} {p50:6.2f} {p95:6.2f} {p99:6.2f}")
+        return lines
+
+    def draw_overlay(self, surface):
+        """Draws the rolling percentiles in the top-right corner."""
+        if self.font is None:
+            self.font = pygame.font.SysFont("monospace", 14)
+        line_height = self.font.get_linesize()
+        width = max((self.font.size(line)[0] for line in self.overlay_lines), default=0)
+        x = surface.get_width() - width - 10
+        y = 50
+        backdrop = pygame.Surface((width + 10, line_height * len(self.overlay_lines) + 10), pygame.SRCALPHA)
+        backdrop.fill((0, 0, 0, 180))
+        surface.blit(backdrop, (x - 5, y - 5))
+        for i, line in enumerate(self.overlay_lines):
+            surface.blit(self.font.render(line, True, (0, 255, 0)), (x, y + i * line_height))
+
+    def close(self):
+        if self.output:
+            self.output.close()
+            self.output = None
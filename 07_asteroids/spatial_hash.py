@@ -0,0 +1,84 @@
+import math
+
+# --- Spatial Hash ---
+
+class SpatialHash:
+    """
+    Uniform grid used as a broad-phase for collision checks.
+
+    The grid is rebuilt every frame from a list of objects. Each object is
+    stored by its index in that list, in the cell that holds its center.
+    Cell coordinates wrap around the screen edges, so objects that sit just
+    off-screen (or on the opposite edge) still land in a valid cell.
+
+    Bucket lists are kept between frames and only grow, with a separate count
+    of how many entries are in use, so rebuilding the grid allocates nothing
+    once it has warmed up.
+    """
+    def __init__(self, width, height, cell_size=50):
+        self.cell_size = cell_size
+        self.cols = max(1, math.ceil(width / cell_size))
+        self.rows = max(1, math.ceil(height / cell_size))
+        self.buckets = {(col, row): [] for col in range(self.cols) for row in range(self.rows)}
+        self.counts = dict.fromkeys(self.buckets, 0)
+        self.objects = []
+        self.max_radius = 0
+
+    def cell_of(self, x, y):
+        """Returns the wrapped (col, row) of the cell containing a point."""
+        return int(x // self.cell_size) % self.cols, int(y // self.cell_size) % self.rows
+
+    def build(self, objects):
+        """Clears the grid and inserts every object by its list index."""
+        counts = self.counts
+        for key in counts:
+            counts[key] = 0
+        self.objects = objects
+        self.max_radius = 0
+        for index, obj in enumerate(objects):
+            key = self.cell_of(obj.position.x, obj.position.y)
+            bucket = self.buckets[key]
+            used = counts[key]
+            if used < len(bucket):
+                bucket[used] = index
+            else:
+                bucket.append(index)
+            counts[key] = used + 1
+            if obj.radius > self.max_radius:
+                self.max_radius = obj.radius
+
+    def nearby_cells(self, x, y, radius):
+        """Returns the wrapped cells that may hold objects touching the given circle."""
+        col, row = self.cell_of(x, y)
+        reach = math.ceil((radius + self.max_radius) / self.cell_size)
+        cells = set()
+        for dr in range(-reach, reach + 1):
+            for dc in range(-reach, reach + 1):
+                cells.add(((col + dc) % self.cols, (row + dr) % self.rows))
+        return cells
+
+    def first_collision(self, obj):
+        """
+        Returns the lowest index of a stored object that overlaps obj, or None.
+
+        Returning the lowest index keeps the result identical to looping over
+        the object list in order and stopping at the first hit.
+        """
+        x, y = obj.position.x, obj.position.y
+        radius = obj.radius
+        best = None
+        for key in self.nearby_cells(x, y, radius):
+            # Buckets are filled in list order, so indices only grow
+            bucket = self.buckets[key]
+            for i in range(self.counts[key]):
+                index = bucket[i]
+                if best is not None and index > best:
+                    break
+                other = self.objects[index]
+                dx = other.position.x - x
+                dy = other.position.y - y
+                limit = radius + other.radius
+                # Squared distance avoids a square root per pair
+                if dx * dx + dy * dy < limit * limit:
+                    best = index
+        return best
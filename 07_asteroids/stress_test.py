@@ -0,0 +1,141 @@
+"""
+Stress mode for the Asteroids collision broad-phase.
+
+Starts every frame with exactly 5,000 asteroids and 1,000 bullets on screen
+and reports how long each frame's update and collision pass takes, after a
+short untimed warm-up. Run it with:
+
+    python stress_test.py [--frames N] [--compare]
+
+--compare also runs the old all-pairs check on a few frames and verifies that
+it picks exactly the same hits as the spatial hash.
+"""
+import os
+import sys
+import time
+import random
+import statistics
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from asteroids import AsteroidsGame, SCREEN_WIDTH, SCREEN_HEIGHT
+
+NUM_ASTEROIDS = 5000
+NUM_BULLETS = 1000
+WARMUP_FRAMES = 60 # Untimed frames first: splits shift the mix toward small asteroids, then it levels off
+
+
+def random_asteroid(pool):
+    """Creates an asteroid anywhere on screen with a random size and heading."""
+    position = pygame.math.Vector2(random.uniform(0, SCREEN_WIDTH), random.uniform(0, SCREEN_HEIGHT))
+    velocity = pygame.math.Vector2(random.uniform(50, 140), 0).rotate(random.uniform(0, 360))
+    return pool.acquire(position, velocity, random.choice([1, 2, 3]))
+
+
+def random_bullet(pool):
+    """Creates a bullet anywhere on screen flying in a random direction."""
+    position = pygame.math.Vector2(random.uniform(0, SCREEN_WIDTH), random.uniform(0, SCREEN_HEIGHT))
+    velocity = pygame.math.Vector2(500, 0).rotate(random.uniform(0, 360))
+    return pool.acquire(position, velocity)
+
+
+def top_up(game):
+    """
+    Brings the asteroid and bullet lists back to exactly NUM_ASTEROIDS and
+    NUM_BULLETS, so every frame starts with the same load. Fragments from
+    splits are trimmed off the end and released to their pool.
+    """
+    for objects, pool, count in ((game.asteroids, game.asteroid_pool, NUM_ASTEROIDS),
+                                 (game.bullets, game.bullet_pool, NUM_BULLETS)):
+        for obj in objects[count:]:
+            pool.release(obj)
+        del objects[count:]
+    while len(game.asteroids) < NUM_ASTEROIDS:
+        game.asteroids.append(random_asteroid(game.asteroid_pool))
+    while len(game.bullets) < NUM_BULLETS:
+        game.bullets.append(random_bullet(game.bullet_pool))
+
+
+def brute_force_hits(bullets, asteroids):
+    """The original all-pairs check: first asteroid in list order per bullet."""
+    hits = []
+    for bullet in bullets:
+        hit = None
+        for index, asteroid in enumerate(asteroids):
+            if bullet.collides_with(asteroid):
+                hit = index
+                break
+        hits.append(hit)
+    return hits
+
+
+def grid_hits(game):
+    """The same hits found through the game's spatial hash."""
+    game.asteroid_grid.build(game.asteroids)
+    return [game.asteroid_grid.first_collision(bullet) for bullet in game.bullets]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    frames = 300
+    if "--frames" in sys.argv:
+        frames = int(sys.argv[sys.argv.index("--frames") + 1])
+    compare = "--compare" in sys.argv
+
+    random.seed(1234)
+    game = AsteroidsGame()
+    game.asteroids.clear()
+    game.bullets.clear()
+    # Keep the ship out of the way so the game never ends mid-run
+    game.ship.respawn_timer = float("inf")
+    dt = 1 / 60
+
+    if compare:
+        top_up(game)
+        for _ in range(3):
+            start = time.perf_counter()
+            expected = brute_force_hits(game.bullets, game.asteroids)
+            brute_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            actual = grid_hits(game)
+            grid_ms = (time.perf_counter() - start) * 1000
+            status = "match" if expected == actual else "MISMATCH"
+            print(f"all-pairs {brute_ms:8.1f} ms | spatial hash {grid_ms:6.1f} ms | hits {status}")
+            if expected != actual:
+                sys.exit(1)
+            game.update(dt)
+            top_up(game)
+
+    for _ in range(WARMUP_FRAMES):
+        top_up(game)
+        game.update(dt)
+
+    frame_times = []
+    for _ in range(frames):
+        top_up(game)
+        assert len(game.asteroids) == NUM_ASTEROIDS and len(game.bullets) == NUM_BULLETS
+        start = time.perf_counter()
+        game.update(dt)
+        frame_times.append((time.perf_counter() - start) * 1000)
+
+    print(f"{frames} frames after {WARMUP_FRAMES} warm-up frames, each starting with exactly {NUM_ASTEROIDS} asteroids and {NUM_BULLETS} bullets")
+    print(f"mean {statistics.mean(frame_times):.2f} ms | p50 {percentile(frame_times, 50):.2f} ms | "
+          f"p95 {percentile(frame_times, 95):.2f} ms | max {max(frame_times):.2f} ms")
+
+    # Split the run into quarters so a drift in frame time is easy to spot
+    quarter = max(1, frames // 4)
+    for i in range(0, frames, quarter):
+        chunk = frame_times[i:i + quarter]
+        print(f"  frames {i:4d}-{i + len(chunk) - 1:4d}: mean {statistics.mean(chunk):.2f} ms")
+
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+"""
+A computer opponent: negamax with alpha-beta pruning on bitboards.
+
+Moves are tried best-known first (the transposition table's move, then the
+centre columns outward), and the search deepens one ply at a time. Every
+node's result goes into a fixed-size transposition table keyed by the
+position's Zobrist key, where deeper results replace shallower ones and
+anything from an earlier move is always replaced.
+
+Searching runs in time slices: think(budget) searches until the budget is
+spent and returns, so the game can call it once per frame. An unfinished
+depth is thrown away, but what it stored in the table stays and makes the
+next slice's retry of that depth quick.
+"""
+import time
+
+from bitboard import (
+    COLUMN_COUNT, ROW_COUNT, COLUMN_BITS, FULL_BOARD, ZOBRIST, has_four,
+)
+
+WIN = 1_000_000 # Score for a win on the next move; a win n moves later scores WIN - n
+WIN_THRESHOLD = WIN - COLUMN_COUNT * ROW_COUNT
+TABLE_BITS = 18 # 2^18 transposition table entries
+CHECK_EVERY = 63 # Look at the clock every 64 nodes (under 1 ms)
+
+# Centre columns first: they take part in the most lines
+COLUMN_ORDER = sorted(range(COLUMN_COUNT), key=lambda col: abs(col - COLUMN_COUNT // 2))
+COLUMN_MASK = [((1 << ROW_COUNT) - 1) << (col * COLUMN_BITS) for col in range(COLUMN_COUNT)]
+COLUMN_BOTTOM = [1 << (col * COLUMN_BITS) for col in range(COLUMN_COUNT)]
+CENTRE_MASK = COLUMN_MASK[COLUMN_COUNT // 2]
+DIRECTIONS_SIDEWAYS = (COLUMN_BITS, COLUMN_BITS - 1, COLUMN_BITS + 1)
+
+# Keys of positions with player 2 to move get this mixed in (piece 0 has no
+# cells of its own, so its numbers are free)
+SIDE_KEY = ZOBRIST[0][0]
+
+# Transposition table entry bounds
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class TimeUp(Exception):
+    pass
+
+
+def winning_cells(bits, occupied):
+    """The empty cells where one more piece of bits would make four in a row."""
+    found = (bits << 1) & (bits << 2) & (bits << 3) # vertical: only on top
+    for shift in DIRECTIONS_SIDEWAYS:
+        pairs = (bits << shift) & (bits << 2 * shift)
+        found |= pairs & (bits << 3 * shift)
+        found |= pairs & (bits >> shift)
+        pairs = (bits >> shift) & (bits >> 2 * shift)
+        found |= pairs & (bits << shift)
+        found |= pairs & (bits >> 3 * shift)
+    return found & FULL_BOARD & ~occupied
+
+
+def evaluate(mine, theirs, occupied):
+    """A guess at how good the position is for the side to move, well inside +-WIN_THRESHOLD."""
+    return (4 * (winning_cells(mine, occupied).bit_count() - winning_cells(theirs, occupied).bit_count())
+            + (mine & CENTRE_MASK).bit_count() - (theirs & CENTRE_MASK).bit_count())
+
+
+def table_score(score, ply):
+    """Win scores count moves from the root; the table keeps them counted from the node."""
+    return score + ply if score > WIN_THRESHOLD else score - ply if score < -WIN_THRESHOLD else score
+
+
+def search_score(score, ply):
+    return score - ply if score > WIN_THRESHOLD else score + ply if score < -WIN_THRESHOLD else score
+
+
+class Search:
+    """
+    Finds a move for piece (1 or 2) in a BitBoard position.
+
+    Call think(budget) until done is True or you have waited long enough;
+    best_move is the best column found by the deepest finished depth (None
+    before depth 1 finishes), score its value for piece and depth how deep
+    that was. The table can be handed on to the next Search to keep what
+    was learnt. With an opening_book.OpeningBook, positions in the book are
+    done at once (from_book is then True).
+    """
+    def __init__(self, board, piece, table=None, max_depth=None, book=None):
+        self.mine = board.pieces[piece]
+        self.theirs = board.pieces[3 - piece]
+        self.piece = piece
+        self.key = board.key
+        self.empty = COLUMN_COUNT * ROW_COUNT - (self.mine | self.theirs).bit_count()
+        self.max_depth = min(max_depth or self.empty, self.empty)
+        self.table = table if table is not None else [None] * (1 << TABLE_BITS)
+        self.generation = object() # Marks this search's table entries
+        self.best_move = None
+        self.score = 0
+        self.depth = 0
+        self.nodes = 0
+        self.time = 0.0
+        self.done = self.empty == 0
+        self.deadline = 0.0
+        # A position in the opening book is answered without searching
+        self.from_book = False
+        if book is not None and not self.done:
+            entry = book.lookup(self.mine, self.theirs)
+            if entry is not None:
+                self.best_move, self.depth, self.score = entry
+                self.done = self.from_book = True
+
+    def think(self, budget):
+        """Searches for up to budget seconds. Returns True once the search is done."""
+        start = time.perf_counter()
+        self.deadline = start + budget
+        try:
+            while not self.done:
+                score, move = self.search_root(self.depth + 1)
+                self.depth += 1
+                self.score, self.best_move = score, move
+                # A proven win or loss won't change with more depth
+                self.done = self.depth >= self.max_depth or abs(score) > WIN_THRESHOLD
+        except TimeUp:
+            pass
+        self.time += time.perf_counter() - start
+        return self.done
+
+    def search_root(self, depth):
+        mine, theirs = self.mine, self.theirs
+        occupied = mine | theirs
+        order = COLUMN_ORDER
+        if self.best_move is not None:
+            order = [self.best_move] + [col for col in COLUMN_ORDER if col != self.best_move]
+        best_score, best_move = -WIN - 1, None
+        alpha = -WIN - 1
+        for col in order:
+            move = (occupied + COLUMN_BOTTOM[col]) & COLUMN_MASK[col]
+            if not move:
+                continue
+            if has_four(mine | move):
+                return WIN, col
+            score = -self.negamax(theirs, mine | move, 3 - self.piece,
+                                  self.key ^ ZOBRIST[self.piece][move.bit_length() - 1],
+                                  depth - 1, -WIN - 1, -alpha, 1)
+            if score > best_score:
+                best_score, best_move = score, col
+                alpha = max(alpha, score)
+        return best_score, best_move
+
+    def negamax(self, mine, theirs, piece, key, depth, alpha, beta, ply):
+        """The value of the position for the side to move (piece, with bitboard mine)."""
+        self.nodes += 1
+        if not self.nodes & CHECK_EVERY and time.perf_counter() > self.deadline:
+            raise TimeUp
+
+        occupied = mine | theirs
+        moves = []
+        for col in COLUMN_ORDER:
+            move = (occupied + COLUMN_BOTTOM[col]) & COLUMN_MASK[col]
+            if move:
+                if has_four(mine | move):
+                    return WIN - ply
+                moves.append((col, move))
+        if not moves:
+            return 0 # Board full: a draw
+        if depth == 0:
+            return evaluate(mine, theirs, occupied)
+
+        # Transposition table
+        alpha_start = alpha
+        lookup = key ^ SIDE_KEY if piece == 2 else key
+        index = lookup & ((1 << TABLE_BITS) - 1)
+        entry = self.table[index]
+        table_move = None
+        if entry is not None and entry[0] == lookup:
+            _, entry_depth, bound, entry_score, table_move, _ = entry
+            if entry_depth >= depth:
+                entry_score = search_score(entry_score, ply)
+                if bound == EXACT:
+                    return entry_score
+                if bound == LOWER and entry_score > alpha:
+                    alpha = entry_score
+                elif bound == UPPER and entry_score < beta:
+                    beta = entry_score
+                if alpha >= beta:
+                    return entry_score
+            if table_move is not None:
+                moves.sort(key=lambda item: item[0] != table_move)
+
+        best_score, best_move = -WIN - 1, None
+        for col, move in moves:
+            score = -self.negamax(theirs, mine | move, 3 - piece, key ^ ZOBRIST[piece][move.bit_length() - 1],
+                                  depth - 1, -beta, -alpha, ply + 1)
+            if score > best_score:
+                best_score, best_move = score, col
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        # Keep deeper results; anything left from an earlier search can go
+        if entry is None or entry[5] is not self.generation or depth >= entry[1]:
+            bound = UPPER if best_score <= alpha_start else LOWER if best_score >= beta else EXACT
+            self.table[index] = (lookup, depth, bound, table_score(best_score, ply), best_move, self.generation)
+        return best_score
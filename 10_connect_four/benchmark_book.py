@@ -0,0 +1,97 @@
+"""
+Opening book lookup latency, against searching the same positions.
+
+Uses the book at --path, built with --plies plies (the default book's if
+not given), or builds a small one (3 plies, depth 8) in a temporary
+directory if there is none. Times opening the file, lookups of
+positions in the book (and of positions past it, which miss), and a search
+to the book's depth for a sample of the same positions. Run it with:
+
+    python benchmark_book.py [--path FILE] [--plies N]
+"""
+import os
+import sys
+import time
+import random
+import tempfile
+
+import bitboard
+from ai import Search, TABLE_BITS
+from opening_book import OpeningBook, build_book, positions, DEFAULT_PATH, DEFAULT_PLIES
+
+SMALL_PLIES = 3
+SMALL_DEPTH = 8
+
+
+def percentile(times, fraction):
+    times = sorted(times)
+    return times[min(len(times) - 1, int(len(times) * fraction))]
+
+
+def time_lookups(book, boards):
+    times = []
+    for board, piece in boards:
+        mine, theirs = board.pieces[piece], board.pieces[3 - piece]
+        start = time.perf_counter()
+        book.lookup(mine, theirs)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    def option(name, default):
+        return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+    path = option("--path", DEFAULT_PATH)
+    plies = int(option("--plies", DEFAULT_PLIES))
+    temporary = None
+    if not os.path.exists(path):
+        plies = SMALL_PLIES
+        temporary = tempfile.TemporaryDirectory()
+        path = os.path.join(temporary.name, "book.bin")
+        start = time.perf_counter()
+        count = build_book(path, SMALL_PLIES, SMALL_DEPTH)
+        print(f"no book found; built {count} positions (ply {SMALL_PLIES}, depth {SMALL_DEPTH}) "
+              f"in {time.perf_counter() - start:.1f} s")
+
+    start = time.perf_counter()
+    book = OpeningBook(path)
+    opened = time.perf_counter() - start
+    print(f"{path}: {len(book)} positions, {os.path.getsize(path)} bytes, opened in {opened * 1e6:.0f} us")
+
+    # Positions in the book, and one ply past it
+    rng = random.Random(0)
+    inside = positions(plies)
+    hits = [book.lookup(board.pieces[piece], board.pieces[3 - piece]) for board, piece in inside]
+    assert all(hit is not None for hit in hits), "book does not cover its plies"
+    outside = positions(plies + 1)[len(inside):]
+    outside = rng.sample(outside, min(len(outside), 2000))
+
+    for name, boards in (("hit", inside * max(1, 2000 // len(inside))), ("miss", outside)):
+        times = time_lookups(book, boards)
+        print(f"lookup ({name:4s}): mean {sum(times) / len(times) * 1e6:6.1f} us, "
+              f"p99 {percentile(times, 0.99) * 1e6:6.1f} us, max {max(times) * 1e6:6.1f} us")
+
+    # What each answer would cost without the book
+    sample = rng.sample(inside, min(len(inside), 20))
+    times = []
+    for board, piece in sample:
+        _, depth, _ = book.lookup(board.pieces[piece], board.pieces[3 - piece])
+        search = Search(board, piece, [None] * (1 << TABLE_BITS), max_depth=depth)
+        search.think(float("inf"))
+        times.append(search.time)
+    print(f"searching to the book's depth instead: mean {sum(times) / len(times) * 1000:.0f} ms, "
+          f"max {max(times) * 1000:.0f} ms")
+
+    # The book answers inside Search itself
+    board = bitboard.create_board()
+    search = Search(board, 1, book=book)
+    print(f"Search on the empty board: from_book={search.from_book}, column {search.best_move + 1}, "
+          f"depth {search.depth}")
+    if temporary:
+        del book, search
+        temporary.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+How smoothly the game loop runs while the computer thinks.
+
+A 60 FPS loop like main()'s handles a stream of mouse motion events and
+redraws the hover piece every frame while a move is searched for, three
+ways: searching in one go inside the loop (the naive way), the
+InlineMoveProvider and the ProcessMoveProvider. Reports frame intervals,
+late frames, the depth reached, how many best-move updates streamed in,
+and how quickly the worker drops a cancelled search. Run it with:
+
+    python benchmark_move_provider.py [--seconds N]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+import ai
+import bitboard
+from connect_four import WIDTH, HEIGHT, SQUARE_SIZE, RADIUS, BLACK, YELLOW, FPS
+from move_provider import InlineMoveProvider, ProcessMoveProvider
+
+LATE_MS = 1000 / FPS * 1.5
+OPENING = "44"
+
+
+def position():
+    board = bitboard.create_board()
+    piece = 1
+    for char in OPENING:
+        col = int(char) - 1
+        bitboard.drop_piece(board, bitboard.get_next_open_row(board, col), col, piece)
+        piece = 3 - piece
+    return board, piece
+
+
+def frame(screen, clock, intervals, frame_number):
+    """One frame of the game loop: a mouse move, the hover piece redrawn, then the frame wait."""
+    x = (frame_number * 13) % WIDTH
+    pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=(x, 50), rel=(13, 0), buttons=(0, 0, 0)))
+    for event in pygame.event.get():
+        if event.type == pygame.MOUSEMOTION:
+            pygame.draw.rect(screen, BLACK, (0, 0, WIDTH, SQUARE_SIZE))
+            pygame.draw.circle(screen, YELLOW, (event.pos[0], SQUARE_SIZE // 2), RADIUS)
+    pygame.display.update()
+    intervals.append(clock.tick(FPS))
+
+
+def report(name, intervals, depth, updates):
+    intervals = sorted(intervals[1:])
+    late = sum(interval > LATE_MS for interval in intervals)
+    print(f"{name:22s} {len(intervals):4d} frames, interval median {intervals[len(intervals) // 2]:3d} ms, "
+          f"max {intervals[-1]:5d} ms, {late:3d} late (> {LATE_MS:.0f} ms) | depth {depth:2d}, {updates:3d} updates")
+
+
+def run_blocking(screen, seconds):
+    """The naive way: the whole search inside one frame."""
+    clock = pygame.time.Clock()
+    intervals = []
+    board, piece = position()
+    search = ai.Search(board, piece)
+    for number in range(30):
+        frame(screen, clock, intervals, number)
+    search.think(seconds)
+    for number in range(30):
+        frame(screen, clock, intervals, number)
+    report("search in the loop", intervals, search.depth, 1)
+
+
+def run_provider(screen, name, provider, seconds):
+    clock = pygame.time.Clock()
+    intervals = []
+    board, piece = position()
+    provider.start(board, piece, seconds)
+    updates = 0
+    number = 0
+    while not provider.done:
+        updates += provider.poll()
+        frame(screen, clock, intervals, number)
+        number += 1
+    report(name, intervals, provider.depth, updates)
+
+
+def cancel_latency(provider, repeats=10):
+    """Seconds from cancelling a long search and starting another until the new one reports back."""
+    board, piece = position()
+    empty = bitboard.create_board()
+    delays = []
+    for _ in range(repeats):
+        provider.start(board, piece, 30.0)
+        time.sleep(0.1)
+        provider.cancel()
+        start = time.perf_counter()
+        provider.start(empty, 1, 0.001)
+        while not provider.done:
+            provider.poll()
+            time.sleep(0.0005)
+        delays.append(time.perf_counter() - start)
+    return max(delays)
+
+
+def main():
+    seconds = float(sys.argv[sys.argv.index("--seconds") + 1]) if "--seconds" in sys.argv else 2.0
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    print(f"thinking {seconds:.1f} s on the position after {OPENING}, mouse moving every frame")
+    run_blocking(screen, seconds)
+    run_provider(screen, "InlineMoveProvider", InlineMoveProvider(), seconds)
+    provider = ProcessMoveProvider()
+    run_provider(screen, "ProcessMoveProvider", provider, seconds)
+    print(f"worker cancel + new search answered within {cancel_latency(provider) * 1000:.1f} ms")
+    provider.close()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Drawing cost of the game loop while the mouse moves fast, old loop against
+BoardRenderer.
+
+The old loop drew the hover strip and called pygame.display.update() for
+every event, and repainted all 42 cells after each drop. The new one draws
+the hover piece once per frame and only the changed cell, and passes just
+those rects to display.update(). Both run the same scripted input (many
+mouse motion events per frame, as a fast mouse sends, and a drop every
+half second) in a 60 FPS loop; the final screens must match pixel for
+pixel. Run it with:
+
+    python benchmark_render.py [--frames N] [--events N]
+
+(With the dummy video driver display.update() costs almost nothing, so the
+pixels sent to the display are reported too.)
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from connect_four import (
+    WIDTH, HEIGHT, SQUARE_SIZE, RADIUS, ROW_COUNT, COLUMN_COUNT, BLUE, BLACK, RED, YELLOW, FPS,
+    BoardRenderer, create_board, drop_piece, is_valid_location, get_next_open_row,
+)
+
+
+def old_draw_board(board, screen):
+    """The old draw_board: every cell and every piece, then a full display update."""
+    for c in range(COLUMN_COUNT):
+        for r in range(ROW_COUNT):
+            pygame.draw.rect(screen, BLUE, (c * SQUARE_SIZE, r * SQUARE_SIZE + SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
+            pygame.draw.circle(screen, BLACK, (int(c * SQUARE_SIZE + SQUARE_SIZE / 2), int(r * SQUARE_SIZE + SQUARE_SIZE + SQUARE_SIZE / 2)), RADIUS)
+
+    for c in range(COLUMN_COUNT):
+        for r in range(ROW_COUNT):
+            if board[r][c] == 1:
+                pygame.draw.circle(screen, RED, (int(c * SQUARE_SIZE + SQUARE_SIZE / 2), HEIGHT - int(r * SQUARE_SIZE + SQUARE_SIZE / 2)), RADIUS)
+            elif board[r][c] == 2:
+                pygame.draw.circle(screen, YELLOW, (int(c * SQUARE_SIZE + SQUARE_SIZE / 2), HEIGHT - int(r * SQUARE_SIZE + SQUARE_SIZE / 2)), RADIUS)
+    pygame.display.update()
+
+
+def script(frames, events):
+    """Per frame: the mouse x positions, then the column dropped in (or None)."""
+    for frame in range(frames):
+        xs = [(frame * events + i) * 7 % WIDTH for i in range(events)]
+        drop = xs[-1] // SQUARE_SIZE if frame % 30 == 29 else None
+        yield xs, drop
+
+
+def post(xs):
+    for x in xs:
+        pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=(x, 50), rel=(7, 0), buttons=(0, 0, 0)))
+
+
+def run_old(screen, frames, events):
+    board = create_board()
+    turn = 0
+    pixels = 0
+    clock = pygame.time.Clock()
+    for xs, drop in script(frames, events):
+        post(xs)
+        for event in pygame.event.get():
+            if event.type == pygame.MOUSEMOTION:
+                pygame.draw.rect(screen, BLACK, (0, 0, WIDTH, SQUARE_SIZE))
+                pygame.draw.circle(screen, RED if turn == 0 else YELLOW, (event.pos[0], int(SQUARE_SIZE / 2)), RADIUS)
+            pygame.display.update()
+            pixels += WIDTH * HEIGHT
+        if drop is not None and is_valid_location(board, drop):
+            drop_piece(board, get_next_open_row(board, drop), drop, turn + 1)
+            turn = 1 - turn
+            old_draw_board(board, screen)
+            pixels += WIDTH * HEIGHT
+            # Show the hover piece again, in the new player's colour
+            pygame.draw.rect(screen, BLACK, (0, 0, WIDTH, SQUARE_SIZE))
+            pygame.draw.circle(screen, RED if turn == 0 else YELLOW, (xs[-1], int(SQUARE_SIZE / 2)), RADIUS)
+            pygame.display.update()
+            pixels += WIDTH * HEIGHT
+        clock.tick(FPS)
+    return pixels
+
+
+def run_new(screen, frames, events):
+    board = create_board()
+    turn = 0
+    pixels = 0
+    clock = pygame.time.Clock()
+    renderer = BoardRenderer(screen)
+    changed = renderer.redraw(board)
+    for xs, drop in script(frames, events):
+        post(xs)
+        hover_x = None
+        for event in pygame.event.get():
+            if event.type == pygame.MOUSEMOTION:
+                hover_x = event.pos[0]
+        if hover_x is not None:
+            changed += renderer.draw_hover(hover_x, turn + 1)
+        if drop is not None and is_valid_location(board, drop):
+            row = get_next_open_row(board, drop)
+            drop_piece(board, row, drop, turn + 1)
+            turn = 1 - turn
+            changed += renderer.draw_cell(board, row, drop)
+            changed += renderer.draw_hover(xs[-1], turn + 1)
+        if changed:
+            pygame.display.update(changed)
+            pixels += sum(rect.width * rect.height for rect in changed)
+            changed = []
+        clock.tick(FPS)
+    return pixels
+
+
+def measure(run, screen, frames, events):
+    screen.fill(BLACK)
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    pixels = run(screen, frames, events)
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - wall
+    return cpu, wall, pixels, pygame.image.tobytes(screen, "RGB")
+
+
+def main():
+    def option(name, default):
+        return int(sys.argv[sys.argv.index(name) + 1]) if name in sys.argv else default
+
+    frames = option("--frames", 600)
+    events = option("--events", 16)
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+
+    print(f"{frames} frames at {FPS} FPS, {events} mouse motion events per frame, a drop every 30 frames")
+    results = {}
+    for name, run in (("old loop", run_old), ("BoardRenderer", run_new)):
+        cpu, wall, pixels, image = measure(run, screen, frames, events)
+        results[name] = image
+        print(f"  {name:14s} CPU {cpu / frames * 1000:6.3f} ms per frame ({cpu / wall * 100:5.1f}% of one core), "
+              f"{pixels / frames / 1000:8.1f} kpx sent to the display per frame")
+    same = results["old loop"] == results["BoardRenderer"]
+    print("final screens " + ("match pixel for pixel" if same else "DIFFER"))
+    pygame.quit()
+    if not same:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Search speed of ai.Search on test positions, in nodes per second and the
+depth it reaches.
+
+Positions are move strings as in the usual Connect Four solver test sets:
+the columns played, 1-7, starting with player 1. Each gets the same time,
+thought in per-frame slices the way the game calls it, and the longest
+slice shows how long a frame could be held up. Run it with:
+
+    python benchmark_search.py [--seconds N]
+"""
+import sys
+
+import bitboard
+from ai import Search, WIN, WIN_THRESHOLD, TABLE_BITS
+
+POSITIONS = [
+    ("empty board", ""),
+    ("centre opening", "4"),
+    ("centre reply", "44"),
+    ("early game", "4453"),
+    ("middle game", "52753311433677442422121"),
+    ("middle game", "3642756176227637211322113551"),
+    ("end game", "7422341735647741166133573473242566"),
+    ("end game", "23163416124767223154467471272416755633"),
+    ("end game", "2252576253462244111563365343671351441"),
+]
+SLICE = 0.008
+
+
+def position(moves):
+    """The BitBoard after moves, and the piece to move."""
+    board = bitboard.create_board()
+    piece = 1
+    for char in moves:
+        col = int(char) - 1
+        bitboard.drop_piece(board, bitboard.get_next_open_row(board, col), col, piece)
+        piece = 3 - piece
+    return board, piece
+
+
+def describe(search):
+    """The result from the side to move's view; wins and losses count plies, the first being its own move."""
+    score = search.score
+    if score > WIN_THRESHOLD:
+        return f"wins at ply {WIN - score + 1}"
+    if score < -WIN_THRESHOLD:
+        return f"loses at ply {WIN + score + 1}"
+    return "draw" if search.done else f"eval {score:+d}"
+
+
+def main():
+    seconds = float(sys.argv[sys.argv.index("--seconds") + 1]) if "--seconds" in sys.argv else 5.0
+    total_nodes = total_time = 0
+    for name, moves in POSITIONS:
+        board, piece = position(moves)
+        search = Search(board, piece, [None] * (1 << TABLE_BITS))
+        longest = 0.0
+        while not search.done and search.time < seconds:
+            before = search.time
+            search.think(SLICE)
+            longest = max(longest, search.time - before)
+        total_nodes += search.nodes
+        total_time += search.time
+        state = "solved" if search.done else "stopped"
+        print(f"{name:15s} {moves or '-':40s} depth {search.depth:2d} ({state}) best column {search.best_move + 1}, "
+              f"{describe(search):15s} | {search.nodes:8d} nodes in {search.time:5.2f} s, "
+              f"{search.nodes / search.time:7.0f} nodes/s, longest slice {longest * 1000:.1f} ms")
+    print(f"overall {total_nodes / total_time:.0f} nodes/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+winning_move on the NumPy board against the bitboard, on the positions of
+random games. Both boards are played side by side and must agree on every
+check. Run it with:
+
+    python benchmark_win_check.py [--games N]
+"""
+import os
+import sys
+import time
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import connect_four as game
+import bitboard
+
+
+def random_positions(games, rng):
+    """(NumPy board, BitBoard, piece) after every move of random games."""
+    positions = []
+    for _ in range(games):
+        board = game.create_board()
+        bits = bitboard.create_board()
+        piece = 1
+        while True:
+            cols = [c for c in range(game.COLUMN_COUNT) if game.is_valid_location(board, c)]
+            assert cols == [c for c in range(bitboard.COLUMN_COUNT) if bitboard.is_valid_location(bits, c)]
+            if not cols:
+                break
+            col = rng.choice(cols)
+            row = game.get_next_open_row(board, col)
+            assert row == bitboard.get_next_open_row(bits, col)
+            game.drop_piece(board, row, col, piece)
+            bitboard.drop_piece(bits, row, col, piece)
+            positions.append((board.copy(), bitboard.BitBoard.from_array(board), piece))
+            if game.winning_move(board, piece):
+                break
+            piece = 3 - piece
+    return positions
+
+
+def time_checks(check, positions, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for board, bits, piece in positions:
+            check(board, bits, piece)
+    return (time.perf_counter() - start) / (repeats * len(positions))
+
+
+def main():
+    games = int(sys.argv[sys.argv.index("--games") + 1]) if "--games" in sys.argv else 300
+    positions = random_positions(games, random.Random(0))
+
+    wins = 0
+    for board, bits, piece in positions:
+        expected = game.winning_move(board, piece)
+        assert bitboard.winning_move(bits, piece) == expected
+        assert bitboard.winning_move(bits, 3 - piece) == game.winning_move(board, 3 - piece)
+        assert (bits.to_array() == board).all()
+        wins += expected
+    print(f"{len(positions)} positions from {games} random games ({wins} wins): both boards agree")
+
+    old = time_checks(lambda board, bits, piece: game.winning_move(board, piece), positions, 1)
+    new = time_checks(lambda board, bits, piece: bitboard.winning_move(bits, piece), positions, 20)
+    print(f"winning_move, NumPy board: {old * 1e6:8.2f} us")
+    print(f"winning_move, bitboard:    {new * 1e6:8.2f} us  ({old / new:.0f}x faster)")
+
+    # drop + check + undo, the step a search makes at every node
+    bits = bitboard.create_board()
+    start = time.perf_counter()
+    count = 0
+    for _ in range(20000):
+        for col in range(bitboard.COLUMN_COUNT):
+            bitboard.drop_piece(bits, bitboard.get_next_open_row(bits, col), col, 1)
+            bitboard.winning_move(bits, 1)
+            bitboard.undo_move(bits)
+            count += 1
+    print(f"bitboard drop + win check + undo: {(time.perf_counter() - start) / count * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Connect Four on bitboards: one integer per player with a bit per cell.
+
+Bit col * 7 + row is the cell at (row, col), with row 0 at the bottom like
+the NumPy board in connect_four.py. Each column gets 7 bits for its 6 rows,
+so the spare top bit keeps lines from wrapping into the next column, and
+the whole board fits in 49 bits of a 64-bit word. Four in a row is then a
+few shifts and ANDs per direction instead of a scan over every window.
+
+The functions mirror connect_four.py (create_board, drop_piece,
+is_valid_location, get_next_open_row, winning_move) so either board can be
+used the same way, plus undo_move() for search. Each position also keeps a
+Zobrist key, updated with one XOR per move, for transposition tables.
+"""
+import random
+
+import numpy as np
+
+ROW_COUNT = 6
+COLUMN_COUNT = 7
+COLUMN_BITS = ROW_COUNT + 1
+
+# Bit shifts between neighbouring cells: vertical, horizontal and the two diagonals
+DIRECTIONS = (1, COLUMN_BITS, COLUMN_BITS - 1, COLUMN_BITS + 1)
+
+BOTTOM_ROW = sum(1 << (col * COLUMN_BITS) for col in range(COLUMN_COUNT))
+FULL_BOARD = BOTTOM_ROW * ((1 << ROW_COUNT) - 1)
+
+# A random 64-bit number per (piece, bit); a position's key is the XOR of
+# those of its pieces. Seeded so keys are the same in every process.
+zobrist_random = random.Random(4)
+ZOBRIST = [[zobrist_random.getrandbits(64) for _ in range(COLUMN_COUNT * COLUMN_BITS)] for _ in range(3)]
+
+
+def cell_bit(row, col):
+    return 1 << (col * COLUMN_BITS + row)
+
+
+def has_four(bits):
+    """True if bits has four in a row in any direction."""
+    for shift in DIRECTIONS:
+        pairs = bits & (bits >> shift)
+        if pairs & (pairs >> 2 * shift):
+            return True
+    return False
+
+
+class BitBoard:
+    """
+    A position: pieces[1] and pieces[2] are the two players' bitboards,
+    heights[col] the next free row of each column, moves the columns
+    played so far, for undo, and key the Zobrist key.
+    """
+    __slots__ = ("pieces", "heights", "moves", "key")
+
+    def __init__(self):
+        self.pieces = [0, 0, 0] # index 0 unused, so a piece number indexes it directly
+        self.heights = [0] * COLUMN_COUNT
+        self.moves = []
+        self.key = 0
+
+    @property
+    def occupied(self):
+        return self.pieces[1] | self.pieces[2]
+
+    def piece_at(self, row, col):
+        """0 for an empty cell, else the player's piece number, like board[row][col]."""
+        bit = cell_bit(row, col)
+        return 1 if self.pieces[1] & bit else 2 if self.pieces[2] & bit else 0
+
+    def to_array(self):
+        """The same position as connect_four.create_board() would hold it."""
+        board = np.zeros((ROW_COUNT, COLUMN_COUNT))
+        for row in range(ROW_COUNT):
+            for col in range(COLUMN_COUNT):
+                board[row][col] = self.piece_at(row, col)
+        return board
+
+    @classmethod
+    def from_array(cls, board):
+        """A BitBoard for a NumPy board. The order pieces were played in is not known, so it cannot be undone past."""
+        position = cls()
+        for col in range(COLUMN_COUNT):
+            for row in range(ROW_COUNT):
+                piece = int(board[row][col])
+                if piece:
+                    position.pieces[piece] |= cell_bit(row, col)
+                    position.heights[col] = row + 1
+                    position.key ^= ZOBRIST[piece][col * COLUMN_BITS + row]
+        return position
+
+
+def create_board():
+    return BitBoard()
+
+
+def drop_piece(board, row, col, piece):
+    board.pieces[piece] |= cell_bit(row, col)
+    board.heights[col] = row + 1
+    board.moves.append((col, piece))
+    board.key ^= ZOBRIST[piece][col * COLUMN_BITS + row]
+
+
+def undo_move(board):
+    """Takes back the last drop_piece."""
+    col, piece = board.moves.pop()
+    board.heights[col] -= 1
+    board.pieces[piece] ^= cell_bit(board.heights[col], col)
+    board.key ^= ZOBRIST[piece][col * COLUMN_BITS + board.heights[col]]
+
+
+def is_valid_location(board, col):
+    return board.heights[col] < ROW_COUNT
+
+
+def get_next_open_row(board, col):
+    return board.heights[col] if board.heights[col] < ROW_COUNT else None
+
+
+def winning_move(board, piece):
+    return has_four(board.pieces[piece])
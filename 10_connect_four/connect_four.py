@@ -2,6 +2,10 @@ import pygame
 import sys
 import numpy as np
 
+import bitboard
+from move_provider import InlineMoveProvider, ProcessMoveProvider
+from opening_book import DEFAULT_PATH as BOOK_PATH
+
 # Initialize pygame
 pygame.init()
 
@@ -16,6 +20,13 @@ BLUE = (0, 0, 255)
 BLACK = (0, 0, 0)
 RED = (255, 0, 0)
 YELLOW = (255, 255, 0)
+FPS = 60
+
+# Computer opponent: with --ai, player 2 is played by ai.Search, in a worker
+# process (or, with --ai-inline, in slices between frames)
+AI_PIECE = 2 if "--ai" in sys.argv or "--ai-inline" in sys.argv else None
+AI_INLINE = "--ai-inline" in sys.argv
+AI_MOVE_TIME = 1.0 # Seconds to think per move at most
 
 # Create board
 def create_board():
@@ -59,20 +70,81 @@ def winning_move(board, piece):
                 return True
     return False
 
-# Draw board
-def draw_board(board, screen):
-    for c in range(COLUMN_COUNT):
-        for r in range(ROW_COUNT):
-            pygame.draw.rect(screen, BLUE, (c * SQUARE_SIZE, r * SQUARE_SIZE + SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
-            pygame.draw.circle(screen, BLACK, (int(c * SQUARE_SIZE + SQUARE_SIZE / 2), int(r * SQUARE_SIZE + SQUARE_SIZE + SQUARE_SIZE / 2)), RADIUS)
-
-    for c in range(COLUMN_COUNT):
-        for r in range(ROW_COUNT):
-            if board[r][c] == 1:
-                pygame.draw.circle(screen, RED, (int(c * SQUARE_SIZE + SQUARE_SIZE / 2), HEIGHT - int(r * SQUARE_SIZE + SQUARE_SIZE / 2)), RADIUS)
-            elif board[r][c] == 2:
-                pygame.draw.circle(screen, YELLOW, (int(c * SQUARE_SIZE + SQUARE_SIZE / 2), HEIGHT - int(r * SQUARE_SIZE + SQUARE_SIZE / 2)), RADIUS)
-    pygame.display.update()
+# --- Rendering ---
+# Pieces and the blue board are drawn once to surfaces; after that only the
+# hover piece and the cell a piece lands in are redrawn, and only those
+# rects are sent to the display.
+
+def cell_rect(row, col):
+    """The square of board cell (row, col); row 0 is the bottom row."""
+    return pygame.Rect(col * SQUARE_SIZE, HEIGHT - (row + 1) * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE)
+
+class BoardRenderer:
+    """Draws the board onto screen, returning the rects each call changed."""
+    def __init__(self, screen):
+        self.screen = screen
+        # The blue board with see-through holes (BLACK is the colorkey)
+        self.mask = pygame.Surface((WIDTH, HEIGHT - SQUARE_SIZE)).convert()
+        self.mask.fill(BLUE)
+        for c in range(COLUMN_COUNT):
+            for r in range(ROW_COUNT):
+                pygame.draw.circle(self.mask, BLACK, (int(c * SQUARE_SIZE + SQUARE_SIZE / 2), int(r * SQUARE_SIZE + SQUARE_SIZE / 2)), RADIUS)
+        self.mask.set_colorkey(BLACK)
+        # A piece of each colour on black, the size of its circle
+        self.pieces = {}
+        for piece, color in ((1, RED), (2, YELLOW)):
+            sprite = pygame.Surface((2 * RADIUS + 1, 2 * RADIUS + 1)).convert()
+            sprite.fill(BLACK)
+            pygame.draw.circle(sprite, color, (RADIUS, RADIUS), RADIUS)
+            self.pieces[piece] = sprite
+        self.hover = None # (x, piece) of the hover piece on screen
+        self.hover_rect = None
+
+    def draw_all(self, board):
+        """The whole board, every piece included."""
+        area = pygame.Rect(0, SQUARE_SIZE, WIDTH, HEIGHT - SQUARE_SIZE)
+        self.screen.fill(BLACK, area)
+        for c in range(COLUMN_COUNT):
+            for r in range(ROW_COUNT):
+                if board[r][c]:
+                    rect = cell_rect(r, c)
+                    self.screen.blit(self.pieces[int(board[r][c])], (rect.centerx - RADIUS, rect.centery - RADIUS))
+        self.screen.blit(self.mask, area)
+        return [area]
+
+    def draw_cell(self, board, row, col):
+        rect = cell_rect(row, col)
+        self.screen.fill(BLACK, rect)
+        if board[row][col]:
+            self.screen.blit(self.pieces[int(board[row][col])], (rect.centerx - RADIUS, rect.centery - RADIUS))
+        self.screen.blit(self.mask, rect, rect.move(0, -SQUARE_SIZE))
+        return [rect]
+
+    def draw_hover(self, x, piece):
+        """Moves the hover piece above the board to x."""
+        if self.hover == (x, piece):
+            return []
+        changed = self.clear_hover()
+        self.hover = (x, piece)
+        self.hover_rect = self.screen.blit(self.pieces[piece], (x - RADIUS, int(SQUARE_SIZE / 2) - RADIUS))
+        return changed + [self.hover_rect]
+
+    def clear_hover(self):
+        if self.hover_rect is None:
+            return []
+        changed = self.screen.fill(BLACK, self.hover_rect)
+        self.hover = self.hover_rect = None
+        return [changed]
+
+    def redraw(self, board):
+        """Everything, for when the window has to be repainted."""
+        self.screen.fill(BLACK)
+        self.draw_all(board)
+        if self.hover is not None:
+            x, piece = self.hover
+            self.hover = None
+            self.draw_hover(x, piece)
+        return [self.screen.get_rect()]
 
 # Main game loop
 def main():
@@ -82,46 +154,78 @@ def main():
     game_over = False
     turn = 0
     scores = [0, 0]  # [Player 1, Player 2]
+    clock = pygame.time.Clock()
+    provider = None
+    if AI_PIECE:
+        # Early moves come from the opening book if one has been built (see opening_book.py)
+        provider = InlineMoveProvider(BOOK_PATH) if AI_INLINE else ProcessMoveProvider(BOOK_PATH)
+
+    renderer = BoardRenderer(screen)
+    changed = renderer.redraw(board)
 
     while True:
+        col = None
+        hover_x = None
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                if provider:
+                    provider.close()
                 pygame.quit()
                 sys.exit()
 
-            if event.type == pygame.MOUSEMOTION:
-                pygame.draw.rect(screen, BLACK, (0, 0, WIDTH, SQUARE_SIZE))
-                posx = event.pos[0]
-                if turn == 0:
-                    pygame.draw.circle(screen, RED, (posx, int(SQUARE_SIZE / 2)), RADIUS)
-                else:
-                    pygame.draw.circle(screen, YELLOW, (posx, int(SQUARE_SIZE / 2)), RADIUS)
-            pygame.display.update()
-
-            if event.type == pygame.MOUSEBUTTONDOWN and not game_over:
-                pygame.draw.rect(screen, BLACK, (0, 0, WIDTH, SQUARE_SIZE))
-                posx = event.pos[0]
-                col = int(posx // SQUARE_SIZE)
-
-                if is_valid_location(board, col):
-                    row = get_next_open_row(board, col)
-                    drop_piece(board, row, col, turn + 1)
+            if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                changed += renderer.redraw(board)
 
-                    if winning_move(board, turn + 1):
-                        game_over = True
-                        scores[turn] += 1
-                        print(f"Player {turn + 1} wins! Score: Player 1 = {scores[0]}, Player 2 = {scores[1]}")
+            # Only the last mouse position of the frame gets drawn
+            if event.type == pygame.MOUSEMOTION and turn + 1 != AI_PIECE:
+                hover_x = event.pos[0]
 
-                    turn += 1
-                    turn = turn % 2
-
-                    draw_board(board, screen)
+            if event.type == pygame.MOUSEBUTTONDOWN and not game_over and turn + 1 != AI_PIECE:
+                changed += renderer.clear_hover()
+                hover_x = None
+                posx = event.pos[0]
+                col = int(posx // SQUARE_SIZE)
 
-                    if game_over:
-                        pygame.time.wait(3000)
-                        board = create_board()
-                        game_over = False
-                        draw_board(board, screen)
+        if hover_x is not None:
+            changed += renderer.draw_hover(hover_x, turn + 1)
+
+        # The computer thinks in the background; its best move so far hovers over the board
+        if turn + 1 == AI_PIECE and not game_over:
+            if not provider.thinking and not provider.done:
+                provider.start(bitboard.BitBoard.from_array(board), AI_PIECE, AI_MOVE_TIME)
+            if provider.poll() and provider.best_move is not None:
+                changed += renderer.draw_hover(int(provider.best_move * SQUARE_SIZE + SQUARE_SIZE / 2), AI_PIECE)
+            if provider.done:
+                col = provider.best_move
+                provider.reset()
+                changed += renderer.clear_hover()
+
+        if col is not None and is_valid_location(board, col):
+            row = get_next_open_row(board, col)
+            drop_piece(board, row, col, turn + 1)
+            changed += renderer.draw_cell(board, row, col)
+
+            if winning_move(board, turn + 1):
+                game_over = True
+                scores[turn] += 1
+                print(f"Player {turn + 1} wins! Score: Player 1 = {scores[0]}, Player 2 = {scores[1]}")
+
+            turn += 1
+            turn = turn % 2
+
+            if game_over:
+                pygame.display.update(changed)
+                pygame.time.wait(3000)
+                board = create_board()
+                game_over = False
+                changed = renderer.draw_all(board)
+
+        # Send only what changed to the display
+        if changed:
+            pygame.display.update(changed)
+            changed = []
+
+        clock.tick(FPS)
 
 if __name__ == "__main__":
     main()
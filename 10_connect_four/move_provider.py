@@ -0,0 +1,154 @@
+"""
+Move providers: ask for a move, keep running the game, pick the move up
+when it is ready.
+
+Both kinds have the same interface. start(board, piece, time_limit) begins
+a search on a BitBoard; poll() is called once per frame and returns True
+when something new arrived; best_move, depth and score hold the best move
+found so far (streamed as each depth finishes) and done says the search is
+over. cancel() drops the current search and close() shuts the provider
+down. Given a book_path, positions in that opening book are answered
+straight away.
+
+ProcessMoveProvider searches in a worker process, so the game loop never
+waits on it. InlineMoveProvider searches in the game's own process, a
+short slice per poll(), for when a second process is not wanted.
+"""
+import multiprocessing
+
+import ai
+from opening_book import open_book
+
+WORKER_SLICE = 0.02 # Seconds the worker thinks between looks at its messages
+INLINE_SLICE = 0.008 # Seconds of thinking per poll() in the game's process
+
+
+class MoveProvider:
+    def __init__(self):
+        self.best_move = None
+        self.depth = 0
+        self.score = 0
+        self.done = False
+        self.thinking = False
+
+    def reset(self):
+        self.best_move = None
+        self.depth = 0
+        self.score = 0
+        self.done = False
+
+    def start(self, board, piece, time_limit):
+        raise NotImplementedError
+
+    def poll(self):
+        raise NotImplementedError
+
+    def cancel(self):
+        self.thinking = False
+
+    def close(self):
+        self.cancel()
+
+
+class InlineMoveProvider(MoveProvider):
+    """Thinks in the caller's process, INLINE_SLICE seconds per poll()."""
+    def __init__(self, book_path=None):
+        super().__init__()
+        self.table = [None] * (1 << ai.TABLE_BITS)
+        self.book = open_book(book_path) if book_path else None
+        self.search = None
+        self.time_limit = 0.0
+
+    def start(self, board, piece, time_limit):
+        self.reset()
+        self.search = ai.Search(board, piece, self.table, book=self.book)
+        self.time_limit = time_limit
+        self.thinking = True
+
+    def poll(self):
+        if not self.thinking:
+            return False
+        search = self.search
+        depth = search.depth
+        finished = search.think(min(INLINE_SLICE, max(0.0, self.time_limit - search.time)))
+        self.best_move, self.depth, self.score = search.best_move, search.depth, search.score
+        if finished or search.time >= self.time_limit:
+            self.done = True
+            self.thinking = False
+            return True
+        return search.depth != depth
+
+
+def worker(connection, book_path):
+    """
+    Runs in the worker process. Messages in: ("search", id, board, piece,
+    time_limit), ("cancel", None) and ("close", None). Messages out:
+    ("progress" or "done", id, best_move, depth, score).
+    """
+    table = [None] * (1 << ai.TABLE_BITS) # Kept between searches
+    book = open_book(book_path) if book_path else None # Each process maps the file itself
+    while True:
+        command, *data = connection.recv()
+        while command == "search":
+            search_id, board, piece, time_limit = data
+            search = ai.Search(board, piece, table, book=book)
+            command = None
+            while True:
+                depth = search.depth
+                finished = search.think(min(WORKER_SLICE, max(0.0, time_limit - search.time)))
+                if finished or search.time >= time_limit:
+                    connection.send(("done", search_id, search.best_move, search.depth, search.score))
+                    break
+                if search.depth != depth:
+                    connection.send(("progress", search_id, search.best_move, search.depth, search.score))
+                if connection.poll():
+                    # A cancel or a new search replaces this one
+                    command, *data = connection.recv()
+                    break
+        if command == "close":
+            connection.close()
+            return
+
+
+class ProcessMoveProvider(MoveProvider):
+    """Thinks in a worker process; poll() only reads the messages it has sent."""
+    def __init__(self, book_path=None):
+        super().__init__()
+        self.connection, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=worker, args=(child, book_path), daemon=True)
+        self.process.start()
+        child.close()
+        self.search_id = 0
+
+    def start(self, board, piece, time_limit):
+        self.reset()
+        self.search_id += 1
+        self.connection.send(("search", self.search_id, board, piece, time_limit))
+        self.thinking = True
+
+    def poll(self):
+        updated = False
+        while self.connection.poll():
+            kind, search_id, best_move, depth, score = self.connection.recv()
+            if search_id != self.search_id or not self.thinking:
+                continue # From a search that was cancelled or replaced
+            self.best_move, self.depth, self.score = best_move, depth, score
+            updated = True
+            if kind == "done":
+                self.done = True
+                self.thinking = False
+        return updated
+
+    def cancel(self):
+        if self.thinking:
+            self.connection.send(("cancel", None))
+        self.thinking = False
+
+    def close(self):
+        if self.process is None:
+            return
+        self.cancel()
+        self.connection.send(("close", None))
+        self.process.join()
+        self.connection.close()
+        self.process = None
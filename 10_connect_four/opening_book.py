@@ -0,0 +1,211 @@
+"""
+An opening book: the computer's answers for every position of the first
+few plies, worked out ahead of time and kept in a memory-mapped file.
+
+Positions are keyed from the side to move's view (its pieces plus the
+occupied cells, as one 64-bit number), so the book works whoever started
+the game, and a position and its mirror image share one entry. Each entry
+holds the best column, the search depth behind it and the score. The file
+is a 16-byte header, then the sorted keys as uint64, then the entries:
+
+    magic "C4BOOK1\\0" | count (uint32) | unused (uint32)
+    keys[count] | entries[count] (move int8, depth int8, score int16)
+
+Opening it maps the file without reading it; a lookup is a binary search
+over the keys, which reads only the pages it touches. Build a book with:
+
+    python opening_book.py [--plies N] [--depth N] [--path FILE]
+
+Positions the search solves outright are stored exactly; the rest hold the
+depth --depth result. The default, depth 12, is deeper than the engine gets
+in a move's thinking time; building it takes about half an hour.
+"""
+import sys
+import time
+
+import numpy as np
+
+import bitboard
+from bitboard import COLUMN_COUNT, COLUMN_BITS, BOTTOM_ROW, has_four
+from ai import Search, WIN, WIN_THRESHOLD, TABLE_BITS
+
+DEFAULT_PATH = "opening_book.bin"
+DEFAULT_PLIES = 4
+DEFAULT_DEPTH = 12
+MAGIC = b"C4BOOK1\0"
+HEADER_SIZE = 16
+ENTRY_DTYPE = np.dtype([("move", "i1"), ("depth", "i1"), ("score", "<i2")])
+BOOK_WIN = 30000 # Win scores are stored as BOOK_WIN minus the plies to the win
+
+COLUMN_MASK = (1 << COLUMN_BITS) - 1
+
+
+def mirror(bits):
+    """bits with the columns in reverse order."""
+    flipped = 0
+    for col in range(COLUMN_COUNT):
+        flipped |= ((bits >> (col * COLUMN_BITS)) & COLUMN_MASK) << ((COLUMN_COUNT - 1 - col) * COLUMN_BITS)
+    return flipped
+
+
+def position_key(mine, theirs):
+    """A number unique to the position with mine to move: the occupied cells plus one bit atop each column mark the heights."""
+    return mine + (mine | theirs) + BOTTOM_ROW
+
+
+def book_key(mine, theirs):
+    """(key, mirrored): the smaller of the position's and its mirror image's keys, and whether it was the mirror's."""
+    key = position_key(mine, theirs)
+    mirrored = position_key(mirror(mine), mirror(theirs))
+    return (mirrored, True) if mirrored < key else (key, False)
+
+
+def to_book_score(score):
+    if score > WIN_THRESHOLD:
+        return BOOK_WIN - (WIN - score)
+    if score < -WIN_THRESHOLD:
+        return -BOOK_WIN + (WIN + score)
+    return max(-BOOK_WIN // 2, min(BOOK_WIN // 2, score))
+
+
+def from_book_score(score):
+    if score > BOOK_WIN // 2:
+        return WIN - (BOOK_WIN - score)
+    if score < -BOOK_WIN // 2:
+        return -WIN + (BOOK_WIN + score)
+    return score
+
+
+# --- Building ---
+
+def positions(plies):
+    """
+    One BitBoard per distinct position (mirror images counted once) up to
+    plies moves from the empty board, with the piece to move, leaving out
+    finished games.
+    """
+    seen = set()
+    found = []
+    layer = [(bitboard.create_board(), 1)]
+    for ply in range(plies + 1):
+        next_layer = []
+        for board, piece in layer:
+            key, _ = book_key(board.pieces[piece], board.pieces[3 - piece])
+            if key in seen:
+                continue
+            seen.add(key)
+            found.append((board, piece))
+            if ply == plies:
+                continue
+            for col in range(COLUMN_COUNT):
+                if not bitboard.is_valid_location(board, col):
+                    continue
+                child = bitboard.BitBoard()
+                child.pieces = board.pieces[:]
+                child.heights = board.heights[:]
+                child.key = board.key
+                bitboard.drop_piece(child, bitboard.get_next_open_row(child, col), col, piece)
+                if not has_four(child.pieces[piece]):
+                    next_layer.append((child, 3 - piece))
+        layer = next_layer
+    return found
+
+
+def build_book(path, plies, depth, progress=None):
+    """Searches every position up to plies moves to depth and writes the book to path."""
+    table = [None] * (1 << TABLE_BITS)
+    entries = {}
+    found = positions(plies)
+    for number, (board, piece) in enumerate(found):
+        key, mirrored = book_key(board.pieces[piece], board.pieces[3 - piece])
+        search = Search(board, piece, table, max_depth=depth)
+        search.think(float("inf"))
+        move = search.best_move
+        if mirrored:
+            move = COLUMN_COUNT - 1 - move
+        entries[key] = (move, search.depth, to_book_score(search.score))
+        if progress:
+            progress(number + 1, len(found))
+    write_book(path, entries)
+    return len(entries)
+
+
+def write_book(path, entries):
+    """Writes {key: (move, depth, score)} as a book file."""
+    keys = np.array(sorted(entries), dtype="<u8")
+    values = np.array([entries[key] for key in keys.tolist()], dtype=ENTRY_DTYPE)
+    with open(path, "wb") as file:
+        file.write(MAGIC)
+        file.write(np.array([len(keys), 0], dtype="<u4").tobytes())
+        file.write(keys.tobytes())
+        file.write(values.tobytes())
+
+
+# --- Reading ---
+
+class OpeningBook:
+    """A book file, memory-mapped read-only; pages are read from disk only when a lookup touches them."""
+    def __init__(self, path=DEFAULT_PATH):
+        with open(path, "rb") as file:
+            header = file.read(HEADER_SIZE)
+        if header[:8] != MAGIC:
+            raise ValueError(f"{path} is not an opening book")
+        count = int(np.frombuffer(header, dtype="<u4", count=1, offset=8)[0])
+        self.keys = np.memmap(path, dtype="<u8", mode="r", offset=HEADER_SIZE, shape=(count,))
+        self.entries = np.memmap(path, dtype=ENTRY_DTYPE, mode="r", offset=HEADER_SIZE + 8 * count, shape=(count,))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def lookup(self, mine, theirs):
+        """(best column, depth, score) for the position with mine to move, or None if it is not in the book."""
+        key, mirrored = book_key(mine, theirs)
+        i = int(np.searchsorted(self.keys, np.uint64(key)))
+        if i == len(self.keys) or int(self.keys[i]) != key:
+            return None
+        move, depth, score = self.entries[i].tolist()
+        if mirrored:
+            move = COLUMN_COUNT - 1 - move
+        return move, depth, from_book_score(score)
+
+
+def open_book(path):
+    """The book at path, or None if there is none, so the engine just searches."""
+    try:
+        return OpeningBook(path)
+    except FileNotFoundError:
+        return None
+
+
+def main():
+    def option(name, default):
+        return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+    plies = int(option("--plies", DEFAULT_PLIES))
+    depth = int(option("--depth", DEFAULT_DEPTH))
+    path = option("--path", DEFAULT_PATH)
+
+    start = time.perf_counter()
+
+    def progress(done, total):
+        if done % 100 == 0 or done == total:
+            print(f"  {done}/{total} positions, {time.perf_counter() - start:.0f} s")
+
+    count = build_book(path, plies, depth, progress)
+    print(f"built {count} positions up to ply {plies} at depth {depth} into {path} "
+          f"in {time.perf_counter() - start:.1f} s")
+
+    # Every position (and its mirror image) must come back as searched
+    book = OpeningBook(path)
+    for board, piece in positions(plies)[:200]:
+        mine, theirs = board.pieces[piece], board.pieces[3 - piece]
+        move, _, score = book.lookup(mine, theirs)
+        mirrored_move, _, mirrored_score = book.lookup(mirror(mine), mirror(theirs))
+        symmetric = mirror(mine) == mine and mirror(theirs) == theirs
+        assert mirrored_score == score and (symmetric or mirrored_move == COLUMN_COUNT - 1 - move)
+        assert bitboard.is_valid_location(board, move)
+    print("lookups check out, mirror images included")
+
+
+if __name__ == "__main__":
+    main()